@@ -1,5 +1,7 @@
 import itertools
+import threading
 import jaydebeapi
+import jpype
 import configparser
 import re
 import paramiko
@@ -8,6 +10,11 @@ import platform
 import getpass
 from core.logger import app_log
 
+# jaydebeapi starts the JVM inside the first connect(); concurrent first connects race
+# jpype.startJVM, so they are serialized until the JVM is up.
+_jvm_start_lock = threading.Lock()
+
+
 class DB:
     def __enter__(self):    
         self.connection = self.connect()
@@ -112,7 +119,12 @@ class DB:
     def connect(self):
         driver_path = os.path.dirname(os.path.abspath(__file__)) + '/../drivers'
         java_oracle_driver_path = [f'{driver_path}/ojdbc8.jar']
-        connection = jaydebeapi.connect('oracle.jdbc.OracleDriver', self.conn_str, [self.db_user, self.db_psw], java_oracle_driver_path)
+        args = ('oracle.jdbc.OracleDriver', self.conn_str, [self.db_user, self.db_psw], java_oracle_driver_path)
+        if jpype.isJVMStarted():
+            connection = jaydebeapi.connect(*args)
+        else:
+            with _jvm_start_lock:
+                connection = jaydebeapi.connect(*args)
         connection.jconn.setAutoCommit(False)
         return connection
 
@@ -0,0 +1,348 @@
+"""
+Warehouse Automation - Batch Entry Point
+
+Runs workflows unattended (cron/CI): no prompts, workflow selection by file and filters,
+optional parallel browser sessions, a JSON results file and a non-zero exit code on failure.
+
+    python batch.py --workflows suite.json --bucket inbound --flow HAPPY_PATH \\
+        --concurrency 2 --capture errors --results results.json
+
+    # items x quantities x flows x warehouses sweep, third of four machines
+    python batch.py --items 45119VA010,ITEM-2 --quantities 1,10000 --warehouses all --shard 3/4
+"""
+import argparse
+import itertools
+from contextlib import ExitStack, closing
+import json
+import sys
+import threading
+import time
+from dataclasses import asdict, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from config.settings import WAREHOUSE_CHOICES, Settings
+from config.workflow_config import Workflow, create_default_workflows, filter_workflows
+from config.workflow_files import iter_workflow_file
+from config.workflow_matrix import WorkflowMatrix, parse_shard
+from core.checkpoint import CheckpointStore
+from core.connection_guard import ConnectionResetDetected
+from core.logger import app_log
+from core.orchestrator import OperationResult, WorkflowResult
+from core.post_payload_prefetch import PostPayloadPrefetcher
+from main import run_workflow, start_session, switch_warehouse
+from operations import create_operation_services
+from operations.stage_scheduler import StageScheduler
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_SETUP_ERROR = 2
+EXIT_INTERRUPTED = 130
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run warehouse automation workflows unattended.")
+    parser.add_argument(
+        "--workflows", help="Workflow file: .yaml, .json or .jsonl (default: WORKFLOW_FILE or built-in workflows)."
+    )
+    parser.add_argument("--bucket", action="append", default=[], help="Only run this bucket (repeatable).")
+    parser.add_argument(
+        "--name", action="append", default=[], help="Workflow name glob, e.g. 'inbound.*BLIND*' (repeatable)."
+    )
+    parser.add_argument("--flow", action="append", default=[], help="Receive flow name or value (repeatable).")
+    parser.add_argument("--items", help="Sweep a matrix of these comma-separated items instead of a workflow file.")
+    parser.add_argument("--quantities", default="2000", help="Matrix shipped quantities, comma-separated.")
+    parser.add_argument(
+        "--warehouses", default="", help="Matrix warehouses, comma-separated or 'all' (default: session warehouse)."
+    )
+    parser.add_argument("--shard", help="Only run shard i of n, e.g. 2/4 (applied before the filters).")
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallel browser sessions (default: 1).")
+    parser.add_argument(
+        "--headless", action=argparse.BooleanOptionalAction, default=True, help="Run the browser headless."
+    )
+    parser.add_argument(
+        "--capture", choices=("all", "errors", "none"), default="errors",
+        help="Screenshot level (default: errors).",
+    )
+    parser.add_argument("--prod-token", default="", help="Pre-authorize PROD posts (the token is 'PROD').")
+    parser.add_argument("--results", help="Write a JSON results file here.")
+    parser.add_argument(
+        "--stage-scheduler", action="store_true",
+        help="Batch each wave's posts through one Post Message window, then run receives.",
+    )
+    parser.add_argument("--resume", action="store_true", help="Skip steps completed by the previous run.")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    try:
+        args.shard = parse_shard(args.shard) if args.shard else None
+        args.quantities = [int(qty) for qty in _split(args.quantities)]
+    except ValueError as exc:
+        parser.error(str(exc))
+    args.items = _split(args.items)
+    args.warehouses = list(WAREHOUSE_CHOICES) if args.warehouses.lower() == "all" else _split(args.warehouses)
+    if args.items and args.workflows:
+        parser.error("--items and --workflows are mutually exclusive")
+    if len(args.warehouses) > 1 and args.concurrency > 1:
+        # R-stage lookups read the process-wide Settings.app warehouse
+        parser.error("sweeping several warehouses needs --concurrency 1 (shard across processes instead)")
+    return args
+
+
+def _split(value: str | None) -> list[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def apply_overrides(settings: Settings, args: argparse.Namespace):
+    settings.app.interactive = False
+    settings.browser.headless = args.headless
+    settings.browser.capture_level = args.capture
+    if args.prod_token:
+        settings.app.prod_confirmation_token = args.prod_token
+    if args.stage_scheduler:
+        settings.app.stage_scheduler = True
+
+
+def select_workflows(args: argparse.Namespace, settings: Settings) -> Iterator[Workflow]:
+    """Filtered workflows from a matrix sweep, a workflow file or the defaults, built lazily.
+
+    Sharding happens before filtering so every shard sees the same numbering.
+    """
+    if args.items:
+        matrix = WorkflowMatrix(args.items, args.quantities, warehouses=args.warehouses)
+        app_log(f"🧮 Workflow matrix: {len(matrix)} scenarios")
+        workflows: Iterable[Workflow] = matrix.shard(*args.shard) if args.shard else matrix
+    else:
+        path = args.workflows or getattr(settings.app, "workflow_file", "")
+        if not isinstance(path, str):
+            path = ""
+        workflows = iter_workflow_file(path) if path else create_default_workflows()
+        if args.shard:
+            index, count = args.shard
+            workflows = itertools.islice(workflows, index - 1, None, count)
+    yield from filter_workflows(workflows, args.bucket, args.name, args.flow)
+
+
+class WorkflowQueue:
+    """Hands out numbered workflows to workers; safe to share between threads."""
+
+    def __init__(self, workflows: Iterable[Workflow]):
+        self._items = enumerate(workflows, 1)
+        self._lock = threading.Lock()
+
+    def next(self) -> tuple[int, Workflow] | None:
+        with self._lock:
+            return next(self._items, None)
+
+    def drain(self) -> int:
+        """Discard whatever is left and return how many workflows never ran."""
+        with self._lock:
+            return sum(1 for _ in self._items)
+
+
+class BatchRun:
+    """Thread-safe collection of workflow results, operation results and worker errors."""
+
+    def __init__(self):
+        self.workflows: list[WorkflowResult] = []
+        self.operations: list[OperationResult] = []
+        self.errors: list[str] = []
+        self.not_run = 0
+        self.stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def add(self, result: WorkflowResult):
+        with self._lock:
+            self.workflows.append(result)
+        app_log(f"🏁 Workflow {result.index} ({result.name}): {result.status}")
+
+    def add_operations(self, results: Iterable[OperationResult]):
+        with self._lock:
+            self.operations.extend(results)
+
+    def add_not_run(self, count: int):
+        with self._lock:
+            self.not_run += count
+
+    def add_error(self, message: str):
+        with self._lock:
+            self.errors.append(message)
+        app_log(f"❌ {message}")
+
+    def summary(self) -> dict[str, int]:
+        counts = {status: 0 for status in ("passed", "failed", "skipped", "error")}
+        for result in self.workflows:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        counts["not_run"] = self.not_run
+        counts["total"] = len(self.workflows) + self.not_run
+        return counts
+
+    def exit_code(self) -> int:
+        summary = self.summary()
+        if not self.workflows and self.errors:
+            return EXIT_SETUP_ERROR
+        if self.errors or summary["failed"] or summary["error"] or summary["not_run"]:
+            return EXIT_FAILURES
+        return EXIT_OK
+
+
+def worker_settings(settings: Settings, worker_id: int, concurrency: int) -> Settings:
+    """Per-worker settings: own screenshot folder and metrics file when running in parallel."""
+    if concurrency == 1:
+        return settings
+    scoped = Settings()
+    scoped.browser = replace(settings.browser, screenshot_dir=f"{settings.browser.screenshot_dir}_worker{worker_id}")
+    metrics_path = settings.app.metrics_export_path
+    if metrics_path:
+        path = Path(metrics_path)
+        metrics_path = str(path.with_name(f"{path.stem}.worker{worker_id}{path.suffix}"))
+    scoped.app = replace(settings.app, metrics_export_path=metrics_path)
+    return scoped
+
+
+def run_worker(worker_id: int, settings: Settings, jobs: WorkflowQueue, run: BatchRun, checkpoint_path: Path):
+    """Log in once, then run workflows from the queue until it is empty or the session dies."""
+    try:
+        with CheckpointStore(checkpoint_path) as checkpoints, create_operation_services(settings) as wmOps:
+            try:
+                start_session(wmOps)
+                queued: Iterable[tuple[int, Workflow]] = iter(jobs.next, None)
+                prefetcher = getattr(wmOps, "prefetcher", None)
+                if getattr(settings.app, "stage_scheduler", False) is True:
+                    _run_scheduled(wmOps, settings, queued, run, checkpoints)
+                else:
+                    with ExitStack() as stack:
+                        if isinstance(prefetcher, PostPayloadPrefetcher):
+                            # Post payloads of the next workflows are built while this one runs
+                            stack.callback(lambda: run.add_not_run(prefetcher.abandoned))
+                            queued = stack.enter_context(closing(prefetcher.pipeline(queued, _describe_job)))
+                        _run_queued(wmOps, settings, queued, run, checkpoints)
+            finally:
+                wmOps.orchestrator.print_summary()
+                run.add_operations(wmOps.orchestrator.results)
+    except Exception as exc:
+        run.add_error(f"Worker {worker_id} stopped: {exc}")
+
+
+def _describe_job(job: tuple[int, Workflow]) -> tuple[int, dict]:
+    index, workflow = job
+    return index, workflow.steps
+
+
+def _run_queued(wmOps, settings: Settings, queued: Iterable[tuple[int, Workflow]], run: BatchRun, checkpoints):
+    for index, workflow in queued:
+        if run.stop.is_set():
+            run.add_not_run(1)
+            break
+        name = workflow.full_name
+        try:
+            switch_warehouse(wmOps, settings, workflow.warehouse)
+            run.add(run_workflow(wmOps, index, name, workflow.steps, checkpoints))
+        except ConnectionResetDetected as exc:
+            run.add(WorkflowResult(index, name, "error", error=str(exc)))
+            raise
+        except Exception as exc:
+            run.add(WorkflowResult(index, name, "error", error=str(exc)))
+
+
+def _run_scheduled(wmOps, settings: Settings, queued: Iterable[tuple[int, Workflow]], run: BatchRun, checkpoints):
+    """Stage-scheduled run; waves never mix warehouses."""
+    scheduler = StageScheduler.for_services(settings, wmOps, checkpoints)
+    for warehouse, group in itertools.groupby(queued, key=lambda job: job[1].warehouse):
+        if run.stop.is_set():
+            run.add_not_run(sum(1 for _ in group))
+            continue
+        switch_warehouse(wmOps, settings, warehouse)
+        for result in scheduler.run((index, workflow.full_name, workflow.steps) for index, workflow in group):
+            run.add(result)
+
+
+def write_results(path: str, run: BatchRun, started: float, exit_code: int) -> Path:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "started_at": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "duration_s": round(time.time() - started, 3),
+        "exit_code": exit_code,
+        "summary": run.summary(),
+        "workflows": [asdict(result) for result in sorted(run.workflows, key=lambda r: r.index)],
+        "operations": [asdict(result) for result in run.operations],
+        "errors": run.errors,
+    }
+    target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    app_log(f"📝 Results written: {target}")
+    return target
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the selected workflows and return the process exit code."""
+    args = parse_args(argv)
+    started = time.time()
+    settings = Settings.from_env()
+    apply_overrides(settings, args)
+    run = BatchRun()
+
+    try:
+        workflows = select_workflows(args, settings)
+        first = next(workflows, None)
+    except Exception as exc:
+        run.add_error(f"Could not load workflows: {exc}")
+        first = None
+    if first is None:
+        if not run.errors:
+            run.add_error("No workflows matched the selection")
+        return _finish(args, run, started)
+    jobs = WorkflowQueue(itertools.chain([first], workflows))
+
+    with CheckpointStore.for_settings(settings) as checkpoints:
+        if not args.resume:
+            checkpoints.reset()
+        checkpoint_path = checkpoints.path
+
+    try:
+        if args.concurrency == 1:
+            run_worker(1, settings, jobs, run, checkpoint_path)
+        else:
+            threads = [
+                threading.Thread(
+                    target=run_worker,
+                    args=(worker_id, worker_settings(settings, worker_id, args.concurrency), jobs, run, checkpoint_path),
+                    name=f"batch-worker-{worker_id}",
+                    daemon=True,
+                )
+                for worker_id in range(1, args.concurrency + 1)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+    except KeyboardInterrupt:
+        run.stop.set()
+        app_log("\n⚠️ Interrupted by user")
+        run.add_not_run(jobs.drain())
+        return _finish(args, run, started, EXIT_INTERRUPTED)
+
+    run.add_not_run(jobs.drain())
+    return _finish(args, run, started)
+
+
+def _finish(args: argparse.Namespace, run: BatchRun, started: float, exit_code: int | None = None) -> int:
+    code = run.exit_code() if exit_code is None else exit_code
+    summary = run.summary()
+    app_log(
+        f"📊 Batch: {summary['passed']} passed, {summary['failed']} failed, {summary['error']} errors, "
+        f"{summary['skipped']} skipped, {summary['not_run']} not run → exit {code}"
+    )
+    if args.results:
+        try:
+            write_results(args.results, run, started, code)
+        except Exception as exc:
+            app_log(f"⚠️ Could not write results file {args.results}: {exc}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -84,6 +84,30 @@ def _env_flag(name: str, default: bool) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "on", "y"}
 
 
+def _env_int(name: str, default: int) -> int:
+    """Best-effort parsing of integer env values; malformed values keep the default."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value.strip())
+    except ValueError:
+        app_log(f"⚠️ Ignoring {name}={value!r}: not an integer, using {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Best-effort parsing of numeric env values; malformed values keep the default."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return float(value.strip())
+    except ValueError:
+        app_log(f"⚠️ Ignoring {name}={value!r}: not a number, using {default}")
+        return default
+
+
 def _random_default_warehouse() -> str:
     """Pick a default warehouse from the allowed list."""
     return random.choice(WAREHOUSE_CHOICES)
@@ -108,6 +132,7 @@ class BrowserConfig:
     screenshot_dir: str = "screenshots"
     screenshot_format: str = "jpeg"
     screenshot_quality: int = 70
+    capture_level: str = "all"  # all | errors | none
 
 
 @dataclass
@@ -125,6 +150,27 @@ class AppConfig:
     show_tran_id: bool = False
     auto_close_post_login_windows: bool = False
     show_post_message_overlay: bool = False
+    post_message_fast_fill_chars: int = 256_000
+    async_detours: bool = False
+    post_message_transport: str = "ui"
+    integration_endpoint: str = ""
+    integration_concurrency: int = 4
+    integration_user: str = ""  # basic auth for the integration endpoint, separate from the UI login
+    integration_pass: str = ""
+    metrics_export_path: str = ""
+    max_session_recoveries: int = 3
+    post_prefetch_depth: int = 2  # workflows whose post payload is built ahead; 0 disables
+    stage_scheduler: bool = False  # batch posts per wave, then fan out receives
+    scheduler_wave_size: int = 25  # workflows per wave (= posts per Post Message window)
+    scheduler_db_concurrency: int = 4  # parallel post payload builds
+    retry_budget: int = 20
+    retry_unknown_errors: bool = False  # also retry unclassified errors and False results
+    checkpoint_path: str = ""
+    workflow_file: str = ""
+    interactive: bool = True
+    prod_confirmation_token: str = ""
+    retry_backoff_base_s: float = 0.5
+    retry_backoff_cap_s: float = 8.0
     app_server: str = ""
     app_server_user: str = ""
     app_server_pass: str = ""
@@ -169,6 +215,69 @@ class Settings:
         cls.app.show_post_message_overlay = _env_flag(
             "SHOW_POST_MESSAGE_OVERLAY", cls.app.show_post_message_overlay
         )
+        cls.app.async_detours = _env_flag(
+            "ASYNC_DETOURS", cls.app.async_detours
+        )
+        cls.app.post_message_fast_fill_chars = _env_int(
+            "POST_MESSAGE_FAST_FILL_CHARS", cls.app.post_message_fast_fill_chars
+        )
+        cls.app.post_message_transport = os.getenv(
+            "POST_MESSAGE_TRANSPORT", cls.app.post_message_transport
+        ).strip().lower()
+        cls.app.integration_endpoint = os.getenv(
+            "INTEGRATION_ENDPOINT", cls.app.integration_endpoint
+        )
+        cls.app.integration_concurrency = _env_int(
+            "INTEGRATION_CONCURRENCY", cls.app.integration_concurrency
+        )
+        cls.app.integration_user = os.getenv(
+            "INTEGRATION_USER", cls.app.integration_user
+        )
+        cls.app.integration_pass = os.getenv(
+            "INTEGRATION_PASS", cls.app.integration_pass
+        )
+        cls.app.metrics_export_path = os.getenv(
+            "METRICS_EXPORT_PATH", cls.app.metrics_export_path
+        )
+        cls.app.max_session_recoveries = _env_int(
+            "MAX_SESSION_RECOVERIES", cls.app.max_session_recoveries
+        )
+        cls.app.post_prefetch_depth = _env_int(
+            "POST_PREFETCH_DEPTH", cls.app.post_prefetch_depth
+        )
+        cls.app.stage_scheduler = _env_flag(
+            "STAGE_SCHEDULER", cls.app.stage_scheduler
+        )
+        cls.app.scheduler_wave_size = _env_int(
+            "SCHEDULER_WAVE_SIZE", cls.app.scheduler_wave_size
+        )
+        cls.app.scheduler_db_concurrency = _env_int(
+            "SCHEDULER_DB_CONCURRENCY", cls.app.scheduler_db_concurrency
+        )
+        cls.app.retry_budget = _env_int(
+            "RETRY_BUDGET", cls.app.retry_budget
+        )
+        cls.app.retry_unknown_errors = _env_flag(
+            "RETRY_UNKNOWN_ERRORS", cls.app.retry_unknown_errors
+        )
+        cls.app.retry_backoff_base_s = _env_float(
+            "RETRY_BACKOFF_BASE_S", cls.app.retry_backoff_base_s
+        )
+        cls.app.retry_backoff_cap_s = _env_float(
+            "RETRY_BACKOFF_CAP_S", cls.app.retry_backoff_cap_s
+        )
+        cls.app.checkpoint_path = os.getenv(
+            "CHECKPOINT_PATH", cls.app.checkpoint_path
+        )
+        cls.app.workflow_file = os.getenv(
+            "WORKFLOW_FILE", cls.app.workflow_file
+        )
+        cls.app.prod_confirmation_token = os.getenv(
+            "PROD_CONFIRMATION_TOKEN", cls.app.prod_confirmation_token
+        )
+        cls.browser.capture_level = os.getenv(
+            "SCREENSHOT_CAPTURE_LEVEL", cls.browser.capture_level
+        ).strip().lower()
         cls.app.credentials_env = os.getenv(
             "APP_CREDENTIALS_ENV", cls.app.credentials_env
         )
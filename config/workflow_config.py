@@ -6,7 +6,8 @@ Replaces the deeply nested dict structure in operations_config.py.
 """
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from fnmatch import fnmatchcase
+from typing import Any, Iterable, Iterator
 from config.settings import StepNames
 
 
@@ -75,6 +76,9 @@ class OpenIlpnUiStep:
     close_after_open: bool = False
     drill_detail: bool = False
     tab_click_timeout_ms: int = 3000
+    verify_only: bool = False  # check grid data instead of opening rows/tabs
+    expected_status: str | None = None
+    expected_location: str | None = None
     enabled: bool = True
 
     def to_dict(self) -> dict[str, Any]:
@@ -88,6 +92,9 @@ class OpenIlpnUiStep:
             "close_after_open": self.close_after_open,
             "drill_detail": self.drill_detail,
             "tab_click_timeout_ms": self.tab_click_timeout_ms,
+            "verify_only": self.verify_only,
+            "expected_status": self.expected_status,
+            "expected_location": self.expected_location,
         }
 
 
@@ -175,22 +182,24 @@ class Workflow:
     name: str
     bucket: str = "inbound"
     steps: dict[str, Any] = field(default_factory=dict)
+    warehouse: str = ""  # empty: the session's warehouse (Settings.app.change_warehouse)
 
     @property
     def full_name(self) -> str:
         return f"{self.bucket}.{self.name}"
 
-    def to_tuple(self) -> tuple[str, dict[str, Any]]:
-        """Convert to the format expected by WorkflowStageExecutor."""
-        return (self.full_name, self.steps)
+    def to_tuple(self) -> tuple[str, dict[str, Any], str]:
+        """Convert to the (name, steps, warehouse) format expected by main.run_automation."""
+        return (self.full_name, self.steps, self.warehouse)
 
 
 class WorkflowBuilder:
     """Fluent builder for creating workflows."""
 
-    def __init__(self, name: str, bucket: str):
+    def __init__(self, name: str, bucket: str, warehouse: str = ""):
         self._name = name
         self._bucket = bucket
+        self._warehouse = warehouse
         self._steps: dict[str, Any] = {}
         self._step_names = StepNames()
 
@@ -225,6 +234,7 @@ class WorkflowBuilder:
             name=self._name,
             bucket=self._bucket,
             steps=self._steps,
+            warehouse=self._warehouse,
         )
 
 
@@ -233,34 +243,10 @@ class WorkflowBuilder:
 # =============================================================================
 
 def create_default_workflows() -> list[Workflow]:
-    """Create the default workflow configurations."""
-    workflows = []
-
-    # Standard receive happy path
-    for flow in FlowType:
-        receive_flow = (
-            WorkflowBuilder(f"{flow}", "inbound")
-            .postMessageStep(PostMessageStep(
-                message_type="ASN",
-                source="db",
-                lookback_days=14,
-                db_env="prod",
-                asn_items=[
-                    AsnItem(item_name="45119VA010", shipped_qty=10000),
-                ],
-            ))
-            .receivingStep(ReceivingStep(
-                flow=flow,
-                auto_handle_deviation=True,
-                open_ui=OpenUIConfig(entries=[
-                    OpenIlpnUiStep(drill_detail=True),
-                ]),
-            ))
-            .build()
-        )
-        workflows.append(receive_flow)
+    """Create the default workflow configurations (one receive flow per FlowType)."""
+    from config.workflow_matrix import WorkflowMatrix
 
-    return workflows
+    return list(WorkflowMatrix(items=["45119VA010"], quantities=[10000], name_format="{flow}"))
 
 
 def workflows_to_legacy_format(workflows: list[Workflow]) -> dict[str, dict[str, dict]]:
@@ -280,10 +266,59 @@ def workflows_to_legacy_format(workflows: list[Workflow]) -> dict[str, dict[str,
     return result
 
 
-def flatten_workflows(workflows: list[Workflow]) -> list[tuple[str, dict[str, Any]]]:
+def flatten_workflows(workflows: list[Workflow]) -> list[tuple[str, dict[str, Any], str]]:
     """
-    Flatten workflows to list of (name, stages) tuples.
+    Flatten workflows to list of (name, stages, warehouse) tuples.
     
     This is the format expected by main.py's run_automation().
     """
     return [workflow.to_tuple() for workflow in workflows]
+
+
+def iter_flattened_workflows(workflows: Iterable[Workflow]) -> Iterator[tuple[str, dict[str, Any], str]]:
+    """Lazy flatten_workflows for streamed suites (see config.workflow_files)."""
+    for workflow in workflows:
+        yield workflow.to_tuple()
+
+
+def workflow_flows(workflow: Workflow) -> set[str]:
+    """Receive flow values used by a workflow's stages."""
+    flows = set()
+    for stage in workflow.steps.values():
+        if isinstance(stage, dict) and stage.get("flow"):
+            flow = stage["flow"]
+            flows.add(flow.value if isinstance(flow, FlowType) else str(flow))
+    return flows
+
+
+def filter_workflows(
+    workflows: Iterable[Workflow],
+    buckets: Iterable[str] = (),
+    names: Iterable[str] = (),
+    flows: Iterable[str] = (),
+) -> Iterator[Workflow]:
+    """
+    Yield workflows matching every given filter (empty filters match everything).
+
+    Names are glob patterns checked against both `name` and `bucket.name`; flows match
+    FlowType values or names, case-insensitively.
+    """
+    bucket_set = {bucket.lower() for bucket in buckets}
+    name_patterns = list(names)
+    flow_set = set()
+    for flow in flows:
+        flow_set.add(flow.upper())
+        if flow.upper() in FlowType.__members__:
+            flow_set.add(FlowType[flow.upper()].value)
+
+    for workflow in workflows:
+        if bucket_set and workflow.bucket.lower() not in bucket_set:
+            continue
+        if name_patterns and not any(
+            fnmatchcase(workflow.name, pattern) or fnmatchcase(workflow.full_name, pattern)
+            for pattern in name_patterns
+        ):
+            continue
+        if flow_set and not {flow.upper() for flow in workflow_flows(workflow)} & flow_set:
+            continue
+        yield workflow
@@ -0,0 +1,286 @@
+"""
+Workflow Files - load workflow suites from YAML, JSON or JSONL.
+
+Each record is {"name", "bucket", "steps"} with an optional "warehouse". Every stage under
+"steps" maps onto its step dataclass (PostMessageStep, ReceivingStep, LoadingStep,
+OpenIlpnUiStep, OpenTasksUiStep) and goes through WorkflowBuilder, so file-based workflows
+produce exactly the stage dicts the Python-defined ones do. Field schemas are derived from
+the dataclasses once and cached.
+
+Records are yielded one at a time: JSONL files and multi-document YAML streams are read
+lazily, so large suites start immediately and use constant memory.
+
+    # suite.yaml
+    name: receive_blind
+    bucket: inbound
+    steps:
+      postMessage: {type: ASN, db_env: prod, asn_items: [{item_name: 45119VA010}]}
+      runReceiving: {flow: BLIND_ILPN, open_ui: [{kind: ilpns, drill_detail: true}]}
+"""
+import json
+import types
+import typing
+from dataclasses import MISSING, dataclass, fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator
+
+from config.settings import StepNames
+from config.workflow_config import (
+    LoadingStep,
+    OpenIlpnUiStep,
+    OpenTasksUiStep,
+    OpenUIConfig,
+    PostMessageStep,
+    ReceivingStep,
+    Workflow,
+    WorkflowBuilder,
+)
+
+YAML_SUFFIXES = (".yaml", ".yml")
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+JSON_SUFFIXES = (".json",)
+
+# StepNames attribute -> (step dataclass, WorkflowBuilder method)
+STAGE_TYPES = {
+    "postMessage": (PostMessageStep, "postMessageStep"),
+    "runReceiving": (ReceivingStep, "receivingStep"),
+    "runLoading": (LoadingStep, "loadingStep"),
+    "OpenTasksUi": (OpenTasksUiStep, "openTasksUiStep"),
+    "OpenIlpnUi": (OpenIlpnUiStep, "openIlpnUiStep"),
+}
+
+# File keys that differ from the dataclass field (matching the stage dicts' own keys).
+FIELD_ALIASES = {
+    PostMessageStep: {"type": "message_type"},
+}
+
+OPEN_UI_KINDS = {"ilpns": OpenIlpnUiStep, "tasks": OpenTasksUiStep}
+
+
+class WorkflowFileError(ValueError):
+    """A workflow file record failed to parse or validate."""
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    annotation: Any
+    required: bool
+
+
+@lru_cache(maxsize=None)
+def step_schema(cls: type) -> dict[str, FieldSpec]:
+    """Field name -> spec for a step dataclass, built once per class."""
+    hints = typing.get_type_hints(cls)
+    return {
+        f.name: FieldSpec(
+            f.name,
+            hints[f.name],
+            f.default is MISSING and f.default_factory is MISSING,
+        )
+        for f in fields(cls)
+    }
+
+
+@lru_cache(maxsize=None)
+def _stage_lookup() -> dict[str, tuple[str, type, str]]:
+    """Lower-cased stage key -> (canonical key, dataclass, builder method)."""
+    names = StepNames()
+    return {
+        getattr(names, attr).lower(): (getattr(names, attr), cls, method)
+        for attr, (cls, method) in STAGE_TYPES.items()
+    }
+
+
+def build_step(cls: type, data: Any, where: str):
+    """Validate `data` against `cls`'s schema and construct it."""
+    if isinstance(data, cls):
+        return data
+    if not isinstance(data, dict):
+        raise WorkflowFileError(f"{where}: expected a mapping, got {type(data).__name__}")
+
+    schema = step_schema(cls)
+    aliases = FIELD_ALIASES.get(cls, {})
+    kwargs: dict[str, Any] = {}
+    for key, value in data.items():
+        name = aliases.get(key, key)
+        spec = schema.get(name)
+        if spec is None:
+            raise WorkflowFileError(f"{where}: unknown field '{key}' for {cls.__name__}")
+        kwargs[name] = _coerce(value, spec.annotation, f"{where}.{key}")
+
+    missing = [spec.name for spec in schema.values() if spec.required and spec.name not in kwargs]
+    if missing:
+        raise WorkflowFileError(f"{where}: {cls.__name__} missing required field(s): {', '.join(missing)}")
+    return cls(**kwargs)
+
+
+def _coerce(value: Any, annotation: Any, where: str) -> Any:
+    if annotation is Any:
+        return value
+
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        options = typing.get_args(annotation)
+        if value is None and type(None) in options:
+            return None
+        if set(options) == set(OPEN_UI_KINDS.values()):
+            return _build_open_ui_entry(value, where)
+        errors = []
+        for option in options:
+            if option is type(None):
+                continue
+            try:
+                return _coerce(value, option, where)
+            except WorkflowFileError as exc:
+                errors.append(str(exc))
+        raise WorkflowFileError(errors[0] if errors else f"{where}: invalid value {value!r}")
+
+    if origin is list:
+        if not isinstance(value, list):
+            raise WorkflowFileError(f"{where}: expected a list")
+        (item_type,) = typing.get_args(annotation) or (Any,)
+        return [_coerce(item, item_type, f"{where}[{i}]") for i, item in enumerate(value)]
+
+    if origin is dict or annotation is dict:
+        if not isinstance(value, dict):
+            raise WorkflowFileError(f"{where}: expected a mapping")
+        return value
+
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _coerce_enum(value, annotation, where)
+
+    if annotation is OpenUIConfig and isinstance(value, list):
+        value = {"entries": value}
+    if is_dataclass(annotation):
+        return build_step(annotation, value, where)
+
+    if annotation is bool:
+        if isinstance(value, bool):
+            return value
+    elif annotation is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif annotation is float:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    elif annotation is str:
+        if isinstance(value, str):
+            return value
+    else:
+        return value
+    raise WorkflowFileError(f"{where}: expected {annotation.__name__}, got {value!r}")
+
+
+def _coerce_enum(value: Any, enum_cls: type[Enum], where: str) -> Enum:
+    if isinstance(value, enum_cls):
+        return value
+    text = str(value).strip().upper()
+    for member in enum_cls:
+        if text in (member.name, str(member.value).upper()):
+            return member
+    choices = ", ".join(member.name for member in enum_cls)
+    raise WorkflowFileError(f"{where}: unknown {enum_cls.__name__} '{value}' (choose from {choices})")
+
+
+def _build_open_ui_entry(value: Any, where: str):
+    if not isinstance(value, dict):
+        raise WorkflowFileError(f"{where}: expected a mapping")
+    data = dict(value)
+    kind = str(data.pop("kind", "ilpns")).lower()
+    cls = OPEN_UI_KINDS.get(kind)
+    if cls is None:
+        raise WorkflowFileError(f"{where}: unknown open_ui kind '{kind}' (choose from {', '.join(OPEN_UI_KINDS)})")
+    return build_step(cls, data, where)
+
+
+def parse_workflow_record(record: Any, where: str = "record") -> Workflow:
+    """Validate one {name, bucket, warehouse, steps} record and build its Workflow."""
+    if not isinstance(record, dict) or not record.get("name"):
+        raise WorkflowFileError(f"{where}: workflow record needs a 'name'")
+    unknown = set(record) - {"name", "bucket", "warehouse", "steps"}
+    if unknown:
+        raise WorkflowFileError(f"{where}: unknown workflow key(s): {', '.join(sorted(unknown))}")
+    steps = record.get("steps") or {}
+    if not isinstance(steps, dict):
+        raise WorkflowFileError(f"{where}: 'steps' must be a mapping of stage name to config")
+
+    name = str(record["name"])
+    builder = WorkflowBuilder(name, str(record.get("bucket") or "inbound"), str(record.get("warehouse") or ""))
+    lookup = _stage_lookup()
+    for stage_key, stage_data in steps.items():
+        entry = lookup.get(str(stage_key).lower())
+        if entry is None:
+            raise WorkflowFileError(
+                f"{where} ({name}): unknown stage '{stage_key}' "
+                f"(choose from {', '.join(canonical for canonical, _, _ in lookup.values())})"
+            )
+        canonical, cls, method = entry
+        step = build_step(cls, stage_data or {}, f"{where} ({name}).{canonical}")
+        getattr(builder, method)(step)
+    return builder.build()
+
+
+def iter_workflow_records(path: str | Path) -> Iterator[tuple[str, Any]]:
+    """Yield (location, raw record) pairs from a YAML, JSON or JSONL file, lazily where the format allows."""
+    source = Path(path)
+    suffix = source.suffix.lower()
+
+    if suffix in JSONL_SUFFIXES:
+        with source.open(encoding="utf-8") as handle:
+            for line_no, line in enumerate(handle, 1):
+                text = line.strip()
+                if not text or text.startswith("#"):
+                    continue
+                try:
+                    yield f"{source.name}:{line_no}", json.loads(text)
+                except json.JSONDecodeError as exc:
+                    raise WorkflowFileError(f"{source.name}:{line_no}: invalid JSON ({exc.msg})") from exc
+
+    elif suffix in YAML_SUFFIXES:
+        try:
+            import yaml
+        except ImportError as exc:
+            raise WorkflowFileError("YAML workflow files need PyYAML (pip install PyYAML)") from exc
+        with source.open(encoding="utf-8") as handle:
+            try:
+                for doc_no, document in enumerate(yaml.safe_load_all(handle), 1):
+                    yield from _records_in(document, f"{source.name}#doc{doc_no}")
+            except yaml.YAMLError as exc:
+                raise WorkflowFileError(f"{source.name}: invalid YAML ({exc})") from exc
+
+    elif suffix in JSON_SUFFIXES:
+        with source.open(encoding="utf-8") as handle:
+            try:
+                document = json.load(handle)
+            except json.JSONDecodeError as exc:
+                raise WorkflowFileError(f"{source.name}: invalid JSON ({exc.msg})") from exc
+        yield from _records_in(document, source.name)
+
+    else:
+        raise WorkflowFileError(f"{source}: unsupported workflow file type '{suffix}' (use .yaml, .json or .jsonl)")
+
+
+def _records_in(document: Any, where: str) -> Iterator[tuple[str, Any]]:
+    if document is None:
+        return
+    if isinstance(document, dict) and "workflows" in document:
+        document = document["workflows"]
+    if isinstance(document, list):
+        for number, record in enumerate(document, 1):
+            yield f"{where}[{number}]", record
+    else:
+        yield where, document
+
+
+def iter_workflow_file(path: str | Path) -> Iterator[Workflow]:
+    """Stream validated Workflows from a file."""
+    for where, record in iter_workflow_records(path):
+        yield parse_workflow_record(record, where)
+
+
+def load_workflow_file(path: str | Path) -> list[Workflow]:
+    """Load every workflow in a file (prefer iter_workflow_file for large suites)."""
+    return list(iter_workflow_file(path))
@@ -0,0 +1,152 @@
+"""
+Workflow Matrix - lazy items x quantities x flows x warehouses sweeps.
+
+A WorkflowMatrix describes a combinatorial sweep without building it: scenario n is
+decoded from its index (mixed radix over the dimensions) and built through WorkflowBuilder
+only when asked for, so iterating, indexing and sharding all run in constant memory.
+
+Names are deterministic ("AUR.BLIND_ILPN.45119VA010.q10000") and shards are contiguous
+index ranges, so `shard(i, n)` on n workers partitions the sweep with no overlap and sizes
+differing by at most one. Flows vary fastest, so every shard longer than the flow list
+covers each flow; warehouses vary slowest, so a shard switches warehouse only when it
+crosses into the next warehouse's block.
+
+    matrix = WorkflowMatrix(items=["45119VA010", "ITEM-2"], quantities=[1, 10000],
+                            warehouses=WAREHOUSE_CHOICES)
+    for workflow in filter_workflows(matrix.shard(2, 4), flows=["BLIND_ILPN"]):
+        ...
+"""
+from dataclasses import dataclass, replace
+from typing import Iterable, Iterator, Sequence
+
+from config.workflow_config import (
+    AsnItem,
+    FlowType,
+    OpenIlpnUiStep,
+    OpenUIConfig,
+    PostMessageStep,
+    ReceivingStep,
+    Workflow,
+    WorkflowBuilder,
+)
+
+DEFAULT_NAME_FORMAT = "{flow.name}.{item}.q{quantity}"
+WAREHOUSE_NAME_FORMAT = "{warehouse}." + DEFAULT_NAME_FORMAT
+
+
+def default_post_template() -> PostMessageStep:
+    return PostMessageStep(message_type="ASN", source="db", lookback_days=14, db_env="prod")
+
+
+def default_receive_template() -> ReceivingStep:
+    return ReceivingStep(
+        auto_handle_deviation=True,
+        open_ui=OpenUIConfig(entries=[OpenIlpnUiStep(drill_detail=True)]),
+    )
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One point of the matrix."""
+    index: int
+    item: str
+    quantity: int
+    flow: FlowType
+    warehouse: str = ""
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse "i/n" (1-based) into (i, n)."""
+    try:
+        index_text, count_text = spec.split("/", 1)
+        index, count = int(index_text), int(count_text)
+    except ValueError as exc:
+        raise ValueError(f"Invalid shard '{spec}' (expected i/n, e.g. 2/4)") from exc
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}' (need 1 <= i <= n)")
+    return index, count
+
+
+class WorkflowMatrix:
+    """Lazily expanded post + receive scenarios over items, quantities, flows and warehouses."""
+
+    def __init__(
+        self,
+        items: Sequence[str],
+        quantities: Sequence[int] = (2000,),
+        flows: Sequence[FlowType] = tuple(FlowType),
+        warehouses: Sequence[str] = (),
+        bucket: str = "inbound",
+        name_format: str | None = None,
+        post_template: PostMessageStep | None = None,
+        receive_template: ReceivingStep | None = None,
+    ):
+        self.items = tuple(items)
+        self.quantities = tuple(quantities)
+        self.flows = tuple(flows)
+        self.warehouses = tuple(warehouses) or ("",)
+        self.bucket = bucket
+        self.name_format = name_format or (WAREHOUSE_NAME_FORMAT if any(self.warehouses) else DEFAULT_NAME_FORMAT)
+        self.post_template = post_template or default_post_template()
+        self.receive_template = receive_template or default_receive_template()
+        # Last dimension varies fastest: consecutive scenarios differ by flow and share a warehouse.
+        self._dimensions = (self.warehouses, self.items, self.quantities, self.flows)
+
+    def __len__(self) -> int:
+        total = 1
+        for values in self._dimensions:
+            total *= len(values)
+        return total
+
+    def __iter__(self) -> Iterator[Workflow]:
+        return self.workflows(range(len(self)))
+
+    def __getitem__(self, index: int) -> Workflow:
+        return self.build(self.scenario(index))
+
+    def scenario(self, index: int) -> Scenario:
+        """Decode a scenario from its position in the matrix."""
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f"scenario {index} out of range for a {size}-scenario matrix")
+        picks = []
+        remainder = index
+        for values in reversed(self._dimensions):
+            remainder, position = divmod(remainder, len(values))
+            picks.append(values[position])
+        warehouse, item, quantity, flow = reversed(picks)
+        return Scenario(index, item, quantity, flow, warehouse)
+
+    def name(self, scenario: Scenario) -> str:
+        return self.name_format.format(
+            index=scenario.index,
+            item=scenario.item,
+            quantity=scenario.quantity,
+            flow=scenario.flow,
+            warehouse=scenario.warehouse,
+        )
+
+    def build(self, scenario: Scenario) -> Workflow:
+        """Build one scenario's workflow from the step templates."""
+        return (
+            WorkflowBuilder(self.name(scenario), self.bucket, scenario.warehouse)
+            .postMessageStep(replace(
+                self.post_template,
+                asn_items=[AsnItem(item_name=scenario.item, shipped_qty=scenario.quantity)],
+            ))
+            .receivingStep(replace(self.receive_template, flow=scenario.flow))
+            .build()
+        )
+
+    def workflows(self, indexes: Iterable[int]) -> Iterator[Workflow]:
+        for index in indexes:
+            yield self[index]
+
+    def shard(self, index: int, count: int) -> Iterator[Workflow]:
+        """Scenarios for shard `index` of `count` (1-based); skipped scenarios are never built."""
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Invalid shard {index}/{count} (need 1 <= i <= n)")
+        size = len(self)
+        return self.workflows(range(size * (index - 1) // count, size * index // count))
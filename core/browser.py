@@ -70,7 +70,7 @@ class BrowserManager:
             ignore_https_errors=True
         )
 
-    def new_context(self) -> BrowserContext:
+    def new_context(self, storage_state: dict | str | None = None) -> BrowserContext:
         """Create an additional browser context using the configured viewport and scale."""
         cfg = self.settings.browser
         scale = max(cfg.device_scale_factor, 1.0)
@@ -81,7 +81,8 @@ class BrowserManager:
         return self.browser.new_context(
             viewport=viewport,
             device_scale_factor=cfg.device_scale_factor,
-            ignore_https_errors=True
+            ignore_https_errors=True,
+            storage_state=storage_state,
         )
 
     def new_page(self) -> Page:
@@ -0,0 +1,126 @@
+"""
+Checkpoint Store - crash-safe record of completed workflow steps.
+
+Each completed step is committed to a small SQLite file together with the workflow
+metadata it produced (asn_id, receive_items, ...). A resumed run asks for the leading
+steps a workflow already finished and the metadata to carry forward, so a restart only
+repeats unfinished work. Steps are fingerprinted by their config, so editing a step's
+config makes it (and everything after it) run again.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from core.logger import app_log
+
+_SCHEMA = """
+create table if not exists step_checkpoints (
+    workflow_index integer not null,
+    workflow_name  text    not null,
+    step_index     integer not null,
+    step_name      text    not null,
+    fingerprint    text    not null,
+    metadata       text    not null,
+    completed_at   real    not null,
+    primary key (workflow_index, workflow_name, step_index)
+)
+"""
+
+
+def step_fingerprint(step_name: str, step_data: Any) -> str:
+    encoded = json.dumps([step_name, step_data], sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """SQLite-backed per-workflow, per-step completion log."""
+
+    FILENAME = "checkpoints.sqlite3"
+    RUN_DIR = "runs"
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("pragma journal_mode=wal")
+        self._conn.execute("pragma synchronous=full")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_settings(cls, settings: Any) -> "CheckpointStore":
+        """Store at CHECKPOINT_PATH, or in a run dir next to the screenshots folder.
+
+        Not inside it: ScreenshotManager wipes the screenshots folder on startup.
+        """
+        path = getattr(settings.app, "checkpoint_path", "") or ""
+        if not isinstance(path, str) or not path:
+            path = str(Path(settings.browser.screenshot_dir).parent / cls.RUN_DIR / cls.FILENAME)
+        return cls(path)
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def reset(self):
+        """Forget every checkpoint (start of a fresh, non-resumed run)."""
+        with self._conn:
+            self._conn.execute("delete from step_checkpoints")
+
+    def record_step(
+        self,
+        workflow_index: int,
+        workflow_name: str,
+        step_index: int,
+        step_name: str,
+        step_data: Any,
+        metadata: dict[str, Any],
+    ):
+        """Mark a step complete; committed before returning so a crash can't lose it."""
+        with self._conn:
+            self._conn.execute(
+                "insert or replace into step_checkpoints values (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    workflow_index,
+                    workflow_name,
+                    step_index,
+                    step_name,
+                    step_fingerprint(step_name, step_data),
+                    json.dumps(metadata or {}, default=str),
+                    time.time(),
+                ),
+            )
+
+    def resume_point(
+        self, workflow_index: int, workflow_name: str, steps: dict[str, Any]
+    ) -> tuple[int, dict[str, Any]]:
+        """Number of leading steps already completed and the metadata they left behind."""
+        rows = self._conn.execute(
+            "select step_index, fingerprint, metadata from step_checkpoints "
+            "where workflow_index = ? and workflow_name = ?",
+            (workflow_index, workflow_name),
+        ).fetchall()
+        recorded = {step_index: (fingerprint, metadata) for step_index, fingerprint, metadata in rows}
+
+        completed, metadata = 0, {}
+        for step_index, (step_name, step_data) in enumerate(steps.items(), 1):
+            entry = recorded.get(step_index)
+            if not entry or entry[0] != step_fingerprint(step_name, step_data):
+                break
+            completed = step_index
+            metadata = json.loads(entry[1])
+
+        if completed:
+            app_log(
+                f"⏭️ Resuming workflow {workflow_index} ({workflow_name}) after "
+                f"{completed}/{len(steps)} completed steps"
+            )
+        return completed, metadata
@@ -13,13 +13,53 @@ class ConnectionResetDetected(RuntimeError):
     """Raised when the browser shows the generic connection-reset error page."""
 
 
+class PostBatchInterrupted(ConnectionResetDetected):
+    """A connection reset stopped a batched post; `sent` holds the outcomes read before it."""
+
+    def __init__(self, reason: str, sent: list[bool]):
+        super().__init__(reason)
+        self.sent = sent
+
+
 T = TypeVar("T")
 
 
+# Chrome's net-error interstitial carries a fixed marker; reading it avoids pulling the
+# whole body text. Body text is only returned when the caller asks for it.
+ERROR_PAGE_PROBE_SCRIPT = """
+(includeText) => {
+    const body = document.body;
+    const marker = !!document.getElementById('main-frame-error')
+        || !!(body && body.classList && body.classList.contains('neterror'));
+    const codeEl = marker ? document.querySelector('.error-code') : null;
+    return {
+        marker,
+        code: codeEl ? (codeEl.textContent || '').trim() : '',
+        text: (!marker && includeText && body) ? (body.innerText || '') : null,
+    };
+}
+"""
+
+
 class ConnectionResetGuard:
-    """Watch the Playwright page for Chrome's connection-reset error screen."""
+    """Watch the Playwright page for Chrome's connection-reset error screen.
+
+    Main-frame `response` / `requestfailed` events decide most navigations without
+    touching the DOM; the error-page marker (and, failing that, body text) is only
+    read when those signals are missing or inconclusive.
+    """
 
     ERROR_URL_PREFIXES = ("chrome-error://",)
+    RESET_ERRORS = (
+        "err_connection_reset",
+        "err_connection_closed",
+        "err_connection_refused",
+        "err_connection_timed_out",
+        "err_empty_response",
+        "err_name_not_resolved",
+        "err_internet_disconnected",
+    )
+    IGNORED_FAILURES = ("err_aborted",)
     KEYWORDS = (
         "connection was reset",
         "err_connection_reset",
@@ -31,6 +71,10 @@ class ConnectionResetGuard:
         self.page = page
         self.screenshot_mgr = screenshot_mgr
         self._reason: Optional[str] = None
+        self._confirmed_url: Optional[str] = None
+        self._suspect = False
+        page.on("response", self._handle_response)
+        page.on("requestfailed", self._handle_request_failed)
         page.on("framenavigated", self._handle_frame_navigation)
         page.on("domcontentloaded", self._handle_page_event)
         page.on("load", self._handle_page_event)
@@ -63,6 +107,30 @@ class ConnectionResetGuard:
 
     # --- internal helpers -------------------------------------------------
 
+    def _handle_response(self, response):
+        if self._reason or not self._is_main_document(response.request):
+            return
+        url = response.url or ""
+        if self._is_error_url(url):
+            self._trip(f"chrome error page loaded ({url})")
+        elif response.status < 400:
+            self._confirmed_url = self._strip_fragment(url)
+            self._suspect = False
+        else:
+            # Proxies answer resets with their own error pages; let the DOM decide.
+            self._confirmed_url = None
+            self._suspect = True
+
+    def _handle_request_failed(self, request):
+        if self._reason or not self._is_main_document(request):
+            return
+        failure = (request.failure or "").lower()
+        if any(code in failure for code in self.RESET_ERRORS):
+            self._trip(f"navigation failed ({request.failure})")
+        elif not any(code in failure for code in self.IGNORED_FAILURES):
+            self._confirmed_url = None
+            self._suspect = True
+
     def _handle_frame_navigation(self, frame: Frame):
         if frame == self.page.main_frame:
             self._check_frame(frame)
@@ -74,22 +142,46 @@ class ConnectionResetGuard:
         if self._reason:
             return
 
-        url = (frame.url or "").lower()
-        if any(url.startswith(prefix) for prefix in self.ERROR_URL_PREFIXES):
+        url = frame.url or ""
+        if self._is_error_url(url):
             self._trip(f"chrome error page loaded ({frame.url})")
             return
 
+        # A successful document response for this URL already rules out the error page.
+        if not self._suspect and self._confirmed_url == self._strip_fragment(url):
+            return
+
+        # Body text is only worth extracting after a failed or non-OK navigation.
         try:
-            body_text = frame.evaluate(
-                "(document.body && document.body.innerText) || ''"
-            )
+            probe = frame.evaluate(ERROR_PAGE_PROBE_SCRIPT, self._suspect)
         except Exception:
             return
+        if not isinstance(probe, dict):
+            return
+
+        if probe.get("marker"):
+            code = probe.get("code") or "unknown error"
+            self._trip(f"browser error page shown ({code})")
+            return
 
-        normalized = (body_text or "").lower()
+        normalized = (probe.get("text") or "").lower()
         if any(keyword in normalized for keyword in self.KEYWORDS):
             self._trip("browser reported the connection was reset")
 
+    def _is_main_document(self, request) -> bool:
+        try:
+            return bool(request.is_navigation_request()) and request.frame == self.page.main_frame
+        except Exception:
+            return False
+
+    def _is_error_url(self, url: str) -> bool:
+        lowered = url.lower()
+        return any(lowered.startswith(prefix) for prefix in self.ERROR_URL_PREFIXES)
+
+    @staticmethod
+    def _strip_fragment(url: str) -> str:
+        return url.split("#", 1)[0]
+
     def _trip(self, reason: str):
         if self._reason:
             return
@@ -43,6 +43,72 @@ def ensure_detour_page_ready(detour_page, main_page=None, settings=None, screens
         return False
 
 
+DETOUR_WINDOW_REFRESH_JS = """
+(id) => {
+    const win = window.Ext && Ext.getCmp(id);
+    if (!win || win.isDestroyed || !win.isVisible()) return false;
+    win.toFront && win.toFront();
+    const reload = (grids) => grids.forEach((grid) => {
+        const store = grid.getStore && grid.getStore();
+        if (store && store.reload) store.reload();
+    });
+    reload(win.query ? win.query('grid') : []);
+    (win.el ? Array.from(win.el.dom.querySelectorAll('iframe')) : []).forEach((frame) => {
+        try {
+            const inner = frame.contentWindow;
+            if (inner && inner.Ext && inner.Ext.ComponentQuery) reload(inner.Ext.ComponentQuery.query('grid'));
+        } catch (e) {}
+    });
+    return true;
+}
+"""
+
+DETOUR_ACTIVE_WINDOW_JS = """
+() => {
+    const win = window.Ext && Ext.WindowManager && Ext.WindowManager.getActive();
+    if (!win) return null;
+    const title = (win.getTitle ? win.getTitle() : win.title) || '';
+    return { id: win.getId(), title: String(title).replace(/<[^>]*>/g, '').trim() };
+}
+"""
+
+
+class DetourWindowCache:
+    """Keeps detour windows (iLPNs, Tasks, ...) open on the detour page, keyed by match_text."""
+
+    def __init__(self, page):
+        self.page = page
+        self._windows: dict[str, dict[str, str]] = {}
+
+    def titles(self) -> list[str]:
+        return [entry["title"] for entry in self._windows.values() if entry.get("title")]
+
+    def remember(self, match_text: str) -> None:
+        """Record the active window as the one opened for match_text."""
+        try:
+            entry = self.page.evaluate(DETOUR_ACTIVE_WINDOW_JS)
+        except Exception:
+            return
+        if isinstance(entry, dict) and entry.get("id"):
+            self._windows[match_text] = entry
+
+    def forget(self, match_text: str) -> None:
+        self._windows.pop(match_text, None)
+
+    def refresh(self, match_text: str) -> bool:
+        """Bring the cached window forward and reload its grid stores; False when it is gone."""
+        entry = self._windows.get(match_text)
+        if not entry:
+            return False
+        try:
+            alive = self.page.evaluate(DETOUR_WINDOW_REFRESH_JS, entry["id"]) is True
+        except Exception:
+            alive = False
+        if not alive:
+            self.forget(match_text)
+        return alive
+
+
 class NullDetourManager:
     """No-op detour handler."""
 
@@ -70,6 +136,7 @@ class DetourManager:
         detour_nav: NavigationManager | None = None,
         settings=None,
         fill_ilpn_cb: Callable[[str, Any], bool] | None = None,
+        window_cache: DetourWindowCache | None = None,
     ):
         self.open_ui_cfg = open_ui_cfg
         self.stage_map = stage_map or {}
@@ -80,6 +147,7 @@ class DetourManager:
         self.detour_nav = detour_nav
         self.settings = settings
         self.fill_ilpn_cb = fill_ilpn_cb
+        self.window_cache = window_cache
 
     def _context_to_dict(self, context: Any) -> Optional[Dict[str, Any]]:
         if context is None:
@@ -105,6 +173,7 @@ class DetourManager:
             settings=self.settings,
             fill_ilpn_cb=self.fill_ilpn_cb,
             screen_context=self._context_to_dict(context),
+            window_cache=self.window_cache,
         )
 
 
@@ -119,10 +188,14 @@ def run_open_ui_detours(
     settings=None,
     fill_ilpn_cb: Callable[[str, Any], bool] | None = None,
     screen_context: dict | None = None,
+    window_cache: DetourWindowCache | None = None,
 ) -> bool:
     """
     Open one or more configured UIs mid-flow (e.g., Tasks or iLPNs).
     Returns True if all detours succeed or none requested.
+
+    With a window_cache (detour page only), windows opened by earlier detours are
+    refreshed in place instead of being closed and reopened through the menu.
     """
     if not open_ui_cfg:
         return True
@@ -152,10 +225,15 @@ def run_open_ui_detours(
         if not use_nav or not use_page:
             return False
 
+        search_term = entry.get("search_term") or base_cfg.get("search_term", "tasks")
+        match_text = entry.get("match_text") or base_cfg.get("match_text", "Tasks (Configuration)")
+        cache = window_cache if detour_page else None
+
         if detour_page:
             ensure_detour_page_ready(detour_page, main_page, settings, screenshot_mgr)
             try:
-                use_nav.close_active_windows(skip_titles=["rf menu"])
+                keep = ["rf menu"] + (cache.titles() if cache else [])
+                use_nav.close_active_windows(skip_titles=keep)
             except Exception:
                 pass
         else:
@@ -164,17 +242,24 @@ def run_open_ui_detours(
             except Exception:
                 pass
 
-        search_term = entry.get("search_term") or base_cfg.get("search_term", "tasks")
-        match_text = entry.get("match_text") or base_cfg.get("match_text", "Tasks (Configuration)")
-        if not use_nav.open_menu_item(search_term, match_text, onDemand=False):
-            rf_log(f"❌ UI detour #{idx} failed.")
-            return False
+        if cache and cache.refresh(match_text):
+            app_log(f"♻️ Reusing open '{match_text}' window")
+        else:
+            # Opening through the menu closes other windows; keep the cached detour windows.
+            open_kwargs = {"skip_titles": ["rf menu"] + cache.titles()} if cache and cache.titles() else {}
+            opened = use_nav.open_menu_item(search_term, match_text, onDemand=False, **open_kwargs)
+            if not opened:
+                rf_log(f"❌ UI detour #{idx} failed.")
+                return False
 
-        # Expand the detour window for better visibility/capture.
-        try:
-            use_nav.maximize_non_rf_windows()
-        except Exception:
-            pass
+            # Expand the detour window for better visibility/capture.
+            try:
+                use_nav.maximize_non_rf_windows()
+            except Exception:
+                pass
+
+            if cache:
+                cache.remember(match_text)
 
         # Wait for the opened window/UI to fully load (reduced timeout - only waits if mask present)
         try:
@@ -196,6 +281,8 @@ def run_open_ui_detours(
         rf_log(f"ℹ️ {operation_note}")
 
         if entry.get("close_after_open"):
+            if cache:
+                cache.forget(match_text)
             try:
                 windows = use_page.locator("div.x-window:visible")
                 if windows.count() > 0:
@@ -211,6 +298,16 @@ def run_open_ui_detours(
             except Exception:
                 pass
 
+        if entry.get("verify_only") and fill_ilpn_cb and screen_context and screen_context.get("ilpn"):
+            expect = {
+                "status": entry.get("expected_status"),
+                "quantity": screen_context.get("quantity"),
+                "location": entry.get("expected_location"),
+            }
+            if not fill_ilpn_cb(str(screen_context.get("ilpn")), page=use_page, expect=expect):
+                return False
+            continue
+
         if entry.get("fill_ilpn") and fill_ilpn_cb and screen_context and screen_context.get("ilpn"):
             if "drill_detail" in entry:
                 drill_detail = entry.get("drill_detail")
@@ -0,0 +1,179 @@
+"""
+Detour Worker - Runs UI detours off the RF thread.
+
+The Playwright sync API is bound to the thread that started it, so the worker owns
+its own Playwright instance, browser and context (seeded with the main session's
+storage state). The RF flow enqueues screen_context snapshots and carries on; results
+are collected when the workflow drains the worker, so a detour that fails after being
+queued is only reported there.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from core.browser import BrowserManager
+from core.detour import DetourWindowCache, run_open_ui_detours
+from core.logger import app_log
+from core.screenshot import ScreenshotManager
+from ui.navigation import NavigationManager
+from utils.wait_utils import WaitUtils
+
+_STOP = object()
+DRAIN_POLL_S = 0.05
+
+
+@dataclass
+class DetourResult:
+    label: str
+    success: bool
+    error: str | None = None
+
+
+class DetourWorker:
+    """Background thread that replays queued detours on a dedicated browser."""
+
+    def __init__(
+        self,
+        settings: Any,
+        *,
+        storage_state: dict,
+        app_url: str,
+        max_pending: int = 32,
+        submit_timeout_s: float = 5.0,
+    ):
+        self.settings = settings
+        self.storage_state = storage_state
+        self.app_url = app_url
+        self.submit_timeout_s = submit_timeout_s
+        self._jobs: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._results: list[DetourResult] = []
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "DetourWorker":
+        self._thread = threading.Thread(target=self._run, name="detour-worker", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, open_ui_cfg: Any, screen_context: dict | None, label: str = "") -> bool:
+        """Queue a detour; the context is copied so later RF screens can't mutate it.
+
+        Returns False (and records a failed result) when the worker is down or the queue
+        stays full for submit_timeout_s; True only means queued, not succeeded.
+        """
+        if not self.is_alive():
+            self._record(DetourResult(label, False, "detour worker not running"))
+            return False
+        try:
+            self._jobs.put((open_ui_cfg, dict(screen_context or {}), label), timeout=self.submit_timeout_s)
+        except queue.Full:
+            app_log(f"⚠️ Detour queue full, dropping {label or 'detour'}")
+            self._record(DetourResult(label, False, "detour queue full"))
+            return False
+        return True
+
+    def drain(self, timeout: float = 300.0) -> list[DetourResult]:
+        """Wait up to `timeout` for queued detours and return the results collected since the last drain.
+
+        Jobs still queued when the worker dies or the deadline passes are reported as failed.
+        """
+        deadline = time.monotonic() + timeout
+        while self._jobs.unfinished_tasks and self.is_alive() and time.monotonic() < deadline:
+            time.sleep(DRAIN_POLL_S)
+        if self._jobs.unfinished_tasks:
+            reason = "detour worker not running" if not self.is_alive() else "detour drain timed out"
+            self._fail_pending(reason)
+        with self._lock:
+            results, self._results = self._results, []
+        return results
+
+    def close(self, timeout: float = 30.0) -> list[DetourResult]:
+        results = self.drain(timeout=timeout)
+        if self.is_alive():
+            try:
+                self._jobs.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        return results
+
+    def is_alive(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def _record(self, result: DetourResult):
+        with self._lock:
+            self._results.append(result)
+
+    def _run(self):
+        try:
+            with BrowserManager(self.settings) as browser_mgr:
+                context = browser_mgr.new_context(storage_state=self.storage_state)
+                page = context.new_page()
+                screenshot_mgr = ScreenshotManager(
+                    str(Path(self.settings.browser.screenshot_dir) / "detours"),
+                    image_format=self.settings.browser.screenshot_format,
+                    image_quality=self.settings.browser.screenshot_quality,
+                    capture_level=getattr(self.settings.browser, "capture_level", "all"),
+                )
+                nav = NavigationManager(page, screenshot_mgr)
+                self._open_app(page, nav)
+                self._process(page, nav, screenshot_mgr)
+        except Exception as exc:
+            app_log(f"❌ Detour worker stopped: {exc}")
+            self._fail_pending(str(exc))
+
+    def _open_app(self, page, nav: NavigationManager):
+        page.goto(self.app_url, wait_until="networkidle", timeout=20000)
+        WaitUtils.wait_brief(page)
+        warehouse = getattr(self.settings.app, "change_warehouse", None)
+        if warehouse:
+            try:
+                nav.change_warehouse(warehouse, onDemand=False)
+            except Exception as exc:
+                app_log(f"⚠️ Detour worker could not change warehouse: {exc}")
+
+    def _process(self, page, nav: NavigationManager, screenshot_mgr: ScreenshotManager):
+        from operations.inbound.ilpn_filter_helper import fill_ilpn_filter
+
+        def fill_ilpn_cb(ilpn: str, page=None, **kwargs: Any) -> bool:
+            return bool(fill_ilpn_filter(page, ilpn, screenshot_mgr=screenshot_mgr, **kwargs))
+
+        window_cache = DetourWindowCache(page)
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                self._jobs.task_done()
+                return
+            open_ui_cfg, screen_context, label = job
+            try:
+                ok = run_open_ui_detours(
+                    open_ui_cfg,
+                    main_page=None,
+                    screenshot_mgr=screenshot_mgr,
+                    detour_page=page,
+                    detour_nav=nav,
+                    settings=self.settings,
+                    fill_ilpn_cb=fill_ilpn_cb,
+                    screen_context=screen_context,
+                    window_cache=window_cache,
+                )
+                self._record(DetourResult(label, bool(ok)))
+            except Exception as exc:
+                self._record(DetourResult(label, False, str(exc)))
+            finally:
+                self._jobs.task_done()
+
+    def _fail_pending(self, error: str):
+        """Mark queued jobs failed so drain() doesn't wait on a dead or stuck browser."""
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if job is not _STOP:
+                self._record(DetourResult(job[2], False, error))
+            self._jobs.task_done()
@@ -1,13 +1,14 @@
 """
 Generic automation orchestrator with retry logic and result summaries.
 """
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Callable, Optional, Any
 
 from config.settings import Settings
 from core.connection_guard import ConnectionResetDetected
 from core.logger import app_log
-from utils.retry import retry, RetryExhausted
+from core.state_metrics import StateLatencyStats
+from utils.retry import BackoffPolicy, RetryBudget, RetryExhausted, classify_error, retry
 
 
 @dataclass
@@ -19,6 +20,18 @@ class OperationResult:
     retry_count: int = 0
 
 
+@dataclass
+class WorkflowResult:
+    """Outcome of one workflow (scenario) in a run."""
+    index: int
+    name: str
+    status: str  # passed | failed | skipped | error | not_run
+    completed_steps: int = 0
+    failed_step: Optional[str] = None
+    error: Optional[str] = None
+    duration_s: float = 0.0
+
+
 class AutomationOrchestrator:
     """Coordinates warehouse operations with retry logic and summary reporting."""
 
@@ -26,6 +39,17 @@ class AutomationOrchestrator:
         self.settings = settings
         self.max_retries = max_retries
         self.results: list[OperationResult] = []
+        self.state_latency = StateLatencyStats()
+        self.backoff = BackoffPolicy(
+            base_s=self._app_number("retry_backoff_base_s", BackoffPolicy.base_s),
+            cap_s=self._app_number("retry_backoff_cap_s", BackoffPolicy.cap_s),
+        )
+        self.retry_budget = RetryBudget(self._app_number("retry_budget", 20))
+
+    def _app_number(self, name: str, default: float):
+        """Numeric AppConfig value, or `default` when unset (or when settings is a stand-in)."""
+        value = getattr(self.settings.app, name, default)
+        return value if isinstance(value, (int, float)) and not isinstance(value, bool) else default
 
     def run_with_retry(
         self,
@@ -47,7 +71,11 @@ class AutomationOrchestrator:
             exclude=(ConnectionResetDetected,),
             log_prefix=operation_name,
             reraise=False,
-            on_retry=on_retry_callback
+            on_retry=on_retry_callback,
+            backoff=self.backoff,
+            classify=classify_error,
+            budget=self.retry_budget,
+            retry_unknown=getattr(self.settings.app, "retry_unknown_errors", False) is True,
         )(operation_func)
 
         try:
@@ -100,4 +128,21 @@ class AutomationOrchestrator:
                 if not result.success:
                     app_log(f"  • {result.operation}: {result.error or 'Unknown error'}")
 
+        self.state_latency.log_summary()
         app_log("=" * 60 + "\n")
+        self.export_metrics()
+
+    def export_metrics(self, path: str | None = None):
+        """Write operation results and per-state latency to JSON (METRICS_EXPORT_PATH by default)."""
+        target = path or getattr(self.settings.app, "metrics_export_path", "")
+        if not isinstance(target, str) or not target:
+            return None
+        try:
+            written = self.state_latency.export_json(
+                target, {"operations": [asdict(result) for result in self.results]}
+            )
+        except Exception as exc:
+            app_log(f"⚠️ Could not export metrics to {target}: {exc}")
+            return None
+        app_log(f"📈 Metrics exported: {written}")
+        return written
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import threading
 import xml.etree.ElementTree as ET
 from typing import Any, Iterable, Mapping, Optional, Sequence
 
 from DB import DB
 from core.logger import app_log
 
+_asn_stamp_lock = threading.Lock()
+_last_asn_stamp: datetime | None = None
+
 
 def build_post_message_payload(
     post_cfg: dict,
@@ -186,6 +190,21 @@ def _current_timestamp() -> datetime:
         return datetime.now()
 
 
+def _next_asn_timestamp() -> datetime:
+    """Current timestamp, bumped past the last one handed out.
+
+    ASN, BOL and PO ids are derived at second resolution, and prefetched payloads can be
+    built within the same second.
+    """
+    global _last_asn_stamp
+    with _asn_stamp_lock:
+        stamp = _current_timestamp().replace(microsecond=0)
+        if _last_asn_stamp is not None and stamp.timestamp() <= _last_asn_stamp.timestamp():
+            stamp = _last_asn_stamp + timedelta(seconds=1)
+        _last_asn_stamp = stamp
+        return stamp
+
+
 def customize_asn_payload(payload: str, items: Sequence[Mapping[str, Any]] | None = None) -> tuple[str, dict[str, Any]]:
     try:
         root = ET.fromstring(payload)
@@ -199,7 +218,7 @@ def customize_asn_payload(payload: str, items: Sequence[Mapping[str, Any]] | Non
         return payload, {}
 
     template_detail = asn_elem.find("ASNDetail")
-    timestamp = _current_timestamp()
+    timestamp = _next_asn_timestamp()
     asn_id = timestamp.strftime("%y%m%d%H%M%S")
     seq_prefix = timestamp.strftime("%y%m%d%H%M%S")
     original_asn_id = asn_elem.findtext("ASNID")
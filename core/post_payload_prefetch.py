@@ -0,0 +1,153 @@
+"""
+Post Payload Prefetcher - resolve upcoming workflows' post payloads in the background.
+
+Building a DB-sourced post payload (object lookup, TRAN_LOG XML fetch, ASN customization)
+is pure DB work, while the rest of a workflow is pure UI work. The prefetcher pulls
+workflows ahead of the runner on a background thread, builds each one's post payload and
+hands both over through a bounded queue, so up to `depth` workflows are resolved while
+the current one receives or runs detours.
+
+The executor takes the prefetched payload for the workflow it is running; anything that
+no longer matches (edited step config, different warehouse, failed build) falls back to
+the synchronous build.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from core.logger import app_log
+from core.post_message_payload import build_post_message_payload
+
+T = TypeVar("T")
+_DONE = object()
+
+
+@dataclass
+class _SourceError:
+    """An exception raised by the job source, re-raised on the runner's thread."""
+    exc: BaseException
+
+
+@dataclass
+class PrefetchedPayload:
+    """A post payload built ahead of time for one workflow."""
+    workflow_idx: int
+    step_data: dict[str, Any]
+    facility: str | None
+    payload: str | None
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+class PostPayloadPrefetcher:
+    """Bounded producer/consumer pipeline of workflows and their resolved post payloads."""
+
+    POLL_S = 0.2
+
+    def __init__(
+        self,
+        settings: Any,
+        depth: int = 2,
+        builder: Callable[..., tuple[str | None, dict[str, Any]]] = build_post_message_payload,
+    ):
+        self.settings = settings
+        self.depth = max(1, int(depth))
+        self._builder = builder
+        self._post_stage = settings.app.step_names.postMessage.lower()
+        self._current: PrefetchedPayload | None = None
+        self._lock = threading.Lock()
+        self.abandoned = 0  # workflows pulled from the source but never handed to the runner
+
+    def pipeline(self, jobs: Iterable[T], describe: Callable[[T], tuple[int, dict[str, Any]]]) -> Iterator[T]:
+        """Yield `jobs` unchanged while payloads for the next `depth` are built in the background.
+
+        `describe(job)` returns the job's (workflow index, steps). An exception raised while
+        pulling from `jobs` is re-raised here, after the jobs that came before it.
+        """
+        handoff: queue.Queue = queue.Queue(maxsize=self.depth)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce, args=(jobs, describe, handoff, stop), name="post-prefetch", daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                item = handoff.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _SourceError):
+                    raise item.exc
+                job, prefetched = item
+                self._current = prefetched
+                yield job
+        finally:
+            self._current = None
+            stop.set()
+            while producer.is_alive() or not handoff.empty():
+                try:
+                    item = handoff.get(timeout=self.POLL_S)
+                except queue.Empty:
+                    continue
+                if item is not _DONE and not isinstance(item, _SourceError):
+                    self._abandon()
+            producer.join()
+
+    def take(self, workflow_idx: int, step_data: dict[str, Any], facility: str | None) -> PrefetchedPayload | None:
+        """The prefetched payload for this workflow's post step, if it is still valid (single use)."""
+        prefetched, self._current = self._current, None
+        if prefetched is None or prefetched.payload is None:
+            return None
+        if prefetched.workflow_idx != workflow_idx or prefetched.facility != facility:
+            return None
+        if prefetched.step_data != step_data:
+            return None
+        return prefetched
+
+    def _produce(self, jobs, describe, handoff: queue.Queue, stop: threading.Event):
+        end: Any = _DONE
+        try:
+            source = iter(jobs)
+            while not stop.is_set():  # checked before pulling so a stopped runner leaves the source alone
+                job = next(source, _DONE)
+                if job is _DONE:
+                    break
+                prefetched = None
+                try:
+                    prefetched = self._resolve(*describe(job))
+                except Exception as exc:
+                    app_log(f"⚠️ Post payload prefetch failed: {exc}")
+                if not self._put(handoff, (job, prefetched), stop):
+                    self._abandon()
+                    return
+        except Exception as exc:  # a bad record or broken source: the runner must see it
+            end = _SourceError(exc)
+        finally:
+            self._put(handoff, end, stop)
+
+    def _abandon(self):
+        with self._lock:
+            self.abandoned += 1
+
+    def _put(self, handoff: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=self.POLL_S)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _resolve(self, workflow_idx: int, steps: dict[str, Any]) -> PrefetchedPayload | None:
+        step_data = next(
+            (data for name, data in steps.items() if name.lower() == self._post_stage),
+            None,
+        )
+        if not isinstance(step_data, dict) or not step_data.get("enabled") or not step_data.get("type"):
+            return None
+        if (step_data.get("source") or "db").lower() != "db":
+            return None
+        facility = self.settings.app.change_warehouse
+        payload, metadata = self._builder(step_data, step_data["type"], facility, step_data.get("db_env"))
+        return PrefetchedPayload(workflow_idx, step_data, facility, payload, metadata)
@@ -9,8 +9,19 @@ from utils.wait_utils import WaitUtils
 
 
 class ScreenshotManager:
-    def __init__(self, output_dir: str = "screenshots", image_format: str = "png", image_quality: int | None = None):
+    CAPTURE_LEVELS = ("all", "errors", "none")
+    ERROR_LABEL_MARKERS = ("fail", "error", "reset", "invalid", "mismatch")
+
+    def __init__(
+        self,
+        output_dir: str = "screenshots",
+        image_format: str = "png",
+        image_quality: int | None = None,
+        capture_level: str = "all",
+    ):
         self.output_dir = Path(output_dir)
+        # "errors" keeps only failure captures, "none" skips screenshots entirely (batch runs).
+        self.capture_level = capture_level if capture_level in self.CAPTURE_LEVELS else "all"
 
         # Clean up previous run's screenshots
         if self.output_dir.exists():
@@ -51,6 +62,8 @@ class ScreenshotManager:
             app_log("⚠️ Screenshot capture skipped due to onDemand=False.")
             return None
         """Capture full page screenshot"""
+        if not self._level_allows(label):
+            return None
         next_seq = self.sequence + 1
         filename = self._build_filename(label, next_seq)
         overlay_added = False
@@ -112,6 +125,8 @@ class ScreenshotManager:
 
     def capture_rf_window(self, page: Page, label: str, overlay_text: str | None = None) -> Path | None:
         """Capture RF Menu window screenshot"""
+        if not self._level_allows(label):
+            return None
         next_seq = self.sequence + 1
         filename = self._build_filename(label, next_seq)
         overlay_added = False
@@ -170,6 +185,14 @@ class ScreenshotManager:
         app_log(f"📸 RF Screenshot saved: {filename}")
         return filename
 
+    def _level_allows(self, label: str) -> bool:
+        if self.capture_level == "all":
+            return True
+        if self.capture_level == "none":
+            return False
+        lowered = (label or "").lower()
+        return any(marker in lowered for marker in self.ERROR_LABEL_MARKERS)
+
     def _build_filename(self, label: str, sequence: int | None = None) -> Path:
         suffix = ".jpg" if self.image_format == "jpeg" else ".png"
         seq = self.sequence if sequence is None else sequence
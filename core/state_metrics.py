@@ -0,0 +1,223 @@
+"""
+State Metrics - Per-state latency and Playwright call accounting.
+
+Responsibilities:
+- Count Playwright sync API calls and screenshots on threads that time states
+- Record how long each state machine state took and what it cost
+- Aggregate timings across a run into p50/p95/max and a bucketed histogram per state
+  and export them as JSON
+"""
+import inspect
+import json
+import math
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.logger import app_log
+
+
+class PlaywrightCallCounter:
+    """Thread-local counts of Playwright sync calls, fed by a hook on the sync dispatcher.
+
+    The hook is shared by every install() and removed by the matching last uninstall(); it only
+    counts on threads that called track_thread() (done by StateTimer), so other threads pass through.
+    SyncBase._sync is private: when a Playwright release no longer has it with the expected
+    (self, coro) shape, install() leaves it alone and states simply report zero calls.
+    """
+
+    _local = threading.local()
+    _lock = threading.Lock()
+    _users = 0
+    _original = None
+    _hook = None
+
+    @classmethod
+    def install(cls) -> bool:
+        """Hook SyncBase._sync (once for all users); False when it is missing or has changed shape."""
+        with cls._lock:
+            if cls._users:
+                cls._users += 1
+                return True
+            try:
+                from playwright._impl._sync_base import SyncBase
+            except Exception:
+                return False
+
+            original = getattr(SyncBase, "_sync", None)
+            if not cls._hookable(original):
+                app_log("⚠️ Playwright call counting unavailable for this Playwright version")
+                return False
+
+            def counted_sync(self, coro):
+                if getattr(cls._local, "tracked", False):
+                    try:
+                        cls.bump(getattr(coro, "__qualname__", "") or "")
+                    except Exception:
+                        pass
+                return original(self, coro)
+
+            SyncBase._sync = counted_sync
+            cls._original, cls._hook, cls._users = original, counted_sync, 1
+            return True
+
+    @staticmethod
+    def _hookable(func) -> bool:
+        if not callable(func):
+            return False
+        try:
+            params = list(inspect.signature(func).parameters.values())
+        except (TypeError, ValueError):
+            return False
+        return len(params) == 2 and all(p.kind == p.POSITIONAL_OR_KEYWORD for p in params)
+
+    @classmethod
+    def uninstall(cls):
+        """Release one install(); the last release restores the original dispatcher."""
+        with cls._lock:
+            if not cls._users:
+                return
+            cls._users -= 1
+            if cls._users:
+                return
+            from playwright._impl._sync_base import SyncBase
+
+            if SyncBase._sync is cls._hook:  # leave a hook someone else stacked on top alone
+                SyncBase._sync = cls._original
+            cls._original = cls._hook = None
+
+    @classmethod
+    def track_thread(cls):
+        """Count Playwright calls made from the current thread from now on."""
+        cls._local.tracked = True
+
+    @classmethod
+    def bump(cls, call_name: str = ""):
+        local = cls._local
+        local.calls = getattr(local, "calls", 0) + 1
+        if call_name.endswith(".screenshot"):
+            local.screenshots = getattr(local, "screenshots", 0) + 1
+
+    @classmethod
+    def read(cls) -> tuple[int, int]:
+        """Current (calls, screenshots) totals for this thread."""
+        return getattr(cls._local, "calls", 0), getattr(cls._local, "screenshots", 0)
+
+
+@dataclass
+class StateTiming:
+    state: str
+    started: float
+    ended: float
+    playwright_calls: int = 0
+    screenshots: int = 0
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.ended - self.started) * 1000
+
+
+class StateTimer:
+    """Measures one state visit: monotonic time plus Playwright calls made in between."""
+
+    def __init__(self, state: str):
+        self.state = state
+        self.started = time.monotonic()
+        PlaywrightCallCounter.track_thread()
+        self._calls, self._screenshots = PlaywrightCallCounter.read()
+
+    def stop(self) -> StateTiming:
+        calls, screenshots = PlaywrightCallCounter.read()
+        return StateTiming(
+            state=self.state,
+            started=self.started,
+            ended=time.monotonic(),
+            playwright_calls=calls - self._calls,
+            screenshots=screenshots - self._screenshots,
+        )
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+# Upper bounds (ms) of the per-state latency histogram buckets; slower visits land in ">10000".
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def histogram(values: list[float], bounds: tuple = LATENCY_BUCKETS_MS) -> dict[str, int]:
+    """Non-cumulative bucket counts keyed "<=bound", plus ">last" for the overflow."""
+    buckets = {f"<={bound}": 0 for bound in bounds}
+    overflow = 0
+    for value in values:
+        for bound in bounds:
+            if value <= bound:
+                buckets[f"<={bound}"] += 1
+                break
+        else:
+            overflow += 1
+    buckets[f">{bounds[-1]}"] = overflow
+    return buckets
+
+
+class StateLatencyStats:
+    """Collects state timings across a run and summarizes them per state."""
+
+    def __init__(self):
+        self._timings: dict[str, list[StateTiming]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, timings: list[StateTiming]):
+        with self._lock:
+            for timing in timings:
+                self._timings.setdefault(timing.state, []).append(timing)
+
+    def __bool__(self) -> bool:
+        return bool(self._timings)
+
+    def summary(self) -> dict[str, dict]:
+        """Per-state visits, p50/p95/max latency (ms), latency histogram and Playwright call/screenshot totals."""
+        with self._lock:
+            snapshot = {state: list(timings) for state, timings in self._timings.items()}
+
+        result = {}
+        for state, timings in snapshot.items():
+            durations = [t.duration_ms for t in timings]
+            result[state] = {
+                "count": len(timings),
+                "p50_ms": round(percentile(durations, 50), 1),
+                "p95_ms": round(percentile(durations, 95), 1),
+                "max_ms": round(max(durations), 1),
+                "total_ms": round(sum(durations), 1),
+                "histogram_ms": histogram(durations),
+                "playwright_calls": sum(t.playwright_calls for t in timings),
+                "screenshots": sum(t.screenshots for t in timings),
+            }
+        return result
+
+    def log_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        app_log("\n⏱️ State latency (ms):")
+        app_log(f"  {'state':<28}{'n':>5}{'p50':>9}{'p95':>9}{'max':>9}{'pw':>7}{'shots':>7}")
+        ranked = sorted(summary.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        for state, row in ranked:
+            app_log(
+                f"  {state:<28}{row['count']:>5}{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}"
+                f"{row['max_ms']:>9.0f}{row['playwright_calls']:>7}{row['screenshots']:>7}"
+            )
+
+    def export_json(self, path: str | Path, extra: dict | None = None) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = dict(extra or {})
+        payload["state_latency"] = self.summary()
+        target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return target
@@ -3,23 +3,53 @@ Warehouse Automation - Main Entry Point
 
 This script runs configured workflows for warehouse operations.
 """
-from typing import Any, cast
+import argparse
+import time
+from contextlib import ExitStack, closing
+from itertools import groupby
+from typing import Any, Iterable, Iterator, cast
 
 from config.operations_config import OperationConfig
 from config.settings import Settings
+from core.checkpoint import CheckpointStore
 from core.connection_guard import ConnectionResetDetected
 from core.logger import app_log
+from core.orchestrator import WorkflowResult
+from core.post_payload_prefetch import PostPayloadPrefetcher
 from operations import create_operation_services
-from config.workflow_config import Workflow, create_default_workflows, flatten_workflows
-
-
-def main():
+from operations.recovery import SessionRecovery
+from operations.stage_scheduler import StageScheduler
+from config.workflow_config import (
+    Workflow,
+    create_default_workflows,
+    flatten_workflows,
+    iter_flattened_workflows,
+)
+from config.workflow_files import iter_workflow_file
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run configured warehouse automation workflows.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip steps completed by the previous run and reuse their metadata.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
     """Run warehouse automation workflows."""
+    args = parse_args(argv)
     settings = Settings.from_env()
 
-    with create_operation_services(settings) as wmOps:
+    with CheckpointStore.for_settings(settings) as checkpoints, \
+            create_operation_services(settings) as wmOps:
+        if not args.resume:
+            checkpoints.reset()
         try:
-            run_automation(settings, wmOps)
+            run_automation(settings, wmOps, checkpoints)
+            input("Press Enter to exit...")
         except ConnectionResetDetected as e:
             app_log(f"❌ Connection lost: {e}")
         except KeyboardInterrupt:
@@ -32,49 +62,161 @@ def main():
             wmOps.orchestrator.print_summary()
 
 
-def run_automation(settings: Settings, wmOps):
-    """Execute all configured workflows."""
+def run_automation(
+    settings: Settings,
+    wmOps,
+    checkpoints: CheckpointStore | None = None,
+    workflows: Iterable[tuple] | None = None,
+) -> list[WorkflowResult]:
+    """Execute all configured workflows, skipping steps already recorded in `checkpoints`.
+
+    Workflows are (name, steps) or (name, steps, warehouse) tuples; the session switches
+    warehouse whenever a workflow names one other than the current selection.
+    """
 
     # Step 1: Login and setup
-    wmOps.step_execution.run_login()           # Opens browser, fills credentials
-    wmOps.step_execution.run_change_warehouse() # Selects the right warehouse
+    start_session(wmOps)  # Opens browser, fills credentials, selects the right warehouse
 
     # Step 2: Load workflow configurations
-    workflows = load_workflows()  # Returns list of (name, steps) tuples
+    if workflows is None:
+        workflows = load_workflows(settings)  # (name, steps, warehouse) tuples, streamed from WORKFLOW_FILE if set
+
+    # Step 3: Run each warehouse's consecutive workflows (post payloads of the next ones are prefetched meanwhile)
+    use_scheduler = getattr(settings.app, "stage_scheduler", False) is True
+    scheduler = StageScheduler.for_services(settings, wmOps, checkpoints) if use_scheduler else None
+    results: list[WorkflowResult] = []
+    for warehouse, group in groupby(_numbered_jobs(workflows), key=lambda job: job[3]):
+        switch_warehouse(wmOps, settings, warehouse)
+        jobs = ((index, scenario_name, steps) for index, scenario_name, steps, _ in group)
+        if scheduler is not None:
+            results.extend(scheduler.run(jobs))
+        else:
+            results.extend(_run_sequential(wmOps, jobs, checkpoints))
+
+    if scheduler is None:
+        wmOps.screenshot_mgr.set_scenario(None)
+    app_log("✅ Automation completed!")
+    return results
+
+
+def _numbered_jobs(workflows: Iterable[tuple]) -> Iterator[tuple[int, str, dict[str, Any], str]]:
+    """(index, name, steps, warehouse) per workflow; two-field entries run in the current warehouse."""
+    for index, (scenario_name, steps, *rest) in enumerate(workflows, 1):
+        yield index, scenario_name, steps, (rest[0] if rest else "")
+
+
+def run_session_action(wmOps, action, description: str):
+    """Run a login/warehouse action, recovering the session on a connection reset when possible."""
+    recovery = getattr(wmOps, "recovery", None)
+    if isinstance(recovery, SessionRecovery):
+        return recovery.run_action(action, description)
+    return action()
 
-    # Step 3: Run each workflow
-    for index, (scenario_name, steps) in enumerate(workflows, 1):
-        wmOps.screenshot_mgr.set_scenario(scenario_name)  # Organize screenshots
 
-        metadata: dict[str, Any] = {}
-        for step_name, step_data_input in steps.items():
-            wmOps.screenshot_mgr.set_stage(step_name)
+def start_session(wmOps):
+    """Log in and select the configured warehouse."""
+    run_session_action(wmOps, wmOps.step_execution.run_login, "Login")
+    run_session_action(wmOps, wmOps.step_execution.run_change_warehouse, "Warehouse selection")
+
+
+def switch_warehouse(wmOps, settings: Settings, warehouse: str):
+    """Move the session to a workflow's warehouse (no-op when unset or already there).
+
+    The detour worker reads the warehouse once when its browser opens, so it is closed
+    here and restarted in the new warehouse by the next background detour.
+    """
+    if not warehouse or warehouse == settings.app.change_warehouse:
+        return
+    app_log(f"🏢 Switching to warehouse {warehouse}")
+    wmOps.step_execution.close_detours()
+    settings.app.change_warehouse = warehouse
+    run_session_action(wmOps, wmOps.step_execution.run_change_warehouse, f"Switch to {warehouse}")
+
+
+def _run_sequential(
+    wmOps,
+    jobs: Iterable[tuple[int, str, dict[str, Any]]],
+    checkpoints: CheckpointStore | None = None,
+) -> list[WorkflowResult]:
+    prefetcher = getattr(wmOps, "prefetcher", None)
+    with ExitStack() as stack:
+        if isinstance(prefetcher, PostPayloadPrefetcher):
+            jobs = stack.enter_context(closing(prefetcher.pipeline(jobs, lambda job: (job[0], job[2]))))
+        return [
+            run_workflow(wmOps, index, scenario_name, steps, checkpoints)
+            for index, scenario_name, steps in jobs
+        ]
+
+
+def run_workflow(
+    wmOps,
+    index: int,
+    scenario_name: str,
+    steps: dict[str, Any],
+    checkpoints: CheckpointStore | None = None,
+) -> WorkflowResult:
+    """Run one workflow's steps in order; steps are replayed after a recovered connection reset."""
+    started = time.monotonic()
+    wmOps.screenshot_mgr.set_scenario(scenario_name)  # Organize screenshots
+    recovery = getattr(wmOps, "recovery", None)
+
+    metadata: dict[str, Any] = {}
+    completed = 0
+    if checkpoints is not None:
+        completed, metadata = checkpoints.resume_point(index, scenario_name, steps)
+        if steps and completed == len(steps):
+            return WorkflowResult(index, scenario_name, "skipped", completed_steps=completed)
+
+    result = WorkflowResult(index, scenario_name, "passed", completed_steps=completed)
+    for step_index, (step_name, step_data_input) in enumerate(steps.items(), 1):
+        if step_index <= completed:
+            continue
+        wmOps.screenshot_mgr.set_stage(step_name)
+        if isinstance(recovery, SessionRecovery):
+            metadata, should_continue = recovery.run_step(
+                wmOps.executor, step_name, step_data_input, metadata, index
+            )
+        else:
             metadata, should_continue = wmOps.executor.run_step(
                 step_name, step_data_input, metadata, index
             )
-            if not should_continue:
-                break  # Stop this workflow if step failed
+        if not should_continue:
+            result.status, result.failed_step = "failed", step_name
+            break  # Stop this workflow if step failed
+        result.completed_steps = step_index
+        if checkpoints is not None:
+            checkpoints.record_step(
+                index, scenario_name, step_index, step_name, step_data_input, metadata
+            )
 
-    wmOps.screenshot_mgr.set_scenario(None)
-    app_log("✅ Automation completed!")
-    input("Press Enter to exit...")
+    if not wmOps.step_execution.join_detours():  # Wait for background detours queued by this workflow
+        if result.status == "passed":
+            result.status, result.error = "failed", "background detours failed"
+    result.duration_s = round(time.monotonic() - started, 3)
+    return result
 
 
-def load_workflows() -> list[tuple[str, dict[str, Any]]]:
+def load_workflows(settings: Settings | None = None) -> Iterable[tuple[str, dict[str, Any], str]]:
     """
     Load workflows from configuration.
     
     Supports both:
+    - A workflow file (WORKFLOW_FILE: .yaml, .json or .jsonl), streamed lazily
     - New WorkflowBuilder system (if available)
     - Legacy nested dict format (fallback)
     """
+    workflow_file = getattr(settings.app, "workflow_file", "") if settings else ""
+    if isinstance(workflow_file, str) and workflow_file:
+        app_log(f"📋 Streaming workflows from {workflow_file}")
+        return iter_flattened_workflows(iter_workflow_file(workflow_file))
+
     # Try new system first
     if callable(create_default_workflows) and callable(flatten_workflows):
         try:
             workflows = cast(list[Any], create_default_workflows())
             if workflows:
                 app_log(f"📋 Loaded {len(workflows)} workflows (new format)")
-                return cast(list[tuple[str, dict[str, Any]]], flatten_workflows(workflows))
+                return cast(list[tuple[str, dict[str, Any], str]], flatten_workflows(workflows))
         except Exception as e:
             app_log(f"⚠️ Failed to load new workflows: {e}")
     app_log("⚠️ No workflows defined; nothing to run.")
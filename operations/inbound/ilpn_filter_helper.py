@@ -5,9 +5,13 @@ Shared helper to drive the iLPN quick filter from both receive flow and debug CL
 from __future__ import annotations
 
 import hashlib
+import itertools
 import re
+import threading
 import time
-from dataclasses import dataclass
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from io import BytesIO
 from typing import TYPE_CHECKING
@@ -21,9 +25,15 @@ from .ilpn_js_scripts import (
     DOM_OPEN_ILPN_ROW_SCRIPT,
     EXT_OPEN_FIRST_ROW_SCRIPT,
     EXT_STORE_COUNT_SCRIPT,
+    EXT_STORE_RECORDS_SCRIPT,
     HIDDEN_INPUT_FILL_SCRIPT,
+    ILPN_FRAME_PROBE_SCRIPT,
+    STORE_LOAD_MARK_SCRIPT,
+    STORE_RELOADED_SCRIPT,
     TAB_CLICK_SCRIPT,
     TAB_DIAGNOSTIC_SCRIPT,
+    VIEW_QUIET_RELEASE_SCRIPT,
+    VIEW_QUIET_SCRIPT,
 )
 
 if TYPE_CHECKING:
@@ -38,32 +48,43 @@ class TabClickConfig:
     operation_note: str | None = None
     click_timeout_ms: int = 3000
     capture_after_tabs: bool = True
+    max_tab_width: int = 1600
+    max_tab_height: int = 6000
 
 
 class FrameFinder:
     """Locates the appropriate frame for iLPN operations."""
-    
+
+    # Frames found by the probe: page -> {Ext window id: frame}; entries go with their page.
+    _frame_cache: weakref.WeakKeyDictionary[Any, dict[str, Any]] = weakref.WeakKeyDictionary()
+    _cache_lock = threading.Lock()
+    # Upper bound on one event wait; content can render into an already-attached frame.
+    EVENT_WAIT_SLICE_MS = 250
+
+    @staticmethod
+    def clear_cache(page=None):
+        with FrameFinder._cache_lock:
+            if page is None:
+                FrameFinder._frame_cache.clear()
+            else:
+                FrameFinder._frame_cache.pop(page, None)
+
+    @staticmethod
+    def _page_frames(page) -> dict[str, Any]:
+        with FrameFinder._cache_lock:
+            try:
+                return FrameFinder._frame_cache.setdefault(page, {})
+            except TypeError:  # not weakly referenceable/hashable: nothing to cache against
+                return {}
+
     @staticmethod
     def find_ilpn_frame(page) -> Any | None:
         """Locate the frame that hosts the iLPNs grid."""
         app_log("🔍 Scanning frames for iLPN content...")
 
-        # First pass: inspect frames for iLPN markers in the DOM
-        for idx, frame in enumerate(page.frames):
-            try:
-                probe = frame.evaluate(
-                    """() => {
-                        const hasIlpnText = (document.body?.innerText || '').toLowerCase().includes('ilpn');
-                        const hasFilterInput = !!document.querySelector("input[name*='ilpn' i], input[id*='ilpn' i], input[name*='filter' i], input[id*='filter' i]");
-                        const hasGrid = !!document.querySelector("div.x-grid-view, table.x-grid-table");
-                        return { hasIlpnText, hasFilterInput, hasGrid, url: location.href };
-                    }"""
-                )
-                if probe and (probe.get("hasFilterInput") or (probe.get("hasIlpnText") and probe.get("hasGrid"))):
-                    app_log(f"✅ Using frame {idx} detected via DOM probe: {probe.get('url','')}")
-                    return frame
-            except Exception:
-                continue
+        frame = FrameFinder._probe_frame(page)
+        if frame is not None:
+            return frame
 
         def score(frame) -> tuple[int, int]:
             try:
@@ -97,17 +118,75 @@ class FrameFinder:
         app_log("⚠️ Falling back to main page (no matching frame found)")
         return None
 
+    @staticmethod
+    def _probe_frame(page) -> Any | None:
+        """Run the top-document probe once and map its hit to a Playwright frame."""
+        cached = FrameFinder._page_frames(page)
+        cached_ids = [window_id for window_id, frame in list(cached.items()) if FrameFinder._is_live(frame)]
+        try:
+            probe = page.evaluate(ILPN_FRAME_PROBE_SCRIPT, cached_ids)
+        except Exception:
+            return None
+        if not isinstance(probe, dict):
+            return None
+
+        window_id = probe.get("windowId") or ""
+        if probe.get("cached"):
+            frame = cached.get(window_id)
+            if frame is not None and FrameFinder._is_live(frame):
+                app_log(f"✅ Reusing cached iLPN frame for window {window_id}")
+                return frame
+            return None
+
+        frame = FrameFinder._match_frame(page, probe)
+        if frame is None:
+            return None
+        if window_id:
+            cached[window_id] = frame
+        app_log(f"✅ Using frame detected via DOM probe: {probe.get('url', '')}")
+        return frame
+
+    @staticmethod
+    def _match_frame(page, probe: dict) -> Any | None:
+        if probe.get("top"):
+            return getattr(page, "main_frame", None)
+        name = probe.get("name") or ""
+        url = probe.get("url") or ""
+        by_url = None
+        for frame in page.frames:
+            try:
+                if name and frame.name == name:
+                    return frame
+                if by_url is None and url and frame.url == url:
+                    by_url = frame
+            except Exception:
+                continue
+        return by_url
+
+    @staticmethod
+    def _is_live(frame) -> bool:
+        try:
+            return not frame.is_detached()
+        except Exception:
+            return False
+
     @staticmethod
     def wait_for_ilpn_frame(page, timeout_ms: int = 10000) -> Any | None:
-        """Poll for the iLPN frame to appear (helps on first open when load is slow)."""
-        deadline = time.time() + timeout_ms / 1000
+        """Wait for the iLPN frame to appear: a full scan whenever a frame attaches, a probe every slice."""
+        deadline = time.monotonic() + timeout_ms / 1000
         last_count = None
+        attached = True
 
-        while time.time() < deadline:
-            frame = FrameFinder.find_ilpn_frame(page)
+        while True:
+            # Quiet slices only re-run the DOM probe: content may render into an attached frame.
+            frame = FrameFinder.find_ilpn_frame(page) if attached else FrameFinder._probe_frame(page)
             if frame:
                 return frame
 
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                break
+
             try:
                 count = len(page.frames)
                 if count != last_count:
@@ -116,15 +195,37 @@ class FrameFinder:
             except Exception:
                 pass
 
-            WaitUtils.wait_brief(page, timeout_ms=500)
+            attached = FrameFinder._wait_for_frame_attached(page, min(remaining_ms, FrameFinder.EVENT_WAIT_SLICE_MS))
 
         rf_log("⚠️ Timed out waiting for iLPN frame; using main page")
         return None
 
+    @staticmethod
+    def _wait_for_frame_attached(page, timeout_ms: int) -> bool:
+        """Block until a frame attaches (and its DOM loads) or the slice elapses; True if one attached."""
+        wait_for_event = getattr(page, "wait_for_event", None)
+        if not callable(wait_for_event):
+            WaitUtils.wait_brief(page, timeout_ms=timeout_ms)
+            return True
+        started = time.monotonic()
+        try:
+            attached = wait_for_event("frameattached", timeout=timeout_ms)
+        except Exception:
+            return False
+        left_ms = timeout_ms - int((time.monotonic() - started) * 1000)
+        try:
+            attached.wait_for_load_state("domcontentloaded", timeout=max(left_ms, 1))
+        except Exception:
+            pass
+        return True
+
 
 class ViewStabilizer:
     """Utilities for waiting on view stability."""
-    
+
+    # Distinguishes concurrent waits sharing the same in-page observer.
+    _wait_tokens = itertools.count(1)
+
     @staticmethod
     def wait_for_ext_mask(target, timeout_ms: int = 4000) -> bool:
         """Wait for ExtJS loading mask to disappear."""
@@ -152,12 +253,40 @@ class ViewStabilizer:
         stable_samples: int = 3,
         interval_ms: int = 250,
         timeout_ms: int = 5000,
+        quiet_ms: int | None = None,
     ) -> bool:
-        """Poll the view hash until it stops changing."""
+        """Wait in-page until the DOM has gone quiet_ms without mutations.
+
+        quiet_ms defaults to stable_samples * interval_ms, the window the old sampler covered.
+        """
+        quiet = quiet_ms if quiet_ms is not None else stable_samples * interval_ms
+        wait_for_function = getattr(target, "wait_for_function", None)
+        if not callable(wait_for_function):
+            return ViewStabilizer._sample_stable_view(target, stable_samples, timeout_ms)
+        token = next(ViewStabilizer._wait_tokens)
+        try:
+            wait_for_function(
+                VIEW_QUIET_SCRIPT,
+                arg={"quietMs": quiet, "token": token},
+                polling=max(50, min(interval_ms, quiet)),
+                timeout=timeout_ms,
+            )
+            return True
+        except Exception:
+            rf_log("⚠️ View did not stabilize in time")
+            try:
+                target.evaluate(VIEW_QUIET_RELEASE_SCRIPT, token)
+            except Exception:
+                pass
+            return False
+
+    @staticmethod
+    def _sample_stable_view(target, stable_samples: int, timeout_ms: int) -> bool:
+        """Hash-sampling fallback for targets without wait_for_function."""
         last = None
         stable = 0
         deadline = time.time() + timeout_ms / 1000
-        
+
         while time.time() < deadline:
             h = ViewStabilizer.compute_view_hash(target)
             if h and h == last:
@@ -168,7 +297,7 @@ class ViewStabilizer:
                 stable = 1 if h else 0
                 last = h
             WaitUtils.wait_brief(target)
-        
+
         rf_log("⚠️ View did not stabilize in time")
         return False
 
@@ -345,7 +474,7 @@ class TabNavigator:
         frames_to_try = TabNavigator._collect_frames(target)
         use_page = getattr(target, "page", None) or target
         base_note = config.operation_note or "iLPN detail tab"
-        tab_images: list[bytes] = []
+        stitcher = TabImageStitcher(config.max_tab_width, config.max_tab_height)
 
         ViewStabilizer.maximize_page_for_capture(use_page)
 
@@ -364,8 +493,8 @@ class TabNavigator:
                 ViewStabilizer.wait_for_stable_view(target, stable_samples=3, timeout_ms=4000)
                 if config.screenshot_mgr:
                     try:
-                        img_bytes = use_page.screenshot(full_page=True, type="jpeg")
-                        tab_images.append(img_bytes)
+                        img_bytes = use_page.screenshot(full_page=True, type="jpeg", scale="css")
+                        stitcher.add(img_bytes)
                     except Exception as exc:
                         app_log(f"⚠️ Could not capture tab {tab_name}: {exc}")
             else:
@@ -375,7 +504,7 @@ class TabNavigator:
 
         if config.capture_after_tabs and config.screenshot_mgr:
             TabNavigator._capture_combined_tabs(
-                use_page, tab_images, config, base_note
+                use_page, stitcher, config, base_note
             )
 
         return True
@@ -451,109 +580,184 @@ class TabNavigator:
 
     @staticmethod
     def _capture_combined_tabs(
-        use_page, 
-        tab_images: list[bytes], 
+        use_page,
+        stitcher: TabImageStitcher,
         config: TabClickConfig,
         base_note: str
-    ):
-        """Capture combined screenshot of all tabs."""
+    ) -> Future | None:
+        """Queue the combined tab screenshot; stitching and saving run on a background worker."""
         safe_tag = config.screenshot_tag or "ilpn_tab"
         screenshot_mgr = config.screenshot_mgr
-        
+
         if not screenshot_mgr:
-            return
-            
-        try:
-            if not tab_images:
-                screenshot_mgr.capture(use_page, f"{safe_tag}_combined", f"{base_note}: all tabs")
-                return
-                
-            from PIL import Image, ImageDraw, ImageFont
+            return None
 
-            images = [Image.open(BytesIO(b)) for b in tab_images if b]
-            if not images:
+        try:
+            if not len(stitcher):
                 screenshot_mgr.capture(use_page, f"{safe_tag}_combined", f"{base_note}: all tabs")
-                return
+                return None
 
-            combined = TabNavigator._stitch_images(images)
-            combined = TabNavigator._add_overlays(combined, screenshot_mgr, base_note)
-            
+            # Resolve everything tied to the manager's current state before handing off.
             screenshot_mgr.sequence += 1
             filename = screenshot_mgr._build_filename(f"{safe_tag}_combined")
             fmt = "JPEG" if screenshot_mgr.image_format == "jpeg" else "PNG"
             save_kwargs = {"quality": screenshot_mgr.image_quality} if fmt == "JPEG" and screenshot_mgr.image_quality else {}
-            combined.save(filename, format=fmt, **save_kwargs)
-            app_log(f"📸 Combined tab screenshot saved: {filename}")
-            
+            overlay_parts = [
+                getattr(screenshot_mgr, "current_scenario_label", None),
+                getattr(screenshot_mgr, "current_stage_label", None),
+                base_note,
+            ]
+            overlay_text = " / ".join(str(part) for part in overlay_parts if part)
+            timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            return stitcher.save_async(filename, fmt, save_kwargs, overlay_text, timestamp_text)
+
         except Exception as exc:
             app_log(f"⚠️ Combined tab capture failed: {exc}")
+            return None
 
-    @staticmethod
-    def _stitch_images(images: list) -> "Image":
-        """Stitch multiple images vertically."""
+
+class TabImageStitcher:
+    """Stitches tab screenshots vertically with bounded memory.
+
+    Tiles stay JPEG-compressed until render: the canvas is allocated once from the
+    header sizes, then each tile is decoded (draft-scaled where possible), capped to
+    max_width x max_height, pasted and released before the next one.
+    """
+
+    PADDING = 10
+    _executor: ThreadPoolExecutor | None = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, max_width: int = 1600, max_height: int = 6000):
+        self.max_width = max_width
+        self.max_height = max_height
+        self._tiles: list[tuple[bytes, tuple[int, int]]] = []
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def add(self, data: bytes | None) -> bool:
+        """Record a tile; only the image header is parsed here."""
+        if not data:
+            return False
         from PIL import Image
-        
-        widths, heights = zip(*(img.size for img in images))
-        combined_height = sum(heights)
-        max_width = max(widths)
-        combined = Image.new("RGB", (max_width, combined_height), "white")
+
+        try:
+            with Image.open(BytesIO(data)) as img:
+                size = self._capped_size(img.size)
+        except Exception as exc:
+            app_log(f"⚠️ Skipping unreadable tab image: {exc}")
+            return False
+        self._tiles.append((data, size))
+        return True
+
+    def _capped_size(self, size: tuple[int, int]) -> tuple[int, int]:
+        width, height = size
+        scale = min(1.0, self.max_width / max(width, 1), self.max_height / max(height, 1))
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def render(self, overlay_text: str = "", timestamp_text: str = "") -> "Image":
+        """Paste tiles one at a time into a preallocated RGB canvas and draw overlays."""
+        from PIL import Image
+
+        tiles, self._tiles = self._tiles, []
+        width = max(size[0] for _, size in tiles)
+        height = sum(size[1] for _, size in tiles)
+        canvas = Image.new("RGB", (width, height), "white")
 
         y = 0
-        for img in images:
-            combined.paste(img, (0, y))
-            y += img.height
-            
-        return combined
+        while tiles:
+            data, size = tiles.pop(0)
+            with Image.open(BytesIO(data)) as img:
+                img.draft("RGB", size)
+                tile = img.convert("RGB")
+            if tile.size != size:
+                tile = tile.resize(size, Image.Resampling.BILINEAR)
+            canvas.paste(tile, (0, y))
+            y += size[1]
+            del tile
+
+        self._draw_overlays(canvas, overlay_text, timestamp_text)
+        return canvas
+
+    def save_async(self, filename, fmt: str, save_kwargs: dict, overlay_text: str, timestamp_text: str) -> Future:
+        """Render and save on the shared stitch worker; the future yields the filename or raises."""
+        future = self._get_executor().submit(
+            self._render_and_save, filename, fmt, save_kwargs, overlay_text, timestamp_text
+        )
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def _render_and_save(self, filename, fmt: str, save_kwargs: dict, overlay_text: str, timestamp_text: str):
+        self.render(overlay_text, timestamp_text).save(filename, format=fmt, **save_kwargs)
+        app_log(f"📸 Combined tab screenshot saved: {filename}")
+        return filename
 
     @staticmethod
-    def _add_overlays(combined: "Image", screenshot_mgr, base_note: str) -> "Image":
-        """Add text overlays to combined image."""
-        from PIL import Image, ImageDraw, ImageFont
-        
-        try:
-            overlay_parts = []
-            scenario = getattr(screenshot_mgr, "current_scenario_label", None)
-            stage = getattr(screenshot_mgr, "current_stage_label", None)
-            if scenario:
-                overlay_parts.append(str(scenario))
-            if stage:
-                overlay_parts.append(str(stage))
-            if base_note:
-                overlay_parts.append(str(base_note))
-            overlay_text = " / ".join(part for part in overlay_parts if part)
-            timestamp_text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def _log_failure(future: Future):
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            app_log(f"⚠️ Combined tab capture failed: {exc}")
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tab-stitch")
+            return cls._executor
+
+    @classmethod
+    def close(cls):
+        """Finish queued saves and stop the stitch worker; a later save starts a new one."""
+        with cls._executor_lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @classmethod
+    def _draw_overlays(cls, canvas: "Image", overlay_text: str, timestamp_text: str):
+        """Draw the note and timestamp labels straight onto the RGB canvas."""
+        from PIL import ImageFont
 
+        try:
             font = ImageFont.load_default()
-            overlay = Image.new("RGBA", combined.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(overlay)
-            padding = 10
+            padding = cls.PADDING
 
             if overlay_text:
-                text_bbox = font.getbbox(overlay_text)
-                tw = text_bbox[2] - text_bbox[0]
-                th = text_bbox[3] - text_bbox[1]
-                top = padding
-                left = max(padding, (combined.width - tw) // 2 - padding)
-                box = (left, top, left + tw + padding * 2, top + th + padding * 2)
-                draw.rectangle(box, fill=(255, 255, 255, 180))
-                draw.text((left + padding, top + padding), overlay_text, fill="black", font=font)
-
-            ts_bbox = font.getbbox(timestamp_text)
-            tsw = ts_bbox[2] - ts_bbox[0]
-            tsh = ts_bbox[3] - ts_bbox[1]
-            box = (
-                combined.width - tsw - padding * 2,
-                combined.height - tsh - padding * 2,
-                combined.width - padding // 2,
-                combined.height - padding // 2,
-            )
-            draw.rectangle(box, fill=(255, 255, 255, 200))
-            draw.text((box[0] + padding // 2, box[1] + padding // 2), timestamp_text, fill="black", font=font)
-
-            return Image.alpha_composite(combined.convert("RGBA"), overlay).convert("RGB")
+                left_, top_, right_, bottom_ = font.getbbox(overlay_text)
+                tw, th = right_ - left_, bottom_ - top_
+                left = max(padding, (canvas.width - tw) // 2 - padding)
+                box = (left, padding, left + tw + padding * 2, padding + th + padding * 2)
+                cls._draw_label(canvas, box, (left + padding, padding + padding), overlay_text, font, 180)
+
+            if timestamp_text:
+                left_, top_, right_, bottom_ = font.getbbox(timestamp_text)
+                tsw, tsh = right_ - left_, bottom_ - top_
+                box = (
+                    canvas.width - tsw - padding * 2,
+                    canvas.height - tsh - padding * 2,
+                    canvas.width - padding // 2,
+                    canvas.height - padding // 2,
+                )
+                cls._draw_label(canvas, box, (box[0] + padding // 2, box[1] + padding // 2), timestamp_text, font, 200)
         except Exception as exc:
             app_log(f"⚠️ Failed to add overlay to combined image: {exc}")
-            return combined
+
+    @staticmethod
+    def _draw_label(canvas: "Image", box: tuple, text_xy: tuple, text: str, font, alpha: int):
+        """Blend a white box over just the label region, then draw the text."""
+        from PIL import Image, ImageDraw
+
+        box = (max(0, box[0]), max(0, box[1]), min(canvas.width, box[2]), min(canvas.height, box[3]))
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return
+        region = canvas.crop(box)
+        white = Image.new("RGB", region.size, "white")
+        canvas.paste(Image.blend(region, white, alpha / 255), box[:2])
+        ImageDraw.Draw(canvas).text(text_xy, text, fill="black", font=font)
 
 
 class FilteredRowOpener:
@@ -873,6 +1077,182 @@ class ILPNFilterFiller:
         return False
 
 
+@dataclass
+class ILPNExpectation:
+    """Expected iLPN values; None means the field is not checked.
+
+    `columns` pins a field (or "ilpn", the id column) to a store dataIndex (e.g. {"quantity": "shippedQty"}).
+    """
+    ilpn: str
+    status: str | None = None
+    quantity: float | None = None
+    location: str | None = None
+    columns: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ILPNExpectation":
+        """Build from config, rejecting unknown keys by name."""
+        known = {f.name for f in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown iLPN expectation key(s): {', '.join(unknown)} (expected {', '.join(sorted(known))})")
+        if not data.get("ilpn"):
+            raise ValueError("iLPN expectation is missing 'ilpn'")
+        return cls(**data)
+
+
+@dataclass
+class ILPNVerification:
+    """Outcome of checking one iLPN against the grid data."""
+    ilpn: str
+    found: bool
+    mismatches: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    record: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.found and not self.mismatches
+
+
+class ILPNStoreVerifier:
+    """Data-mode iLPN checks: read grid store records as JSON instead of opening rows and tabs."""
+
+    # Candidate dataIndexes per field, most specific first, compared on lowercase letters only.
+    # The first one present in a record is the only column compared for that field.
+    FIELD_KEYS = {
+        "status": ("lpnfacilitystatusdesc", "lpnfacilitystatusdescription", "lpnfacilitystatus", "lpnstatus", "status"),
+        "quantity": ("qtyonhand", "onhandqty", "lpnqty", "quantity", "qty"),
+        "location": ("currlocn", "currentlocation", "currentlocn", "locn", "location"),
+    }
+    # dataIndexes that hold the iLPN number itself; only these are matched when looking a record up.
+    ID_KEYS = ("tclpnid", "lpnid", "ilpnid", "ilpn", "lpnnbr", "lpnnumber", "lpn")
+    RELOAD_TIMEOUT_MS = 8000
+
+    @staticmethod
+    def read_records(target) -> list[dict]:
+        """Return the records of every visible grid (plus detail grids) from one evaluate."""
+        try:
+            grids = target.evaluate(EXT_STORE_RECORDS_SCRIPT) or []
+        except Exception as exc:
+            rf_log(f"⚠️ Could not read iLPN grid data: {exc}")
+            return []
+        if not isinstance(grids, list):
+            return []
+        return [rec for grid in grids for rec in (grid.get("records") or [])]
+
+    @staticmethod
+    def find_record(records: list[dict], ilpn: str, columns: dict[str, str] | None = None) -> dict | None:
+        """First record whose iLPN id column (pinned as columns["ilpn"], else any ID_KEYS match) equals `ilpn`."""
+        wanted = str(ilpn).strip().lower()
+        pinned = (columns or {}).get("ilpn")
+        for rec in records:
+            if pinned:
+                keys = [pinned] if pinned in rec else []
+            else:
+                keys = [key for key in rec if re.sub(r"[^a-z]", "", str(key).lower()) in ILPNStoreVerifier.ID_KEYS]
+            if any(str(rec[key]).strip().lower() == wanted for key in keys):
+                return rec
+        return None
+
+    @staticmethod
+    def resolve_column(record: dict, field_name: str, columns: dict[str, str] | None = None) -> str | None:
+        """The one record key compared for `field_name`: a pinned column or the first known dataIndex."""
+        if columns and columns.get(field_name):
+            return columns[field_name] if columns[field_name] in record else None
+        by_norm = {re.sub(r"[^a-z]", "", str(key).lower()): key for key in record}
+        for candidate in ILPNStoreVerifier.FIELD_KEYS[field_name]:
+            if candidate in by_norm:
+                return by_norm[candidate]
+        return None
+
+    @staticmethod
+    def compare(expected: ILPNExpectation, record: dict) -> dict[str, tuple[Any, Any]]:
+        mismatches: dict[str, tuple[Any, Any]] = {}
+        for name in ILPNStoreVerifier.FIELD_KEYS:
+            want = getattr(expected, name)
+            if want is None:
+                continue
+            column = ILPNStoreVerifier.resolve_column(record, name, expected.columns)
+            actual = record.get(column) if column else None
+            if column is None or not ILPNStoreVerifier._matches(want, actual):
+                mismatches[name] = (want, actual)
+        return mismatches
+
+    @staticmethod
+    def _store_marker(target) -> dict | None:
+        try:
+            marker = target.evaluate(STORE_LOAD_MARK_SCRIPT)
+        except Exception:
+            return None
+        return marker if isinstance(marker, dict) else None
+
+    @staticmethod
+    def _wait_for_reload(target, marker: dict | None):
+        """Wait until the grid reloads after filtering, so the re-read never sees the old store."""
+        if marker is not None:
+            try:
+                target.wait_for_function(STORE_RELOADED_SCRIPT, arg=marker, timeout=ILPNStoreVerifier.RELOAD_TIMEOUT_MS)
+            except Exception:
+                rf_log("⚠️ iLPN grid did not reload after filtering; re-reading anyway")
+        ViewStabilizer.wait_for_ext_mask(target, timeout_ms=ILPNStoreVerifier.RELOAD_TIMEOUT_MS)
+
+    @staticmethod
+    def _matches(want: Any, value: Any) -> bool:
+        if isinstance(want, (int, float)) and not isinstance(want, bool):
+            try:
+                return float(str(value).replace(",", "")) == float(want)
+            except ValueError:
+                return False
+        return str(value).strip().lower() == str(want).strip().lower()
+
+    @staticmethod
+    def verify(
+        page,
+        expectations: list[ILPNExpectation | dict],
+        screenshot_mgr: ScreenshotManager | None = None,
+        *,
+        filter_missing: bool = True,
+    ) -> list[ILPNVerification]:
+        """Verify iLPNs in bulk; screenshots are taken only for mismatches."""
+        checks = [e if isinstance(e, ILPNExpectation) else ILPNExpectation.from_dict(e) for e in expectations]
+        target = FrameFinder.wait_for_ilpn_frame(page, timeout_ms=10000) or page
+        ViewStabilizer.wait_for_ext_mask(target, timeout_ms=8000)
+        records = ILPNStoreVerifier.read_records(target)
+
+        results: list[ILPNVerification] = []
+        for check in checks:
+            record = ILPNStoreVerifier.find_record(records, check.ilpn, check.columns)
+            if record is None and filter_missing:
+                # Not in the loaded page of the grid; narrow it with the quick filter and re-read once.
+                marker = ILPNStoreVerifier._store_marker(target)
+                if ILPNFilterFiller._fill_input(target, check.ilpn) or ILPNFilterFiller._try_hidden_fill(target, check.ilpn):
+                    ILPNStoreVerifier._wait_for_reload(target, marker)
+                    records = ILPNStoreVerifier.read_records(target)
+                    record = ILPNStoreVerifier.find_record(records, check.ilpn, check.columns)
+
+            if record is None:
+                result = ILPNVerification(check.ilpn, found=False)
+            else:
+                result = ILPNVerification(
+                    check.ilpn, True, ILPNStoreVerifier.compare(check, record), record
+                )
+            results.append(result)
+
+            if result.ok:
+                app_log(f"✅ iLPN {check.ilpn} verified")
+                continue
+            detail = "not found" if not result.found else ", ".join(
+                f"{name}: expected {want}, got {got}" for name, (want, got) in result.mismatches.items()
+            )
+            rf_log(f"❌ iLPN {check.ilpn} mismatch: {detail}")
+            if screenshot_mgr:
+                screenshot_mgr.capture(page, f"ilpn_verify_{check.ilpn}", f"iLPN {check.ilpn}: {detail}"[:120])
+
+        passed = sum(r.ok for r in results)
+        app_log(f"📋 iLPN verification: {passed}/{len(results)} matched")
+        return results
+
+
 # =============================================================================
 # PUBLIC API - Backward compatible functions
 # =============================================================================
@@ -884,11 +1264,16 @@ def fill_ilpn_filter(
     *,
     tab_click_timeout_ms: int | None = None,
     drill_detail: bool = False,
+    expect: dict | None = None,
 ) -> bool:
     """Populate the iLPN quick filter and open the matching row.
 
     This is the main public API - maintains backward compatibility.
+    With `expect` (status/quantity/location), runs the data-mode check instead.
     """
+    if expect is not None:
+        return verify_ilpns(page, [ILPNExpectation.from_dict({**expect, "ilpn": ilpn})], screenshot_mgr)[0].ok
+
     # ✅ NEW: Extended wait for iLPN frame on first access
     target_frame = FrameFinder.wait_for_ilpn_frame(page, timeout_ms=15000)  # Increased from 10s
     target = target_frame or page
@@ -975,6 +1360,20 @@ def fill_ilpn_filter(
         drill_detail=drill_detail,
     )
 
+
+def verify_ilpns(
+    page,
+    expectations: list[ILPNExpectation | dict],
+    screenshot_mgr: ScreenshotManager | None = None,
+    *,
+    filter_missing: bool = True,
+) -> list[ILPNVerification]:
+    """Check iLPN status/quantity/location from grid data without drilling into rows."""
+    return ILPNStoreVerifier.verify(
+        page, expectations, screenshot_mgr, filter_missing=filter_missing
+    )
+
+
 # Legacy function aliases for backward compatibility
 _find_ilpn_frame = FrameFinder.find_ilpn_frame
 _wait_for_ext_mask = ViewStabilizer.wait_for_ext_mask
@@ -282,4 +282,178 @@ TAB_CLICK_SCRIPT = """
 
     return { success: false, reason: 'not found' };
 }
-"""
\ No newline at end of file
+"""
+# Grid records as plain JSON for data-mode verification.
+# Reads every visible Ext grid store; falls back to header-keyed HTML tables
+# for JSF list pages that don't expose an Ext store.
+EXT_STORE_RECORDS_SCRIPT = """
+() => {
+    const plain = (v) => {
+        if (v === null || v === undefined) return null;
+        if (v instanceof Date) return v.toISOString();
+        return typeof v === 'object' ? null : v;
+    };
+    const out = [];
+    if (window.Ext?.ComponentQuery) {
+        for (const g of Ext.ComponentQuery.query('grid') || []) {
+            try {
+                if (g.isHidden?.() || g.isDestroyed) continue;
+                const store = g.getStore?.();
+                if (!store) continue;
+                const records = (store.getRange?.() || []).map((rec) => {
+                    const row = {};
+                    for (const [k, v] of Object.entries(rec.getData?.() || rec.data || {})) {
+                        const p = plain(v);
+                        if (p !== null) row[k] = p;
+                    }
+                    return row;
+                });
+                out.push({ source: 'store', id: g.getId?.() || '', loading: !!store.isLoading?.(), records });
+            } catch (e) {}
+        }
+    }
+    if (out.length) return out;
+
+    for (const table of Array.from(document.querySelectorAll('table'))) {
+        const headerRow = table.querySelector('thead tr') || table.querySelector('tr');
+        if (!headerRow) continue;
+        const headers = Array.from(headerRow.children).map((c) => (c.innerText || '').trim());
+        if (headers.filter(Boolean).length < 2) continue;
+        const records = [];
+        for (const tr of Array.from(table.querySelectorAll('tbody tr'))) {
+            if (tr === headerRow) continue;
+            const cells = Array.from(tr.children);
+            if (cells.length !== headers.length) continue;
+            const row = {};
+            cells.forEach((c, i) => { if (headers[i]) row[headers[i]] = (c.innerText || '').trim(); });
+            records.push(row);
+        }
+        if (records.length) out.push({ source: 'table', id: table.id || '', loading: false, records });
+    }
+    return out;
+}
+"""
+
+# Grid reload marker for data-mode re-reads: counts store `load` events (listeners are
+# attached once per store) and the current record count across visible grids.
+STORE_LOAD_MARK_SCRIPT = """
+() => {
+    if (!window.Ext?.ComponentQuery) return null;
+    const state = window.__ilpnStoreLoads || (window.__ilpnStoreLoads = { loads: 0, stores: new WeakSet() });
+    let count = 0;
+    for (const g of Ext.ComponentQuery.query('grid') || []) {
+        const store = g.isHidden?.() || g.isDestroyed ? null : g.getStore?.();
+        if (!store) continue;
+        if (!state.stores.has(store) && store.on) {
+            state.stores.add(store);
+            store.on('load', () => { state.loads += 1; });
+        }
+        count += store.getCount?.() || 0;
+    }
+    return { loads: state.loads, count };
+}
+"""
+
+# True once a store fired `load` after `before` was taken, or the record count changed
+# (local filtering) with no store still loading.
+STORE_RELOADED_SCRIPT = """
+(before) => {
+    const state = window.__ilpnStoreLoads;
+    if (state && state.loads > before.loads) return true;
+    let count = 0;
+    for (const g of window.Ext?.ComponentQuery?.query('grid') || []) {
+        const store = g.isHidden?.() || g.isDestroyed ? null : g.getStore?.();
+        if (!store) continue;
+        if (store.isLoading?.()) return false;
+        count += store.getCount?.() || 0;
+    }
+    return count !== before.count;
+}
+"""
+
+# Single probe for the iLPN frame, run in the top document.
+# Walks same-origin iframes (active Ext window first) and returns the first whose
+# document carries the iLPN filter or grid markers. When the active window is in
+# `cachedWindowIds` it returns immediately so the caller can reuse its cached frame.
+ILPN_FRAME_PROBE_SCRIPT = """
+(cachedWindowIds) => {
+    let activeId = '';
+    try {
+        const active = window.Ext?.WindowManager?.getActive?.();
+        activeId = active?.getId?.() || '';
+    } catch (e) {}
+    if (activeId && (cachedWindowIds || []).includes(activeId)) {
+        return { cached: true, windowId: activeId };
+    }
+
+    const isMatch = (doc) => {
+        if (doc.querySelector("input[name*='ilpn' i], input[id*='ilpn' i], input[name*='filter' i], input[id*='filter' i]")) {
+            return true;
+        }
+        return !!doc.querySelector("div.x-grid-view, table.x-grid-table")
+            && (doc.body?.innerText || '').toLowerCase().includes('ilpn');
+    };
+    const windowIdOf = (el) => el.closest?.('.x-window')?.id || '';
+    const walk = (doc, ownerId, depth) => {
+        const iframes = Array.from(doc.querySelectorAll('iframe'));
+        if (depth === 0 && activeId) {
+            iframes.sort((a, b) => (windowIdOf(b) === activeId) - (windowIdOf(a) === activeId));
+        }
+        for (const iframe of iframes) {
+            let child = null;
+            try { child = iframe.contentDocument; } catch (e) {}
+            if (!child) continue;
+            const windowId = ownerId || windowIdOf(iframe);
+            if (isMatch(child)) {
+                return { name: iframe.name || '', url: child.location.href, windowId, depth };
+            }
+            const nested = walk(child, windowId, depth + 1);
+            if (nested) return nested;
+        }
+        return null;
+    };
+
+    const hit = walk(document, '', 0);
+    if (hit) return hit;
+    if (isMatch(document)) return { top: true, url: location.href, windowId: activeId };
+    return null;
+}
+"""
+
+# wait_for_function predicate: true once the document has seen no DOM mutations for
+# `quietMs`, measured from the later of the last mutation and this wait's first call.
+# Attribute changes count too: Ext masks, row selection and re-layouts often only touch
+# class/style.
+# One observer is shared by concurrent waits and disconnected when the last one finishes.
+VIEW_QUIET_SCRIPT = """
+({ quietMs, token }) => {
+    let state = window.__viewQuiet;
+    if (!state) {
+        state = window.__viewQuiet = { last: performance.now(), calls: {} };
+        state.observer = new MutationObserver(() => { state.last = performance.now(); });
+        state.observer.observe(document.documentElement, { childList: true, subtree: true, characterData: true, attributes: true });
+    }
+    const now = performance.now();
+    const started = state.calls[token] ?? (state.calls[token] = now);
+    if (now - Math.max(state.last, started) < quietMs) return false;
+    delete state.calls[token];
+    if (!Object.keys(state.calls).length) {
+        state.observer.disconnect();
+        delete window.__viewQuiet;
+    }
+    return true;
+}
+"""
+
+# Drops a timed-out wait's token; the observer is disconnected once no wait is left.
+VIEW_QUIET_RELEASE_SCRIPT = """
+(token) => {
+    const state = window.__viewQuiet;
+    if (!state) return;
+    delete state.calls[token];
+    if (!Object.keys(state.calls).length) {
+        state.observer.disconnect();
+        delete window.__viewQuiet;
+    }
+}
+"""
@@ -1,6 +1,8 @@
 # operations/inbound/receive.py (simplified)
 from core.logger import rf_log
-from core.detour import run_open_ui_detours
+from core.detour import DetourWindowCache, run_open_ui_detours
+from core.detour_worker import DetourWorker
+from core.state_metrics import StateLatencyStats
 from operations.base_operation import BaseOperation
 from operations.inbound.receive_state_machine import ReceiveStateMachine
 from operations.inbound.ilpn_filter_helper import fill_ilpn_filter
@@ -14,7 +16,9 @@ from utils.wait_utils import WaitUtils
 class ReceiveOperation(BaseOperation):
     """Handles ASN receiving workflow using state machine."""
 
-    def __init__(self, page, page_mgr, screenshot_mgr, rf_menu, detour_page=None, detour_nav=None, settings=None):
+    def __init__(self, page, page_mgr, screenshot_mgr, rf_menu, detour_page=None, detour_nav=None, settings=None,
+                 detour_windows: DetourWindowCache | None = None, detour_worker: DetourWorker | None = None,
+                 state_latency: StateLatencyStats | None = None):
         super().__init__(page, page_mgr, screenshot_mgr, rf_menu)
 
         integration = RFMenuIntegration(rf_menu)
@@ -23,6 +27,8 @@ class ReceiveOperation(BaseOperation):
         self.selectors = OperationConfig.RECEIVE_SELECTORS
         self.detour_page = detour_page
         self.detour_nav = detour_nav or (NavigationManager(detour_page, screenshot_mgr) if detour_page else None)
+        self.detour_windows = detour_windows or (DetourWindowCache(detour_page) if detour_page else None)
+        self.detour_worker = detour_worker
         self.settings = settings
         self._screen_context: dict[str, int | None] | None = None
         
@@ -31,6 +37,7 @@ class ReceiveOperation(BaseOperation):
             rf=self.workflows,
             screenshot_mgr=screenshot_mgr,
             selectors=self.selectors,
+            latency_stats=state_latency,
         )
 
     def execute(
@@ -102,7 +109,14 @@ class ReceiveOperation(BaseOperation):
         self._handle_open_ui(cfg)
 
     def _handle_open_ui(self, cfg: dict | list[dict] | None):
-        """Invoke shared detour runner."""
+        """Invoke shared detour runner, or hand it to the background worker when one is attached.
+
+        With a worker, True only means the detour was queued; a detour that fails later is
+        reported when the workflow calls join_detours.
+        """
+        if self.detour_worker:
+            ctx = self._screen_context or {}
+            return self.detour_worker.submit(cfg, ctx, label=f"{ctx.get('asn')}/{ctx.get('item')}")
         self._ensure_detour_nav()
         return run_open_ui_detours(
             cfg,
@@ -114,6 +128,7 @@ class ReceiveOperation(BaseOperation):
             settings=self.settings,
             fill_ilpn_cb=self._fill_ilpn_quick_filter,
             screen_context=self._screen_context,
+            window_cache=self.detour_windows,
         )
 
     def _ensure_detour_nav(self):
@@ -125,6 +140,8 @@ class ReceiveOperation(BaseOperation):
         except Exception:
             self.detour_page = None
             self.detour_nav = None
+            self.detour_windows = None
             return
         self.detour_page = new_page
         self.detour_nav = NavigationManager(new_page, self.screenshot_mgr)
+        self.detour_windows = DetourWindowCache(new_page)
@@ -7,13 +7,15 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Callable, Optional
 from datetime import datetime
+import time
 
 from core.logger import rf_log
+from core.state_metrics import StateLatencyStats, StateTimer, StateTiming
 from core.screenshot import ScreenshotManager
 from operations.rf_primitives import RFWorkflows
 from config.operations_config import OperationConfig, ScreenSelectors
 from utils.retry import retry_with_context
-from DB import DB
+from operations.inbound.rstage_locations import RStageLocationProvider
 from config.settings import Settings
 from config.workflow_config import FlowType
 
@@ -61,9 +63,45 @@ class ReceiveContext:
     
     # Audit trail
     transitions: list[tuple[ReceiveState, ReceiveState, str]] = field(default_factory=list)
+    transition_times: list[float] = field(default_factory=list)
+    timings: list[StateTiming] = field(default_factory=list)
     
     def record_transition(self, from_state: ReceiveState, to_state: ReceiveState, reason: str = ""):
         self.transitions.append((from_state, to_state, reason))
+        self.transition_times.append(time.monotonic())
+
+
+# One round trip for state classification: body text plus visibility of every probed selector.
+SCREEN_SNAPSHOT_JS = """
+(selectors) => {
+    const shown = (el) => {
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && el.getClientRects().length > 0;
+    };
+    const visible = {};
+    for (const sel of selectors) {
+        try {
+            visible[sel] = Array.from(document.querySelectorAll(sel)).some(shown);
+        } catch (e) {
+            visible[sel] = false;
+        }
+    }
+    return { text: document.body ? document.body.innerText : '', visible };
+}
+"""
+
+
+@dataclass(frozen=True)
+class ScreenSnapshot:
+    """RF screen text and selector visibility captured at one instant."""
+    text: str = ""
+    visible: dict[str, bool] = field(default_factory=dict)
+
+    def shows(self, selector: Optional[str]) -> bool:
+        return bool(selector) and self.visible.get(selector, False)
+
+    def mentions(self, *markers: str) -> bool:
+        return any(marker in self.text for marker in markers)
 
 
 class StateHandler(ABC):
@@ -76,10 +114,13 @@ class StateHandler(ABC):
         """Execute state logic and return next state."""
         pass
     
-    @abstractmethod
     def detect(self, machine: ReceiveStateMachine) -> bool:
         """Return True if current screen matches this state."""
-        pass
+        return self.matches(machine, machine.snapshot_screen())
+
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        """Return True if the snapshot matches this state; undetectable states keep the default."""
+        return False
 
 
 class ReceiveStateMachine:
@@ -91,6 +132,22 @@ class ReceiveStateMachine:
         success = machine.run(asn="12345678", item="PART123", quantity=100)
     """
     
+    # States worth checking first when recovering from a given state: a retry of the
+    # same step, then where that step normally leads.
+    LIKELY_NEXT: dict[ReceiveState, tuple[ReceiveState, ...]] = {
+        ReceiveState.NAVIGATED: (ReceiveState.NAVIGATED, ReceiveState.ASN_SCANNED),
+        ReceiveState.ASN_SCANNED: (ReceiveState.ASN_SCANNED, ReceiveState.ITEM_SCANNED),
+        ReceiveState.ITEM_SCANNED: (ReceiveState.ITEM_SCANNED, ReceiveState.AWAITING_LOCATION),
+        ReceiveState.QTY_ENTERED: (
+            ReceiveState.AWAITING_LOCATION,
+            ReceiveState.AWAITING_BLIND_ILPN,
+            ReceiveState.CANT_FIND_PUTAWAY_LOCATION,
+        ),
+        ReceiveState.AWAITING_BLIND_ILPN: (ReceiveState.AWAITING_BLIND_ILPN, ReceiveState.AWAITING_LOCATION),
+        ReceiveState.AWAITING_LOCATION: (ReceiveState.AWAITING_LOCATION,),
+        ReceiveState.CANT_FIND_PUTAWAY_LOCATION: (ReceiveState.CANT_FIND_PUTAWAY_LOCATION,),
+    }
+
     def __init__(
         self,
         rf: RFWorkflows,
@@ -99,6 +156,7 @@ class ReceiveStateMachine:
         deviation_selectors: Optional[ScreenSelectors] = None,
         post_qty_hook: Optional[Callable[['ReceiveStateMachine'], None]] = None,
         post_location_hook: Optional[Callable[['ReceiveStateMachine'], None]] = None,
+        latency_stats: Optional[StateLatencyStats] = None,
     ):
         self.rf = rf
         self.screenshot_mgr = screenshot_mgr
@@ -106,6 +164,7 @@ class ReceiveStateMachine:
         self.deviation_selectors = deviation_selectors or OperationConfig.RECEIVE_DEVIATION_SELECTORS
         self.post_qty_hook = post_qty_hook
         self.post_location_hook = post_location_hook
+        self.latency_stats = latency_stats
         
         self.state = ReceiveState.INIT
         self.context = ReceiveContext()
@@ -169,10 +228,14 @@ class ReceiveStateMachine:
         self._post_location_hook_called = False
         
         rf_log(f"🚀 Starting receive: ASN={asn}, Item={item}, Qty={quantity}")
+        if auto_handle or flow_hint == FlowType.CANT_FIND_PUTAWAY_LOCATION.value:
+            # Any auto-handled receive may hit the R-stage prompt; warm the pool while the RF flow runs
+            _rstage_provider()
         
         # Main state loop
         while not self._is_terminal():
             prev_state = self.state
+            timer = StateTimer(self.state.name)
             
             try:
                 handler = self.handlers.get(self.state)
@@ -188,9 +251,13 @@ class ReceiveStateMachine:
                 rf_log(f"❌ Exception in {self.state.name}: {e}")
                 self.context.error_message = str(e)
                 self._transition_to(ReceiveState.ERROR, f"Exception: {e}")
+            finally:
+                self.context.timings.append(timer.stop())
         
         # Log result
         success = self.state == ReceiveState.COMPLETE
+        if self.latency_stats is not None:
+            self.latency_stats.add(self.context.timings)
         self._log_summary(success)
         return success
     
@@ -199,14 +266,51 @@ class ReceiveStateMachine:
         Detect current state from screen content.
         Used for recovery and deviation handling.
         """
-        for detector in self.detectors:
+        snapshot = self.snapshot_screen()
+        for detector in self._detectors_by_likelihood():
             try:
-                if detector.detect(self):
+                if detector.matches(self, snapshot):
                     return detector.state
             except Exception:
                 continue
         return ReceiveState.ERROR
-    
+
+    def _detectors_by_likelihood(self) -> list[StateHandler]:
+        """Detectors reordered so states likely to follow the last active state come first."""
+        anchor = self.state
+        if anchor == ReceiveState.ERROR and self.context.transitions:
+            anchor = self.context.transitions[-1][0]
+        likely = self.LIKELY_NEXT.get(anchor, ())
+        return sorted(
+            self.detectors,
+            key=lambda d: likely.index(d.state) if d.state in likely else len(likely),
+        )
+
+    def snapshot_selectors(self) -> list[str]:
+        """Selectors whose visibility any state predicate may ask about."""
+        keys = ('asn', 'item', 'quantity', 'location')
+        deviation_keys = ('lpn_input', 'rstage_location', 'rstage_location_name')
+        found = [self.selectors.selectors.get(k) for k in keys]
+        found += [self.deviation_selectors.selectors.get(k) for k in deviation_keys]
+        return [sel for sel in dict.fromkeys(found) if sel]
+
+    def snapshot_screen(self) -> ScreenSnapshot:
+        """Capture screen text and selector visibility in one evaluate; missing elements cost nothing."""
+        selectors = self.snapshot_selectors()
+        try:
+            result = self.rf.primitive.get_iframe().evaluate(SCREEN_SNAPSHOT_JS, selectors)
+        except Exception:
+            result = None
+        if isinstance(result, dict) and isinstance(result.get("text"), str):
+            visible = result.get("visible") or {}
+            return ScreenSnapshot(result["text"].lower(), {sel: bool(visible.get(sel)) for sel in selectors})
+
+        # Frames that can't evaluate: read text once and probe selectors without waiting.
+        return ScreenSnapshot(
+            self.read_screen_text(),
+            {sel: self.is_element_visible(sel, timeout=0) for sel in selectors},
+        )
+
     def read_screen_text(self) -> str:
         """Get current RF screen body text."""
         try:
@@ -215,10 +319,12 @@ class ReceiveStateMachine:
             return ""
     
     def is_element_visible(self, selector: str, timeout: int = 500) -> bool:
-        """Check if element is visible on current screen."""
+        """Check if element is visible on current screen; timeout <= 0 checks without waiting."""
         try:
             rf_iframe = self.rf.primitive.get_iframe()
             locator = rf_iframe.locator(selector)
+            if timeout <= 0:
+                return bool(locator.first.is_visible())
             locator.wait_for(state="visible", timeout=timeout)
             return True
         except Exception:
@@ -273,6 +379,13 @@ class ReceiveStateMachine:
         icon = "✅" if success else "❌"
         rf_log(f"{icon} Receive {'completed' if success else 'failed'}: {self.context.asn}")
         rf_log(f"   Transitions: {len(self.context.transitions)}")
+        if self.context.timings:
+            total_ms = sum(t.duration_ms for t in self.context.timings)
+            slowest = max(self.context.timings, key=lambda t: t.duration_ms)
+            rf_log(
+                f"   Time: {total_ms:.0f}ms, slowest {slowest.state} {slowest.duration_ms:.0f}ms "
+                f"({sum(t.playwright_calls for t in self.context.timings)} Playwright calls)"
+            )
         if self.context.error_message:
             rf_log(f"   Error: {self.context.error_message}")
 
@@ -291,7 +404,7 @@ class InitHandler(StateHandler):
             return ReceiveState.NAVIGATED
         return ReceiveState.ERROR
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
         # Init is not detectable from screen
         return False
 
@@ -310,8 +423,8 @@ class NavigatedHandler(StateHandler):
             return ReceiveState.ERROR
         return ReceiveState.ASN_SCANNED
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
-        return machine.is_element_visible(machine.selectors.asn)
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        return snapshot.shows(machine.selectors.asn)
 
 
 class AsnScannedHandler(StateHandler):
@@ -334,8 +447,8 @@ class AsnScannedHandler(StateHandler):
         
         return ReceiveState.ITEM_SCANNED
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
-        return machine.is_element_visible(machine.selectors.item)
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        return snapshot.shows(machine.selectors.item)
 
 
 class ItemScannedHandler(StateHandler):
@@ -361,8 +474,8 @@ class ItemScannedHandler(StateHandler):
         
         return ReceiveState.QTY_ENTERED
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
-        return machine.is_element_visible(machine.selectors.quantity)
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        return snapshot.shows(machine.selectors.quantity)
 
 
 class QtyEnteredHandler(StateHandler):
@@ -378,65 +491,71 @@ class QtyEnteredHandler(StateHandler):
         (ReceiveState.AWAITING_BLIND_ILPN, '_is_blind_ilpn_prompt'),
         (ReceiveState.CANT_FIND_PUTAWAY_LOCATION, '_r_stage_prompt'),
     ]
+    # The next prompt may still be rendering when quantity entry returns: re-snapshot
+    # every BRANCH_POLL_MS until a branch matches or BRANCH_WAIT_MS has passed.
+    BRANCH_WAIT_MS = 2000
+    BRANCH_POLL_MS = 100
     
     def execute(self, machine: ReceiveStateMachine) -> ReceiveState:
         machine.invoke_post_qty_hook()
-        screen_text = machine.read_screen_text()
+        next_state, snapshot = self._await_branch(machine)
         
-        for next_state, detector_name in self.BRANCH_DETECTORS:
-            detector = getattr(self, detector_name)
-            if detector(machine, screen_text):
-                # Check if this matches expected flow
-                if machine.context.flow_hint:
-                    expected = self._state_to_flow_name(next_state)
-                    if expected != machine.context.flow_hint:
-                        rf_log(f"⚠️ Flow deviation: expected {machine.context.flow_hint}, got {expected}")
-                        machine.rf_capture("deviation", f"Expected {machine.context.flow_hint}")
-                        if not machine.context.auto_handle_deviation:
-                            machine.context.error_message = f"Flow deviation: {expected}"
-                            return ReceiveState.ERROR
-                
-                return next_state
+        if next_state is not None:
+            # Check if this matches expected flow
+            if machine.context.flow_hint:
+                expected = self._state_to_flow_name(next_state)
+                if expected != machine.context.flow_hint:
+                    rf_log(f"⚠️ Flow deviation: expected {machine.context.flow_hint}, got {expected}")
+                    machine.rf_capture("deviation", f"Expected {machine.context.flow_hint}")
+                    if not machine.context.auto_handle_deviation:
+                        machine.context.error_message = f"Flow deviation: {expected}"
+                        return ReceiveState.ERROR
+            
+            return next_state
         
         # Unknown screen state
-        rf_log(f"⚠️ Unknown screen after qty entry: {screen_text[:100]}")
+        rf_log(f"⚠️ Unknown screen after qty entry: {snapshot.text[:100]}")
         machine.rf_capture("unknown_state", "Unknown screen")
         machine.context.error_message = "Unknown screen state after quantity"
         return ReceiveState.ERROR
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
         # QTY_ENTERED is transitional, not directly detectable
         return False
-    
-    def _is_location_prompt(self, machine: ReceiveStateMachine, text: str) -> bool:
-        # Check for location selector visibility
-        if machine.is_element_visible(machine.selectors.location, timeout=300):
+
+    def _await_branch(self, machine: ReceiveStateMachine) -> tuple[Optional[ReceiveState], ScreenSnapshot]:
+        """Poll screen snapshots until one matches a branch; (None, last snapshot) on timeout."""
+        deadline = time.monotonic() + self.BRANCH_WAIT_MS / 1000
+        while True:
+            snapshot = machine.snapshot_screen()
+            for next_state, detector_name in self.BRANCH_DETECTORS:
+                if getattr(self, detector_name)(machine, snapshot):
+                    return next_state, snapshot
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, snapshot
+            time.sleep(min(self.BRANCH_POLL_MS / 1000, remaining))
+    
+    def _is_location_prompt(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        # Location selector visibility, then text markers
+        if snapshot.shows(machine.selectors.location):
             return True
-        # Fallback to text detection
-        return any(marker in text for marker in ('aloc', 'cloc', 'location'))
+        return snapshot.mentions('aloc', 'cloc', 'location')
     
-    def _is_blind_ilpn_prompt(self, machine: ReceiveStateMachine, text: str) -> bool:
-        if machine.is_element_visible(machine.deviation_selectors.lpn_input, timeout=300):
+    def _is_blind_ilpn_prompt(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        if snapshot.shows(machine.deviation_selectors.lpn_input):
             return True
-        return 'blind ilpn' in text or 'ilpn#' in text
+        return snapshot.mentions('blind ilpn', 'ilpn#')
     
-    def _is_qty_adjust_prompt(self, machine: ReceiveStateMachine, text: str) -> bool:
-        return 'qty adjust' in text or 'quantity adjust' in text
-
-    def _r_stage_prompt(self, machine: ReceiveStateMachine, text: str) -> bool:
-        try:
-            if machine.is_element_visible(machine.deviation_selectors.rstage_location, timeout=300):
-                return True
-        except Exception:
-            pass
-
-        try:
-            if machine.is_element_visible(machine.deviation_selectors.rstage_location_name, timeout=300):
-                return True
-        except Exception:
-            pass
+    def _is_qty_adjust_prompt(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        return snapshot.mentions('qty adjust', 'quantity adjust')
 
-        return 'exception r-stage' in text.lower() or 'r-stage' in text.lower()
+    def _r_stage_prompt(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        if snapshot.shows(machine.deviation_selectors.rstage_location):
+            return True
+        if snapshot.shows(machine.deviation_selectors.rstage_location_name):
+            return True
+        return snapshot.mentions('r-stage')
     
     def _state_to_flow_name(self, state: ReceiveState) -> str:
         mapping = {
@@ -467,8 +586,8 @@ class AwaitingLocationHandler(StateHandler):
         machine.rf_capture("complete", f"Location confirmed: {location}")
         return ReceiveState.COMPLETE
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
-        return machine.is_element_visible(machine.selectors.location)
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        return snapshot.shows(machine.selectors.location)
 
 
 class AwaitingBlindIlpnHandler(StateHandler):
@@ -497,9 +616,8 @@ class AwaitingBlindIlpnHandler(StateHandler):
         machine.context.error_message = "Could not enter blind iLPN"
         return ReceiveState.ERROR
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
-        text = machine.read_screen_text()
-        return 'blind ilpn' in text or 'ilpn#' in text
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        return snapshot.mentions('blind ilpn', 'ilpn#')
 
 
 class CantFindPutawayLocationHandler(StateHandler):
@@ -531,9 +649,8 @@ class CantFindPutawayLocationHandler(StateHandler):
         machine.context.error_message = "Could not enter Location in R-Stage"
         return ReceiveState.ERROR
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
-        text = machine.read_screen_text()
-        return 'exception r-stage' in text.lower() or 'r-stage' in text.lower()
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        return snapshot.mentions('r-stage')
 
 
 class CompleteHandler(StateHandler):
@@ -543,7 +660,7 @@ class CompleteHandler(StateHandler):
         # Terminal state - no transition
         return ReceiveState.COMPLETE
     
-    def detect(self, machine: ReceiveStateMachine) -> bool:
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
         # Complete is determined by flow, not screen content
         return False
 
@@ -562,9 +679,8 @@ class ErrorHandler(StateHandler):
         machine.rf_capture("error", machine.context.error_message or "Error")
         return ReceiveState.ERROR
 
-    def detect(self, machine: ReceiveStateMachine) -> bool:
-        text = machine.read_screen_text()
-        return 'error' in text or 'invalid' in text
+    def matches(self, machine: ReceiveStateMachine, snapshot: ScreenSnapshot) -> bool:
+        return snapshot.mentions('error', 'invalid')
 
 
 # =============================================================================
@@ -629,39 +745,19 @@ def _read_suggested_location(machine: ReceiveStateMachine) -> str:
     return ""
 
 
-def _fetch_rstage_location() -> str | None:
-    """Fetch the most recent R-stage location from the database."""
+def _rstage_provider() -> RStageLocationProvider | None:
     whse = Settings.app.change_warehouse
-    env = Settings.app.credentials_env
     if not whse:
         return None
+    return RStageLocationProvider.for_warehouse(Settings.app.credentials_env, whse)
 
-    query = f"""
-        select LOCN_BRCD
-        from LOCN_HDR
-        where
-          PUTWY_ZONE = 'RST'
-        order by LOCN_PUTWY_SEQ desc
-        fetch first 1 row only
-    """
 
-    try:
-        with DB(env, whse) as db:
-            db.runSQL(query)
-            row = db.fetchone()
-    except Exception as exc:
-        rf_log(f"⚠️ R-stage location query failed: {exc}")
-        return None
-
-    if not row:
+def _fetch_rstage_location() -> str | None:
+    """Next R-stage location for the current warehouse from the prefetched pool."""
+    provider = _rstage_provider()
+    if provider is None:
         return None
-
-    if isinstance(row, dict):
-        value = row.get("LOCN_BRCD")
-        return str(value) if value is not None else None
-
-    if isinstance(row, (list, tuple)) and row:
-        first_value = row[0]
-        return str(first_value) if first_value is not None else None
-
-    return None
+    location = provider.next_location()
+    if not location:
+        rf_log("⚠️ No R-stage locations available")
+    return location
@@ -0,0 +1,134 @@
+"""
+R-stage location provider - prefetched, rotating RST putaway locations per warehouse.
+
+One provider per (env, warehouse) loads a batch of LOCN_HDR rows on a background
+thread and hands them out least-recently-used first, so CANT_FIND_PUTAWAY_LOCATION
+handling reads from memory instead of opening a DB connection per deviation.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from core.logger import rf_log
+from DB import DB
+
+RSTAGE_QUERY = """
+    select LOCN_BRCD
+    from LOCN_HDR
+    where
+      PUTWY_ZONE = 'RST'
+    order by LOCN_PUTWY_SEQ desc
+    fetch first {limit} rows only
+"""
+
+
+def load_rstage_locations(env: str | None, whse: str, limit: int) -> list[str]:
+    """Query up to `limit` RST location barcodes for a warehouse."""
+    with DB(env, whse) as db:
+        db.runSQL(RSTAGE_QUERY.format(limit=int(limit)))
+        rows, _columns = db.fetchall()
+
+    locations = []
+    for row in rows or []:
+        value = row.get("LOCN_BRCD") if isinstance(row, dict) else (row[0] if row else None)
+        if value is not None and str(value).strip():
+            locations.append(str(value).strip())
+    return locations
+
+
+class RStageLocationProvider:
+    """Background-refreshed pool of R-stage locations for one warehouse."""
+
+    _providers: dict[tuple[str | None, str], "RStageLocationProvider"] = {}
+    _providers_lock = threading.Lock()
+    FAILED_RETRY_S = 30.0
+
+    def __init__(
+        self,
+        env: str | None,
+        whse: str,
+        *,
+        batch_size: int = 25,
+        refresh_s: float = 600.0,
+        loader: Callable[[str | None, str, int], list[str]] = load_rstage_locations,
+    ):
+        self.env = env
+        self.whse = whse
+        self.batch_size = batch_size
+        self.refresh_s = refresh_s
+        self._loader = loader
+        self._pool: deque[str] = deque()
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._loading: threading.Thread | None = None
+        self._loaded_at: float | None = None
+
+    @classmethod
+    def for_warehouse(cls, env: str | None, whse: str) -> "RStageLocationProvider":
+        """Shared provider for a warehouse; starts its first prefetch on creation."""
+        with cls._providers_lock:
+            provider = cls._providers.get((env, whse))
+            if provider is None:
+                provider = cls(env, whse)
+                cls._providers[(env, whse)] = provider
+                provider.prefetch()
+            return provider
+
+    @classmethod
+    def reset(cls):
+        with cls._providers_lock:
+            cls._providers.clear()
+
+    def prefetch(self) -> threading.Thread | None:
+        """Start a background load unless one is already running."""
+        with self._lock:
+            if self._loading and self._loading.is_alive():
+                return self._loading
+            self._loading = threading.Thread(
+                target=self._load, name=f"rstage-prefetch-{self.whse}", daemon=True
+            )
+            self._loading.start()
+            return self._loading
+
+    def next_location(self, wait_s: float = 10.0) -> str | None:
+        """Least-recently-used location; waits only for the very first load."""
+        if not self._loaded.is_set():
+            self.prefetch()
+            self._loaded.wait(wait_s)
+
+        with self._lock:
+            stale = self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_s
+            location = None
+            if self._pool:
+                location = self._pool.popleft()
+                self._pool.append(location)
+
+        if stale:
+            self.prefetch()
+        return location
+
+    def _load(self):
+        try:
+            locations = self._loader(self.env, self.whse, self.batch_size)
+        except Exception as exc:
+            rf_log(f"⚠️ R-stage location prefetch failed for {self.whse}: {exc}")
+            locations = None
+
+        with self._lock:
+            if locations is not None:
+                self._merge(locations)
+                self._loaded_at = time.monotonic()
+            else:
+                # Retry a failed load after FAILED_RETRY_S rather than a full refresh period.
+                self._loaded_at = time.monotonic() - self.refresh_s + min(self.FAILED_RETRY_S, self.refresh_s)
+        self._loaded.set()
+
+    def _merge(self, locations: list[str]):
+        """Replace the pool, keeping the use order of locations that are still valid."""
+        fresh = list(dict.fromkeys(locations))
+        keep = [loc for loc in self._pool if loc in fresh]
+        unused = [loc for loc in fresh if loc not in keep]
+        self._pool = deque(unused + keep)
@@ -0,0 +1,156 @@
+"""Local stand-in for the WMS integration endpoint.
+
+Accepts posted XML and answers with the same response envelope the Post Message
+screen shows, so HttpPostTransport can be exercised and benchmarked offline:
+
+    python -m operations.integration_stub --port 8765 --latency-ms 40
+"""
+
+import argparse
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from xml.sax.saxutils import escape
+
+RESPONSE_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<tXML>
+<Header>
+<Message_Type>{message_type}</Message_Type>
+<Internal_Reference_ID>{reference_id}</Internal_Reference_ID>
+</Header>
+<Response>
+<Persistent_State>{persistent_state}</Persistent_State>
+<Error_Type>{error_type}</Error_Type>
+<Resp_Code>{resp_code}</Resp_Code>
+<Response_Details>
+<Application_Advice>
+<Response_Type>{response_type}</Response_Type>
+<Application_Ackg_Code>{ack_code}</Application_Ackg_Code>
+<Imported_Object_Type>{message_type}</Imported_Object_Type>
+</Application_Advice>
+<Exception_Details>{exception}</Exception_Details>
+</Response_Details>
+</Response>
+</tXML>"""
+
+
+def build_response(message: str, reference_id: int) -> str:
+    """Build a success response for well-formed XML, an error response otherwise."""
+    try:
+        root = ET.fromstring(message)
+    except ET.ParseError as exc:
+        return RESPONSE_TEMPLATE.format(
+            message_type="Unknown",
+            reference_id=reference_id,
+            persistent_state="0",
+            error_type="2",
+            resp_code="1",
+            response_type="Rejection",
+            ack_code="AR",
+            exception=escape(f"Invalid XML: {exc}"),
+        )
+
+    message_type = root.findtext(".//Message_Type") or root.tag
+    return RESPONSE_TEMPLATE.format(
+        message_type=escape(message_type),
+        reference_id=reference_id,
+        persistent_state="1",
+        error_type="0",
+        resp_code="0",
+        response_type="Confirmation",
+        ack_code="AA",
+        exception="",
+    )
+
+
+class IntegrationStubServer:
+    """Threaded HTTP server answering integration posts with canned response XML."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: int = 0):
+        self.latency_ms = latency_ms
+        self.received: list[str] = []
+        self._lock = threading.Lock()
+        self._ids = count(1)
+        self._thread: threading.Thread | None = None
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/integration"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                message = self.rfile.read(length).decode("utf-8", errors="replace")
+                with server._lock:
+                    server.received.append(message)
+                    reference_id = next(server._ids)
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                body = build_response(message, reference_id).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                return
+
+        return Handler
+
+    def start(self) -> "IntegrationStubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until shutdown (Ctrl+C from the CLI)."""
+        self._httpd.serve_forever()
+
+    def close(self):
+        """Release the listening socket."""
+        self._httpd.server_close()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self.close()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "IntegrationStubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local integration stub endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    server = IntegrationStubServer(args.host, args.port, args.latency_ms)
+    print(f"Integration stub listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,11 @@ import html
 import re
 import time
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
+import requests
+from requests.adapters import HTTPAdapter
 from playwright.sync_api import Frame, Locator, Page
 
 from core.screenshot import ScreenshotManager
@@ -14,17 +17,221 @@ from core.logger import app_log
 from config.settings import Settings
 
 
-class PostMessageManager:
-    """Encapsulates interactions with the Post Message (Integration) screen."""
+RESPONSE_PRIORITY_SELECTORS = (
+    "textarea[name='dataForm:resultString']",
+    "textarea[id='dataForm:resultString']",
+    "textarea[name='resultString']",
+)
+
+RESPONSE_FALLBACK_SELECTORS = (
+    "textarea#resultString",
+    "textarea[id*='resultString' i]",
+    "textarea[name*='resultString' i]",
+    "textarea[name*='response' i]",
+    "textarea[id*='response' i]",
+    "pre",
+    "div[class*='response']",
+)
+
+PAYLOAD_SELECTORS = (
+    "textarea[name='dataForm:xmlString']",
+    "textarea[id='dataForm:xmlString']",
+    "textarea[name='dataForm:messagePayload']",
+    "textarea[id='dataForm:messagePayload']",
+    "textarea[name*='message' i]",
+    "textarea[id*='message' i]",
+)
+
+RESIZE_TEXTAREAS_FN = """
+const resizeTextareas = () => {
+    const viewHeight = window.innerHeight || 900;
+    const targetHeight = Math.max(320, Math.round(viewHeight * 0.85));
+    const selectors = [
+        "textarea[name='dataForm:xmlString']",
+        "textarea[id='dataForm:xmlString']",
+        "textarea[name='dataForm:messagePayload']",
+        "textarea[id='dataForm:messagePayload']",
+        "textarea[name='dataForm:resultString']",
+        "textarea[id='dataForm:resultString']",
+        "textarea[name*='response' i]",
+        "textarea[id*='response' i]"
+    ];
+    document.querySelectorAll(selectors.join(',')).forEach((el) => {
+        el.style.setProperty('height', `${targetHeight}px`, 'important');
+        el.style.setProperty('min-height', `${targetHeight}px`, 'important');
+        el.style.setProperty('max-height', `${targetHeight}px`, 'important');
+        el.style.setProperty('overflow', 'auto', 'important');
+    });
+};
+"""
+
+RESIZE_TEXTAREAS_JS = "() => {" + RESIZE_TEXTAREAS_FN + "resizeTextareas(); }"
+
+# Response and payload in one round trip. The remembered response selector is tried first
+# and ends the scan when it has text; body text is only returned when no candidate matched.
+READ_POST_RESULT_JS = """
+({priority, fallback, payload, maxChars}) => {
+""" + RESIZE_TEXTAREAS_FN + """
+    resizeTextareas();
+    const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const read = (selector) => {
+        let el = null;
+        try {
+            el = Array.from(document.querySelectorAll(selector)).find(visible);
+        } catch (e) {
+            return '';
+        }
+        return el ? ((el.tagName === 'TEXTAREA' ? el.value : el.innerText) || '').trim() : '';
+    };
+    const squashedLength = (text) => text.replace(/\\s+/g, ' ').length;
+
+    let response = null;
+    for (const selector of priority) {
+        const text = read(selector);
+        if (text) {
+            response = { selector, text };
+            break;
+        }
+    }
+    if (!response) {
+        let best = 0;
+        for (const selector of fallback) {
+            const text = read(selector);
+            if (text && squashedLength(text) > best) {
+                best = squashedLength(text);
+                response = { selector, text };
+            }
+        }
+    }
+
+    let posted = null;
+    for (const selector of payload) {
+        const text = read(selector);
+        if (text) {
+            posted = { selector, text: text.slice(0, maxChars), length: text.length };
+            break;
+        }
+    }
+
+    const body = response ? '' : (document.body ? (document.body.innerText || '') : '');
+    return { response, body, payload: posted };
+}
+"""
+
+SET_TEXTAREA_VALUE_JS = """
+(el, value) => {
+    el.value = value;
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+    el.dispatchEvent(new Event('change', { bubbles: true }));
+}
+"""
+
+OVERLAY_MAX_CHARS = 20000
+
+
+class PostResponseInterpreter:
+    """Turns a raw integration response into the summary dict used by the runner."""
 
     ERROR_MARKERS = ("error", "failed", "exception", "invalid")
     SUCCESS_RESP_CODES = {"", "0", "25"}
 
+    def _interpret_response(self, response_text: str) -> Dict[str, Any]:
+        info = {
+            "raw": response_text or "",
+            "summary": (response_text or "").strip() or "Empty response",
+            "payload": {},
+            "is_error": self._is_error_response(response_text),
+        }
+
+        text = (response_text or "").strip()
+        if text.startswith("<?xml"):
+            try:
+                root = ET.fromstring(text)
+
+                def _get(path: str):
+                    node = root.find(path)
+                    if node is not None and node.text:
+                        return node.text.strip()
+                    return None
+
+                payload = {
+                    "message_type": _get(".//Header/Message_Type"),
+                    "internal_id": _get(".//Header/Internal_Reference_ID"),
+                    "persistent_state": _get(".//Response/Persistent_State"),
+                    "error_type": _get(".//Response/Error_Type"),
+                    "resp_code": _get(".//Response/Resp_Code"),
+                    "exception_details": _get(".//Response/Response_Details/Exception_Details"),
+                    "response_type": _get(".//Application_Advice/Response_Type"),
+                    "ack_code": _get(".//Application_Advice/Application_Ackg_Code"),
+                    "imported_object_type": _get(".//Application_Advice/Imported_Object_Type"),
+                }
+
+                info["payload"] = payload
+                info["is_error"] = self._is_xml_error(payload)
+                info["summary"] = self._format_response_summary(payload)
+            except ET.ParseError:
+                pass
+
+        return info
+
+    def _is_error_response(self, response_text: str) -> bool:
+        normalized = (response_text or "").lower()
+        return any(marker in normalized for marker in self.ERROR_MARKERS)
+
+    def _is_xml_error(self, payload: Dict[str, str]) -> bool:
+        error_type = (payload.get("error_type") or "").strip()
+        resp_code = (payload.get("resp_code") or "").strip()
+        exception = payload.get("exception_details") or ""
+        persistent_state = (payload.get("persistent_state") or "").strip()
+        ack_code = (payload.get("ack_code") or "").strip().upper()
+        response_type = (payload.get("response_type") or "").strip().lower()
+        imported_object = (payload.get("imported_object_type") or "").strip().lower()
+        is_distribution_order = imported_object == "distributionorder"
+
+        codes_ok = error_type in ("", "0") and resp_code in self.SUCCESS_RESP_CODES
+        no_exception = exception.strip() == ""
+        persistent_ok = persistent_state in ("", "0", "1")
+        ack_ok = ack_code in ("TA", "AA", "OK")
+        response_ok = response_type in ("", "confirmation", "accepted")
+        distribution_ok = is_distribution_order and (ack_ok or resp_code in self.SUCCESS_RESP_CODES)
+
+        return not (
+            (codes_ok or ack_ok or response_ok or distribution_ok)
+            and no_exception
+            and persistent_ok
+        )
+
+    def _format_response_summary(self, payload: Dict[str, str]) -> str:
+        resp_code = payload.get("resp_code") or "n/a"
+        error_type = payload.get("error_type") or "n/a"
+        persistent = payload.get("persistent_state") or "n/a"
+        exception = (payload.get("exception_details") or "").replace("\n", " ").strip()
+
+        base = f"RespCode {resp_code}, ErrorType {error_type}, PersistentState {persistent}"
+        if exception:
+            return f"{base}: {exception}"
+        return base
+
+    @staticmethod
+    def _error_info(summary: str) -> Dict[str, Any]:
+        return {
+            "raw": "",
+            "summary": summary,
+            "payload": {},
+            "is_error": True,
+        }
+
+
+class PostMessageManager(PostResponseInterpreter):
+    """Encapsulates interactions with the Post Message (Integration) screen."""
+
     def __init__(self, page: Page, screenshot_mgr: ScreenshotManager):
         self.page = page
         self.screenshot_mgr = screenshot_mgr
         self._reset_required = False
         self._last_sent_snapshot: str | None = None
+        self._response_selector: str | None = None
+        self._payload_selector: str | None = None
 
     def send_message(self, message: str) -> Tuple[bool, Dict[str, Any]]:
 
@@ -43,6 +250,71 @@ class PostMessageManager:
         app_log(f"⚠️ Post Message attempt failed: {response_info['summary']}")
         return False, last_response
 
+    def send_messages(self, messages: Iterable[str]) -> List[Tuple[bool, Dict[str, Any]]]:
+        """Post several messages through the already-open Post Message window.
+
+        The frame is resolved and the textareas resized once; each message then only
+        pays for fill, submit and response readout. Screenshots are taken on errors only.
+        """
+        return list(self.iter_send_messages(messages))
+
+    def iter_send_messages(self, messages: Iterable[str]) -> Iterator[Tuple[bool, Dict[str, Any]]]:
+        """Like send_messages, but yields each message's outcome as soon as its response is read."""
+        frame = self._resolve_frame()
+        self._resize_textareas(frame)
+
+        for index, message in enumerate(messages, 1):
+            if not message:
+                yield False, self._error_info("Empty post message payload")
+                continue
+
+            if self._frame_detached(frame):
+                frame = self._resolve_frame()
+                self._resize_textareas(frame)
+
+            try:
+                self._clear_response(frame)
+                self._fill_message(frame, message, capture=False)
+                response_info = self._submit_and_capture(frame, capture_success=False)
+            except Exception as exc:
+                response_info = self._error_info(f"Post Message {index} failed: {exc}")
+                self._capture_batch_error(index, response_info["summary"])
+
+            if response_info["is_error"]:
+                app_log(f"⚠️ Post Message {index} failed: {response_info['summary']}")
+            else:
+                app_log(f"✅ Post Message {index}: {response_info['summary'][:80]}")
+            yield not response_info["is_error"], response_info
+
+    def _frame_detached(self, frame: Frame) -> bool:
+        try:
+            return frame.is_detached()
+        except Exception:
+            return True
+
+    def _clear_response(self, frame: Frame):
+        """Empty the response textareas so the next submit is not satisfied by a stale reply."""
+        selectors = RESPONSE_PRIORITY_SELECTORS + tuple(
+            selector for selector in RESPONSE_FALLBACK_SELECTORS if selector.startswith("textarea")
+        )
+        try:
+            frame.evaluate(
+                "(selectors) => document.querySelectorAll(selectors.join(',')).forEach((el) => { el.value = ''; })",
+                list(selectors),
+            )
+        except Exception:
+            pass
+
+    def _capture_batch_error(self, index: int, summary: str):
+        try:
+            self.screenshot_mgr.capture(
+                self.page,
+                f"post_message_{index}_error",
+                f"Error: {summary[:60]}",
+            )
+        except Exception:
+            pass
+
     def _resolve_frame(self, timeout_ms: int = 5000, poll_interval_ms: int = 200) -> Frame:
         """Wait for the frame that hosts the Post Message UI - optimized."""
         deadline = time.monotonic() + timeout_ms / 1000
@@ -69,13 +341,18 @@ class PostMessageManager:
         except Exception:
             return False
 
-    def _fill_message(self, frame: Frame, message: str):
+    def _fill_message(self, frame: Frame, message: str, capture: bool = True):
         textarea = self._locate_textarea(frame)
         textarea.click()
 
-        # Format XML before filling the textarea
-        formatted_message = self._format_xml_for_textarea(message)
-        textarea.fill(formatted_message)
+        if len(message) >= Settings.app.post_message_fast_fill_chars:
+            # Large payloads: pretty-printing and keystroke-level fill dominate the run time.
+            formatted_message = message.strip()
+            textarea.evaluate(SET_TEXTAREA_VALUE_JS, formatted_message)
+        else:
+            # Format XML before filling the textarea
+            formatted_message = self._format_xml_for_textarea(message)
+            textarea.fill(formatted_message)
 
         # Mirror payload on the right so the ready-state capture includes the XML.
         try:
@@ -83,6 +360,9 @@ class PostMessageManager:
         except Exception:
             pass
 
+        if not capture:
+            return
+
         truncated = (message[:40] + "...") if len(message) > 40 else message
         self.screenshot_mgr.capture(
             self.page,
@@ -90,7 +370,7 @@ class PostMessageManager:
             f"Attempt : {truncated}",
         )
 
-    def _submit_and_capture(self, frame: Frame) -> Dict[str, Any]:
+    def _submit_and_capture(self, frame: Frame, capture_success: bool = True) -> Dict[str, Any]:
         """Submit and wait for response - OPTIMIZED VERSION."""
         send_button = self._locate_send_button(frame)
         
@@ -129,11 +409,13 @@ class PostMessageManager:
             app_log("⚠️ Response wait timed out, continuing with what we have")
 
         # Read response immediately
-        response = self._read_response(frame)
+        response, payload_text, payload_length = self._read_result(frame)
         info = self._interpret_response(response)
-        payload_text = self._read_payload(frame)
-        self._mirror_response_for_capture(frame, response, payload_text)
-        
+        self._mirror_response_for_capture(frame, response, payload_text, payload_length)
+
+        if not info["is_error"] and not capture_success:
+            return info
+
         label = "Success" if not info["is_error"] else "Error"
         self.screenshot_mgr.capture(
             self.page,
@@ -168,12 +450,7 @@ class PostMessageManager:
         if current_value and current_value == prev_snapshot:
             summary = "Post Message already sent; reset the form before reposting."
             app_log(f"⚠️ {summary}")
-            return {
-                "raw": "",
-                "summary": summary,
-                "payload": {},
-                "is_error": True,
-            }
+            return self._error_info(summary)
 
         self._reset_required = False
         self._last_sent_snapshot = None
@@ -265,30 +542,7 @@ class PostMessageManager:
     def _resize_textareas(self, frame: Frame):
         """Resize request/response textareas to use ~95% of viewport height."""
         try:
-            frame.evaluate(
-                """
-                () => {
-                    const viewHeight = window.innerHeight || 900;
-                    const targetHeight = Math.max(320, Math.round(viewHeight * 0.85));
-                    const selectors = [
-                        "textarea[name='dataForm:xmlString']",
-                        "textarea[id='dataForm:xmlString']",
-                        "textarea[name='dataForm:messagePayload']",
-                        "textarea[id='dataForm:messagePayload']",
-                        "textarea[name='dataForm:resultString']",
-                        "textarea[id='dataForm:resultString']",
-                        "textarea[name*='response' i]",
-                        "textarea[id*='response' i]"
-                    ];
-                    document.querySelectorAll(selectors.join(',')).forEach((el) => {
-                        el.style.setProperty('height', `${targetHeight}px`, 'important');
-                        el.style.setProperty('min-height', `${targetHeight}px`, 'important');
-                        el.style.setProperty('max-height', `${targetHeight}px`, 'important');
-                        el.style.setProperty('overflow', 'auto', 'important');
-                    });
-                }
-                """
-            )
+            frame.evaluate(RESIZE_TEXTAREAS_JS)
         except Exception:
             pass
 
@@ -308,111 +562,63 @@ class PostMessageManager:
         except Exception:
             pass
 
-    def _read_response(self, frame: Frame) -> str:
-        """Read response with prioritized selectors - optimized."""
-        self._resize_textareas(frame)
-        
-        # Priority selectors (most specific first)
-        priority_selectors = [
-            "textarea[name='dataForm:resultString']",
-            "textarea[id='dataForm:resultString']",
-            "textarea[name='resultString']",
-        ]
-        
-        for selector in priority_selectors:
-            try:
-                locator = frame.locator(selector).first
-                locator.wait_for(state="visible", timeout=1000)
-                text = locator.input_value().strip()
-                if text:
-                    unescaped = html.unescape(text)
-                    return re.sub(r"\s+", " ", unescaped)
-            except Exception:
-                continue
-        
-        # Fallback selectors
-        fallback_selectors = [
-            "textarea#resultString",
-            "textarea[id*='resultString' i]",
-            "textarea[name*='resultString' i]",
-            "textarea[name*='response' i]",
-            "textarea[id*='response' i]",
-            "pre:visible",
-            "div[class*='response']:visible",
-        ]
-
-        best_text = ""
-        for selector in fallback_selectors:
-            locator = frame.locator(selector).first
-            try:
-                locator.wait_for(state="visible", timeout=800)
-                if selector.startswith("textarea"):
-                    text = locator.input_value().strip()
-                else:
-                    text = locator.inner_text().strip()
-                if text:
-                    unescaped = html.unescape(text)
-                    cleaned = re.sub(r"\s+", " ", unescaped)
-                    if len(cleaned) > len(best_text):
-                        best_text = cleaned
-            except Exception:
-                continue
-        
-        if best_text:
-            return best_text
+    def _read_result(self, frame: Frame) -> Tuple[str, str, int]:
+        """Read (response, payload prefix, payload length) in one evaluate that also resizes the textareas.
 
-        # Final fallback
+        Only priority selectors are remembered (and cleared between posts), so a stale
+        fallback element never outranks the resultString textarea.
+        """
         try:
-            text = frame.locator("body").inner_text()
-            unescaped = html.unescape(text)
-            return re.sub(r"\s+", " ", unescaped.strip())
-        except Exception:
-            return ""
-
-    def _read_payload(self, frame: Frame) -> str:
-        """Read payload with prioritized selectors - optimized."""
-        priority_selectors = [
-            "textarea[name='dataForm:xmlString']",
-            "textarea[id='dataForm:xmlString']",
-            "textarea[name='dataForm:messagePayload']",
-        ]
-        
-        for selector in priority_selectors:
-            try:
-                locator = frame.locator(selector).first
-                locator.wait_for(state="visible", timeout=800)
-                text = locator.input_value().strip()
-                if text:
-                    return text
-            except Exception:
-                continue
-        
-        # Fallback
-        fallback_selectors = [
-            "textarea[id='dataForm:messagePayload']",
-            "textarea[name*='message' i]",
-            "textarea[id*='message' i]",
-        ]
-        
-        for selector in fallback_selectors:
-            locator = frame.locator(selector).first
-            try:
-                locator.wait_for(state="visible", timeout=800)
-                text = locator.input_value().strip()
-                if text:
-                    return text
-            except Exception:
-                continue
-        
-        return ""
-
-    def _mirror_response_for_capture(self, frame: Frame, response_text: str | None, payload_text: str | None):
+            found = frame.evaluate(
+                READ_POST_RESULT_JS,
+                {
+                    "priority": list(self._ordered(RESPONSE_PRIORITY_SELECTORS, self._response_selector)),
+                    "fallback": list(RESPONSE_FALLBACK_SELECTORS),
+                    "payload": list(self._ordered(PAYLOAD_SELECTORS, self._payload_selector)),
+                    "maxChars": OVERLAY_MAX_CHARS,
+                },
+            )
+        except Exception as exc:
+            app_log(f"⚠️ Could not read Post Message fields: {exc}")
+            return "", "", 0
+        if not isinstance(found, dict):
+            return "", "", 0
+
+        response = found.get("response") or {}
+        if response.get("text"):
+            if response.get("selector") in RESPONSE_PRIORITY_SELECTORS:
+                self._response_selector = response["selector"]
+            response_text = response["text"]
+        else:
+            response_text = found.get("body") or ""
+
+        payload = found.get("payload") or {}
+        payload_text = payload.get("text") or ""
+        if payload_text:
+            self._payload_selector = payload.get("selector") or self._payload_selector
+        payload_length = int(payload.get("length") or len(payload_text))
+
+        return re.sub(r"\s+", " ", html.unescape(response_text).strip()), payload_text, payload_length
+
+    @staticmethod
+    def _ordered(selectors: Tuple[str, ...], preferred: str | None) -> Tuple[str, ...]:
+        if preferred and preferred in selectors:
+            return (preferred,) + tuple(s for s in selectors if s != preferred)
+        return selectors
+
+    def _mirror_response_for_capture(
+        self,
+        frame: Frame,
+        response_text: str | None,
+        payload_text: str | None,
+        payload_length: int | None = None,
+    ):
         """Render request payload and full response on right-hand overlays so screenshots capture both."""
         if not Settings.app.show_post_message_overlay:
             return
 
-        response_text = self._format_xml_for_overlay(response_text or "")
-        payload_text = self._format_xml_for_overlay(payload_text or "")
+        response_text = self._overlay_text(response_text or "")
+        payload_text = self._overlay_text(payload_text or "", payload_length)
         try:
             frame.evaluate(
                 """
@@ -460,6 +666,16 @@ class PostMessageManager:
         except Exception:
             pass
 
+    def _overlay_text(self, text: str, total_length: int | None = None) -> str:
+        """Pretty-print overlay text, or truncate it raw when it is too large to render.
+
+        `total_length` is the untruncated size when `text` was already cut down in the page.
+        """
+        total = max(total_length or 0, len(text))
+        if total <= OVERLAY_MAX_CHARS:
+            return self._format_xml_for_overlay(text)
+        return f"{text[:OVERLAY_MAX_CHARS].strip()}\n… truncated ({total:,} chars total)"
+
     def _format_xml_for_textarea(self, text: str) -> str:
         """Pretty-print XML for textarea with proper indentation."""
         if not text:
@@ -508,79 +724,83 @@ class PostMessageManager:
         except Exception:
             return cleaned
 
-    def _interpret_response(self, response_text: str) -> Dict[str, Any]:
-        info = {
-            "raw": response_text or "",
-            "summary": (response_text or "").strip() or "Empty response",
-            "payload": {},
-            "is_error": self._is_error_response(response_text),
-        }
-
-        text = (response_text or "").strip()
-        if text.startswith("<?xml"):
-            try:
-                root = ET.fromstring(text)
-
-                def _get(path: str):
-                    node = root.find(path)
-                    if node is not None and node.text:
-                        return node.text.strip()
-                    return None
-
-                payload = {
-                    "message_type": _get(".//Header/Message_Type"),
-                    "internal_id": _get(".//Header/Internal_Reference_ID"),
-                    "persistent_state": _get(".//Response/Persistent_State"),
-                    "error_type": _get(".//Response/Error_Type"),
-                    "resp_code": _get(".//Response/Resp_Code"),
-                    "exception_details": _get(".//Response/Response_Details/Exception_Details"),
-                    "response_type": _get(".//Application_Advice/Response_Type"),
-                    "ack_code": _get(".//Application_Advice/Application_Ackg_Code"),
-                    "imported_object_type": _get(".//Application_Advice/Imported_Object_Type"),
-                }
-
-                info["payload"] = payload
-                info["is_error"] = self._is_xml_error(payload)
-                info["summary"] = self._format_response_summary(payload)
-            except ET.ParseError:
-                pass
-
-        return info
-
-    def _is_error_response(self, response_text: str) -> bool:
-        normalized = (response_text or "").lower()
-        return any(marker in normalized for marker in self.ERROR_MARKERS)
 
-    def _is_xml_error(self, payload: Dict[str, str]) -> bool:
-        error_type = (payload.get("error_type") or "").strip()
-        resp_code = (payload.get("resp_code") or "").strip()
-        exception = payload.get("exception_details") or ""
-        persistent_state = (payload.get("persistent_state") or "").strip()
-        ack_code = (payload.get("ack_code") or "").strip().upper()
-        response_type = (payload.get("response_type") or "").strip().lower()
-        imported_object = (payload.get("imported_object_type") or "").strip().lower()
-        is_distribution_order = imported_object == "distributionorder"
-
-        codes_ok = error_type in ("", "0") and resp_code in self.SUCCESS_RESP_CODES
-        no_exception = exception.strip() == ""
-        persistent_ok = persistent_state in ("", "0", "1")
-        ack_ok = ack_code in ("TA", "AA", "OK")
-        response_ok = response_type in ("", "confirmation", "accepted")
-        distribution_ok = is_distribution_order and (ack_ok or resp_code in self.SUCCESS_RESP_CODES)
-
-        return not (
-            (codes_ok or ack_ok or response_ok or distribution_ok)
-            and no_exception
-            and persistent_ok
+class HttpPostTransport(PostResponseInterpreter):
+    """Posts integration XML straight to the WMS endpoint, bypassing the Post Message UI."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        concurrency: int = 4,
+        timeout_s: float = 30.0,
+        auth: Tuple[str, str] | None = None,
+        session: requests.Session | None = None,
+    ):
+        if not endpoint:
+            raise ValueError("HttpPostTransport requires an integration endpoint URL")
+        self.endpoint = endpoint
+        self.concurrency = max(1, int(concurrency))
+        self.timeout_s = timeout_s
+        self.session = session or self._build_session(self.concurrency)
+        if auth:
+            self.session.auth = auth
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "HttpPostTransport":
+        app = settings.app
+        user = getattr(app, "integration_user", "")
+        auth = (user, getattr(app, "integration_pass", "") or "") if isinstance(user, str) and user else None
+        return cls(
+            app.integration_endpoint,
+            concurrency=app.integration_concurrency,
+            auth=auth,
         )
 
-    def _format_response_summary(self, payload: Dict[str, str]) -> str:
-        resp_code = payload.get("resp_code") or "n/a"
-        error_type = payload.get("error_type") or "n/a"
-        persistent = payload.get("persistent_state") or "n/a"
-        exception = (payload.get("exception_details") or "").replace("\n", " ").strip()
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "Content-Type": "application/xml; charset=utf-8",
+            "Connection": "keep-alive",
+        })
+        return session
 
-        base = f"RespCode {resp_code}, ErrorType {error_type}, PersistentState {persistent}"
-        if exception:
-            return f"{base}: {exception}"
-        return base
\ No newline at end of file
+    def send_message(self, message: str) -> Tuple[bool, Dict[str, Any]]:
+        if not message:
+            return False, self._error_info("Empty post message payload")
+        try:
+            response = self.session.post(
+                self.endpoint,
+                data=message.encode("utf-8"),
+                timeout=self.timeout_s,
+            )
+        except requests.RequestException as exc:
+            app_log(f"⚠️ Integration POST failed: {exc}")
+            return False, self._error_info(f"Integration POST failed: {exc}")
+
+        text = re.sub(r"\s+", " ", html.unescape(response.text or "")).strip()
+        info = self._interpret_response(text)
+        if response.status_code >= 400:
+            info["is_error"] = True
+            info["summary"] = f"HTTP {response.status_code}: {info['summary'][:200]}"
+        if info["is_error"]:
+            app_log(f"⚠️ Integration POST rejected: {info['summary']}")
+        return not info["is_error"], info
+
+    def send_messages(self, messages: Iterable[str]) -> List[Tuple[bool, Dict[str, Any]]]:
+        """Post messages over the pooled session, up to `concurrency` in flight; order is preserved."""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            return list(pool.map(self.send_message, messages))
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self) -> "HttpPostTransport":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
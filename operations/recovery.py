@@ -0,0 +1,96 @@
+"""
+Session recovery - rebuild the browser session after a connection reset and replay the step.
+
+A reset used to abort every remaining workflow. The supervisor instead asks the service
+factory to reconnect (fresh context, restored session, warehouse re-selected) and re-runs
+the interrupted step with the metadata the workflow had accumulated before it, up to a
+fixed number of recoveries per run.
+
+run_step does not replay post steps: the reset may have come after the message was
+submitted, and a rebuilt payload carries a fresh ASN id, so a replay could post the ASN
+twice. The session is still recovered and the workflow fails, leaving the outcome for
+review. (The stage scheduler's batched posts follow their own rules; see stage_scheduler.)
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Tuple
+
+from config.settings import StepNames
+from core.connection_guard import ConnectionResetDetected
+from core.logger import app_log
+
+
+class SessionRecovery:
+    """Bounded reconnect-and-replay around workflow steps."""
+
+    def __init__(self, reconnect: Callable[[], None], max_recoveries: int = 3):
+        self.reconnect = reconnect
+        self.max_recoveries = max(0, int(max_recoveries))
+        self.recoveries = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.max_recoveries - self.recoveries)
+
+    def recover(self, reason: str) -> bool:
+        """Reconnect, spending one recovery per attempt; False once the budget is gone."""
+        while self.remaining:
+            self.recoveries += 1
+            app_log(
+                f"🔄 Recovering session ({self.recoveries}/{self.max_recoveries}) after: {reason}"
+            )
+            try:
+                self.reconnect()
+            except Exception as exc:
+                reason = str(exc) or exc.__class__.__name__
+                app_log(f"⚠️ Session recovery attempt failed: {reason}")
+                continue
+            app_log("✅ Session recovered")
+            return True
+        app_log(f"❌ Session recovery budget exhausted ({self.max_recoveries} per run)")
+        return False
+
+    def run_step(
+        self,
+        executor: Any,
+        step_name: str,
+        step_data_input: dict[str, Any],
+        metadata: dict[str, Any],
+        workflow_idx: int,
+    ) -> Tuple[dict[str, Any], bool]:
+        """Run one workflow step, replaying it from `metadata` after each recovered reset (post steps excepted)."""
+        while True:
+            try:
+                return executor.run_step(step_name, step_data_input, dict(metadata), workflow_idx)
+            except ConnectionResetDetected as exc:
+                if not self.recover(str(exc)):
+                    raise
+                if self._is_post_step(executor, step_name):
+                    app_log(
+                        f"⛔ Not replaying post step '{step_name}' of workflow {workflow_idx}: "
+                        "it may already have been posted; check the ASN before re-running"
+                    )
+                    return metadata, False
+                app_log(f"🔁 Replaying step '{step_name}' of workflow {workflow_idx}")
+
+    def run_action(self, action: Callable[[], Any], description: str):
+        """Run a session-level action (login, warehouse change) that reconnect() redoes itself.
+
+        After a recovered reset the action is not called again: the reconnect restored the
+        session and re-selected settings.app.change_warehouse.
+        """
+        try:
+            return action()
+        except ConnectionResetDetected as exc:
+            if not self.recover(str(exc)):
+                raise
+            app_log(f"🔁 {description} redone by session recovery")
+            return None
+
+    @staticmethod
+    def _is_post_step(executor: Any, step_name: str) -> bool:
+        names = getattr(getattr(getattr(executor, "settings", None), "app", None), "step_names", None)
+        post_name = getattr(names, "postMessage", None)
+        if not isinstance(post_name, str):
+            post_name = StepNames.postMessage
+        return step_name.lower() == post_name.lower()
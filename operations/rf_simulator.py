@@ -0,0 +1,638 @@
+"""Local RF terminal simulator for offline end-to-end runs and benchmarks.
+
+Serves an ExtJS-like shell with a searchable menu panel that launches an "RF Menu"
+window, the way NavigationManager.open_menu_item expects. A minimal Ext shim
+(WindowManager, ComponentQuery, a menu dataview and store) backs the menu catalog and
+window registry fast paths; ComponentQuery finds no grids. Its uxiframe hosts a small
+server-driven RF terminal: home menu, Ctrl+F search, Recv ASN (ASN, item, qty,
+location, blind iLPN and R-stage prompts), Load Trailer, and error/info screens.
+Element ids match OperationConfig selectors, so RFMenuManager, RFPrimitives,
+ReceiveOperation and LoadingOperation run against it unchanged under headless Chromium:
+
+    python -m operations.rf_simulator --port 8770 --latency-ms 80
+"""
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from urllib.parse import parse_qs, urlparse
+
+from config.operations_config import OperationConfig
+
+MENU = [
+    (OperationConfig.RECEIVE_MENU.name, OperationConfig.RECEIVE_MENU.tran_id, "asn"),
+    (OperationConfig.LOADING_MENU.name, OperationConfig.LOADING_MENU.tran_id, "load"),
+]
+
+# ASN -> item -> receipt line. "flow" picks the prompt shown after quantity entry:
+# "location", "blind_ilpn" or "rstage".
+DEFAULT_DATA = {
+    "asns": {
+        "10000001": {"ITEM-A": {"shipped": 100, "flow": "location", "location": "A-01-01"}},
+        "10000002": {"ITEM-B": {"shipped": 40, "flow": "blind_ilpn", "location": "C-02-03"}},
+        "10000003": {"ITEM-C": {"shipped": 12, "flow": "rstage", "location": ""}},
+    },
+    "shipments": ["SHP0001"],
+}
+
+SHELL_HTML = """<!DOCTYPE html>
+<html><head><title>WM Simulator</title>
+<style>
+body { margin: 0; font-family: sans-serif; background: #dfe8f6; }
+.x-window { position: absolute; top: 20px; left: 20px; width: 420px; height: 560px;
+            border: 1px solid #99bbe8; background: #fff; }
+.x-window-header { padding: 4px 8px; background: #cbddf3; font-weight: bold; }
+.x-tool-close { float: right; cursor: pointer; text-decoration: none; }
+#mps_menu-1000 { left: 60px; height: auto; }
+.x-list-plain { list-style: none; margin: 0; padding: 0; }
+.x-boundlist-item { padding: 4px 8px; cursor: pointer; }
+iframe { border: 0; width: 100%; height: calc(100% - 28px); }
+</style>
+</head><body>
+<a class="x-btn" id="menu-launcher" href="#">Menu</a>
+<div class="x-window" id="mps_menu-1000" style="display: none">
+  <div class="x-window-header"><span class="x-title-text">Menu</span></div>
+  <a class="x-btn" id="menu-show-all" href="#">Show All</a>
+  <input type="text" id="menu-search" autocomplete="off">
+  <ul class="x-list-plain" id="menu-results"></ul>
+</div>
+<div class="x-window" id="rfmenu-window" style="display: none">
+  <div class="x-window-header">
+    <span class="x-title-text">RF Menu (Distribution)</span><a class="x-tool-close" href="#">x</a>
+  </div>
+  <iframe name="uxiframe-1010-iframeEl" src="about:blank"></iframe>
+</div>
+<script>
+(function () {
+    var panel = document.getElementById('mps_menu-1000');
+    var search = document.getElementById('menu-search');
+    var results = document.getElementById('menu-results');
+    var rfWindow = document.getElementById('rfmenu-window');
+
+    // Minimal Ext shim: just enough WindowManager, ComponentQuery and dataview/store API
+    // for the menu catalog, window registry and window-title waits to take their fast paths.
+    var components = {};
+    var registered = [];
+
+    function component(id, xtype, dom, extra) {
+        var cmp = {
+            id: id, xtype: xtype, el: { dom: dom }, rendered: true, isDestroyed: false,
+            getId: function () { return id; },
+            isXType: function (type) { return type === xtype; },
+            isVisible: function () { return dom.style.display !== 'none'; },
+            isHidden: function () { return !cmp.isVisible(); },
+            fireEvent: function () { return true; }
+        };
+        Object.keys(extra || {}).forEach(function (key) { cmp[key] = extra[key]; });
+        components[id] = cmp;
+        return cmp;
+    }
+
+    function ExtWindow(id, dom, title, onClose) {
+        return component(id, 'window', dom, {
+            title: title,
+            getTitle: function () { return title; },
+            show: function () {
+                dom.style.display = 'block';
+                Ext.WindowManager.register(this);
+                return this;
+            },
+            close: function () {
+                dom.style.display = 'none';
+                Ext.WindowManager.unregister(this);
+                if (onClose) onClose();
+            },
+            destroy: function () { this.close(); },
+            toFront: function () { return this; },
+            updateLayout: function () {},
+            getWidth: function () { return dom.offsetWidth; },
+            getHeight: function () { return dom.offsetHeight; },
+            getBox: function () {
+                var rect = dom.getBoundingClientRect();
+                return { x: rect.left, y: rect.top, width: rect.width, height: rect.height };
+            },
+            setHeight: function (height) { dom.style.height = height + 'px'; },
+            setSize: function (width, height) {
+                dom.style.width = width + 'px';
+                dom.style.height = height + 'px';
+            },
+            setPosition: function (x, y) {
+                dom.style.left = x + 'px';
+                dom.style.top = y + 'px';
+            },
+            setPagePosition: function (x, y) { this.setPosition(x, y); }
+        });
+    }
+
+    var menuWindow = ExtWindow('mps_menu-1000', panel, 'Menu');
+    var rfExtWindow = ExtWindow('rfmenu-window', rfWindow, 'RF Menu (Distribution)');
+
+    var launchers = { 'RF Menu (Distribution)': openRf };
+    var records = Object.keys(launchers).map(function (title, idx) {
+        var data = { id: 'menu-rec-' + idx, text: title };
+        return { get: function (field) { return data[field]; }, getId: function () { return data.id; } };
+    });
+    var menuStore = {
+        data: { items: records },
+        getData: function () { return this.data; },
+        getById: function (id) {
+            return records.filter(function (rec) { return rec.getId() === id; })[0] || null;
+        },
+        indexOf: function (rec) { return records.indexOf(rec); },
+        clearFilter: function () {}
+    };
+    component('menu-results', 'dataview', results, {
+        getStore: function () { return menuStore; },
+        getNode: function (rec) {
+            return results.querySelector('[data-recordid="' + rec.getId() + '"]');
+        },
+        getSelectionModel: function () { return { select: function () {} }; },
+        fireEvent: function (name, view, rec) {
+            if (name === 'itemclick') launch(rec.get('text'));
+            return true;
+        }
+    });
+
+    function matches(cmp, selector) {
+        var m = /^(\w+)(?:\[(\w+)(~?=)"?([^"\]]*)"?\])?(\{isVisible\(\)\})?$/.exec(selector);
+        if (!m || !cmp.isXType(m[1])) return false;
+        if (m[2]) {
+            var value = String(cmp[m[2]] || '');
+            if (m[3] === '=' ? value !== m[4] : value.split(/\s+/).indexOf(m[4]) < 0) return false;
+        }
+        return !m[5] || cmp.isVisible();
+    }
+
+    window.Ext = {
+        getCmp: function (id) { return components[id]; },
+        ComponentQuery: {
+            query: function (selector) {
+                return Object.keys(components).map(function (id) { return components[id]; })
+                    .filter(function (cmp) { return matches(cmp, selector); });
+            }
+        },
+        WindowManager: {
+            register: function (win) {
+                if (registered.indexOf(win) < 0) registered.push(win);
+            },
+            unregister: function (win) {
+                var idx = registered.indexOf(win);
+                if (idx >= 0) registered.splice(idx, 1);
+            },
+            getAll: function () { return { items: registered.slice() }; },
+            each: function (fn) { registered.slice().forEach(fn); },
+            getActive: function () {
+                var visible = registered.filter(function (win) { return win.isVisible(); });
+                return visible[visible.length - 1] || null;
+            }
+        }
+    };
+
+    function render() {
+        var term = search.value.trim().toLowerCase();
+        results.innerHTML = '';
+        records.forEach(function (rec) {
+            var title = rec.get('text');
+            if (term && title.toLowerCase().indexOf(term) < 0) return;
+            var li = document.createElement('li');
+            li.className = 'x-boundlist-item';
+            li.textContent = title;
+            li.setAttribute('data-recordid', rec.getId());
+            li.addEventListener('click', function () { launch(title); });
+            results.appendChild(li);
+        });
+    }
+    function launch(title) {
+        // the menu closes on selection and leaves no titles behind for window lookups
+        menuWindow.close();
+        search.value = '';
+        results.innerHTML = '';
+        launchers[title]();
+    }
+    function openRf() {
+        rfExtWindow.show();
+        rfWindow.querySelector('iframe').src = '/RFMenu/key?k=home';
+    }
+    document.getElementById('menu-launcher').addEventListener('click', function (e) {
+        e.preventDefault();
+        menuWindow.show();
+        render();
+    });
+    document.getElementById('menu-show-all').addEventListener('click', function (e) {
+        e.preventDefault();
+        search.value = '';
+        render();
+    });
+    search.addEventListener('input', render);
+    rfWindow.querySelector('.x-tool-close').addEventListener('click', function (e) {
+        e.preventDefault();
+        rfExtWindow.close();
+    });
+})();
+</script>
+</body></html>"""
+
+RF_SCRIPT = """
+document.addEventListener('keydown', function (e) {
+    if (e.ctrlKey && !e.altKey) {
+        var keys = { b: 'home', f: 'search', a: 'accept', p: 'tran' };
+        var key = keys[(e.key || '').toLowerCase()];
+        if (key) {
+            e.preventDefault();
+            window.location.href = '/RFMenu/key?k=' + key;
+        }
+        return;
+    }
+    if (e.key === 'Enter' && e.target && e.target.tagName === 'INPUT') {
+        e.preventDefault();
+        document.getElementById('rf').submit();
+    }
+});
+window.addEventListener('load', function () {
+    var first = document.querySelector('input[type=text]');
+    if (first) first.focus();
+});
+"""
+
+
+class Markup(str):
+    """Trusted HTML fragment rendered without escaping."""
+
+
+@dataclass
+class Screen:
+    title: str
+    lines: list[str] = field(default_factory=list)
+    # (element id, name) pairs for text inputs on this screen
+    inputs: list[tuple[str, str]] = field(default_factory=list)
+    error: bool = False
+
+
+class RFSession:
+    """Server-side RF terminal state for one browser session."""
+
+    def __init__(self, data: dict | None = None):
+        self.data = data or DEFAULT_DATA
+        self.show_tran_id = False
+        self.screen_name = "home"
+        self.asn = ""
+        self.item = ""
+        self.message: tuple[str, str] | None = None  # (kind, text) pending error/info screen
+        self.return_to = "home"
+        self.search_hits: list[tuple[str, str, str]] = []
+        self.received: dict[tuple[str, str], int] = {}
+        self.loaded: list[dict] = []
+        self._lpns = count(1)
+        self.lpn = ""
+
+    # ------------------------------------------------------------------ input
+    def hotkey(self, key: str):
+        if key == "home":
+            self.message = None
+            self.screen_name = "home"
+        elif key == "search":
+            self.message = None
+            self.screen_name = "search"
+        elif key == "tran":
+            self.show_tran_id = not self.show_tran_id
+        elif key == "accept" and self.message:
+            self.message = None
+            self.screen_name = self.return_to
+
+    def submit(self, values: dict[str, str]):
+        if self.message:
+            return
+        handler = getattr(self, f"_submit_{self.screen_name}", None)
+        if handler:
+            handler({k: v.strip() for k, v in values.items()})
+
+    def _fail(self, text: str, kind: str = "error"):
+        self.message = (kind, text)
+        self.return_to = self.screen_name
+
+    def _submit_home(self, values):
+        self._choose(values.get("choice", ""), [(n, t, s) for n, t, s in MENU])
+
+    def _submit_search(self, values):
+        term = values.get("choice", "").lower()
+        self.search_hits = [entry for entry in MENU if term and term in entry[0].lower()]
+        if not self.search_hits:
+            self._fail("Error: No menu option matches search")
+            return
+        self.screen_name = "results"
+
+    def _submit_results(self, values):
+        self._choose(values.get("choice", ""), self.search_hits)
+
+    def _choose(self, choice: str, options: list):
+        if not choice.isdigit() or not 1 <= int(choice) <= len(options):
+            self._fail(f"Error: Invalid option {choice}")
+            return
+        self.screen_name = options[int(choice) - 1][2]
+
+    def _submit_asn(self, values):
+        asn = values.get("shipinpId", "")
+        if asn not in self.data["asns"]:
+            self._fail(f"Error: Invalid ASN {asn}")
+            return
+        self.asn = asn
+        self.screen_name = "item"
+
+    def _line(self) -> dict:
+        return self.data["asns"][self.asn][self.item]
+
+    def _submit_item(self, values):
+        item = values.get("verfiyItemBrcd", "")
+        if item not in self.data["asns"][self.asn]:
+            self._fail(f"Error: Invalid item {item} for ASN")
+            return
+        self.item = item
+        self.lpn = f"{next(self._lpns):08d}"
+        self.screen_name = "qty"
+
+    def _submit_qty(self, values):
+        qty = values.get("input1input2", "")
+        if not qty.isdigit() or int(qty) <= 0:
+            self._fail(f"Error: Invalid quantity {qty}")
+            return
+        key = (self.asn, self.item)
+        self.received[key] = self.received.get(key, 0) + int(qty)
+        flow = self._line().get("flow", "location")
+        self.screen_name = {"blind_ilpn": "blind_ilpn", "rstage": "rstage"}.get(flow, "location")
+
+    def _submit_blind_ilpn(self, values):
+        lpn = values.get("lpninput", "")
+        if not lpn:
+            self._fail("Error: Invalid iLPN")
+            return
+        self.lpn = lpn
+        self.screen_name = "location"
+
+    def _submit_location(self, values):
+        expected = self._line().get("location", "").replace("-", "").upper()
+        entered = values.get("dataForm:locn", "").replace("-", "").upper()
+        if entered != expected:
+            self._fail(f"Error: Invalid location {entered}")
+            return
+        self.screen_name = "item"
+
+    def _submit_rstage(self, values):
+        if not values.get("dataForm:rfexcptrstgip", ""):
+            self._fail("Error: Invalid R-Stage locn")
+            return
+        self.screen_name = "item"
+
+    def _submit_load(self, values):
+        shipment = values.get("barcode20", "")
+        dock_door = values.get("barcode13", "")
+        bol = values.get("barcode32", "")
+        if shipment not in self.data.get("shipments", []):
+            self._fail(f"Error: Invalid shipment {shipment}")
+            return
+        if not dock_door or not bol:
+            self._fail("Error: Dock door and BOL are required")
+            return
+        self.loaded.append({"shipment": shipment, "dock_door": dock_door, "bol": bol})
+        self._fail(f"Info: Shipment {shipment} loaded at {dock_door}", kind="info")
+        self.return_to = "load"
+
+    # ----------------------------------------------------------------- output
+    def screen(self) -> Screen:
+        if self.message:
+            kind, text = self.message
+            title = "Error" if kind == "error" else "Message"
+            return Screen(title, [text, "Ctrl+A to continue"], error=kind == "error")
+        return getattr(self, f"_screen_{self.screen_name}")()
+
+    def _menu_lines(self, options) -> list[str]:
+        lines = []
+        for idx, (name, tran_id, _target) in enumerate(options, 1):
+            suffix = f" #{tran_id}" if self.show_tran_id else ""
+            lines.append(f"{idx} {name}{suffix}")
+        return lines
+
+    def _screen_home(self):
+        return Screen("RF Home", self._menu_lines(MENU) + ["Choice:"], [("choice", "choice")])
+
+    def _screen_search(self):
+        return Screen("Menu Search", ["Search text:"], [("choice", "choice")])
+
+    def _screen_results(self):
+        return Screen("Search Results", self._menu_lines(self.search_hits) + ["Choice:"], [("choice", "choice")])
+
+    def _screen_asn(self):
+        return Screen("Recv ASN", ["Scan ASN:"], [("shipinpId", "shipinpId")])
+
+    def _screen_item(self):
+        return Screen("Recv ASN - Item", [f"ASN: {self.asn}", "Scan Item:"], [("verfiyItemBrcd", "verfiyItemBrcd")])
+
+    def _screen_qty(self):
+        line = self._line()
+        received = self.received.get((self.asn, self.item), 0)
+        return Screen(
+            "Recv ASN - Qty",
+            [
+                f"Item: {self.item}",
+                Markup(f'<div id="dataForm:id_101">Shpd: {line["shipped"]}</div>'),
+                Markup(f'<div id="dataForm:id_133">Rcvd: {received}</div>'),
+                Markup(f'<div id="csid">LPN: {escape(self.lpn)}</div>'),
+                "Qty:",
+            ],
+            [("input1input2", "input1input2")],
+        )
+
+    def _screen_location(self):
+        location = self._line().get("location", "")
+        return Screen(
+            "Recv ASN - Putaway",
+            [Markup(f'ALOC: <span id="dataForm:SBRUdtltxt1_b1">{escape(location)}</span>'), "Scan Location:"],
+            [("dataForm:locn", "dataForm:locn")],
+        )
+
+    def _screen_blind_ilpn(self):
+        return Screen("Recv ASN - Blind iLPN", ["Blind iLPN required", "iLPN#:"], [("lpninput", "lpninput")])
+
+    def _screen_rstage(self):
+        return Screen(
+            "Exception R-Stage",
+            ["No putaway locn found", "R-Stage Locn:"],
+            [("dataForm:rfexcptrstgip", "dataForm:rfexcptrstgip")],
+        )
+
+    def _screen_load(self):
+        return Screen(
+            "Load Trailer",
+            ["Shipment:", "Dock Door:", "BOL:"],
+            [("barcode20", "barcode20"), ("barcode13", "barcode13"), ("barcode32", "barcode32")],
+        )
+
+    def render(self) -> str:
+        screen = self.screen()
+        lines = "".join(
+            f"<div>{line if isinstance(line, Markup) else escape(line)}</div>" for line in screen.lines
+        )
+        inputs = "".join(
+            f'<div><input type="text" id="{escape(el_id)}" name="{escape(name)}" autocomplete="off"></div>'
+            for el_id, name in screen.inputs
+        )
+        body_cls = ' class="error"' if screen.error else ""
+        return (
+            "<!DOCTYPE html><html><head><title>RF</title></head><body>"
+            f"<div class=\"rf-title\">{escape(screen.title)}</div>"
+            f"<div{body_cls}>{lines}</div>"
+            f"<form id=\"rf\" method=\"post\" action=\"/RFMenu/submit\">{inputs}</form>"
+            f"<script>{RF_SCRIPT}</script></body></html>"
+        )
+
+
+class RFSimulatorServer:
+    """Threaded HTTP server hosting the simulated WM shell and RF terminal."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: int = 0, data: dict | None = None):
+        self.latency_ms = latency_ms
+        self.data = data or DEFAULT_DATA
+        self.sessions: dict[str, RFSession] = {}
+        self._lock = threading.Lock()
+        self._ids = count(1)
+        self._thread: threading.Thread | None = None
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def session(self, sid: str | None) -> tuple[str, RFSession]:
+        with self._lock:
+            if not sid or sid not in self.sessions:
+                sid = f"rf{next(self._ids)}"
+                self.sessions[sid] = RFSession(self.data)
+            return sid, self.sessions[sid]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path in ("/", "/index.html"):
+                    self._send(SHELL_HTML)
+                    return
+                sid, session = self._session()
+                if parsed.path == "/RFMenu/key":
+                    key = parse_qs(parsed.query).get("k", [""])[0]
+                    with server._lock:
+                        session.hotkey(key)
+                    self._redirect(sid)
+                    return
+                if parsed.path == "/RFMenu/screen":
+                    server._delay()
+                    with server._lock:
+                        html = session.render()
+                    self._send(html, sid)
+                    return
+                self.send_error(404)
+
+            def do_POST(self):
+                if urlparse(self.path).path != "/RFMenu/submit":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode("utf-8", errors="replace"), keep_blank_values=True)
+                sid, session = self._session()
+                with server._lock:
+                    session.submit({k: v[0] for k, v in form.items()})
+                self._redirect(sid)
+
+            def _session(self):
+                cookie = SimpleCookie(self.headers.get("Cookie") or "")
+                morsel = cookie.get("rfsid")
+                return server.session(morsel.value if morsel else None)
+
+            def _redirect(self, sid: str):
+                self.send_response(303)
+                self.send_header("Location", "/RFMenu/screen")
+                self.send_header("Set-Cookie", f"rfsid={sid}; Path=/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def _send(self, html: str, sid: str | None = None):
+                body = html.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                if sid:
+                    self.send_header("Set-Cookie", f"rfsid={sid}; Path=/")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                return
+
+        return Handler
+
+    def _delay(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def start(self) -> "RFSimulatorServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until shutdown (Ctrl+C from the CLI)."""
+        self._httpd.serve_forever()
+
+    def close(self):
+        """Release the listening socket."""
+        self._httpd.server_close()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self.close()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "RFSimulatorServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline RF terminal simulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--data", help="JSON file with 'asns' and 'shipments' (defaults to built-in data)")
+    args = parser.parse_args()
+
+    data = None
+    if args.data:
+        with open(args.data, encoding="utf-8") as fh:
+            data = json.load(fh)
+
+    server = RFSimulatorServer(args.host, args.port, args.latency_ms, data)
+    print(f"RF simulator listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,26 @@
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Generator
+from typing import Any, Generator, Iterable
 
 from core.browser import BrowserManager
-from core.connection_guard import ConnectionResetGuard
+from core.connection_guard import ConnectionResetDetected, ConnectionResetGuard, PostBatchInterrupted
+from core.detour import DetourWindowCache
+from core.detour_worker import DetourWorker
 from core.logger import app_log
 from core.orchestrator import AutomationOrchestrator
 from core.page_manager import PageManager
+from core.post_payload_prefetch import PostPayloadPrefetcher
+from core.state_metrics import PlaywrightCallCounter, StateLatencyStats
 from core.screenshot import ScreenshotManager
+from operations.inbound.ilpn_filter_helper import TabImageStitcher
 from operations.inbound.receive import ReceiveOperation
+from operations.recovery import SessionRecovery
 from operations.outbound.loading import LoadingOperation
 from operations.step_execution import StepExecution
 from operations.workflow import WorkflowStageExecutor
 from ui.auth import AuthManager
 from ui.navigation import NavigationManager
-from operations.post_message import PostMessageManager
+from operations.post_message import HttpPostTransport, PostMessageManager
 from ui.rf_menu import RFMenuManager
 
 
@@ -25,6 +31,8 @@ class OperationServices:
     orchestrator: AutomationOrchestrator
     step_execution: StepExecution
     executor: WorkflowStageExecutor
+    recovery: SessionRecovery | None = None
+    prefetcher: PostPayloadPrefetcher | None = None
 
 
 class OperationRunner:
@@ -39,6 +47,7 @@ class OperationRunner:
         detour_page: Any,
         rf_menu: RFMenuManager,
         conn_guard: ConnectionResetGuard,
+        state_latency: StateLatencyStats | None = None,
     ):
         self.settings = settings
         self.page = page
@@ -50,8 +59,11 @@ class OperationRunner:
         self.detour_nav = (
             NavigationManager(detour_page, screenshot_mgr) if detour_page else None
         )
+        self.detour_windows = DetourWindowCache(detour_page) if detour_page else None
+        self.detour_worker: DetourWorker | None = None
         self.rf_menu = rf_menu
         self.conn_guard = conn_guard
+        self.state_latency = state_latency
 
         # Use the guard's decorator factory for cleaner binding
         self.run_receive = conn_guard.guarded(self._receive_impl)
@@ -59,13 +71,31 @@ class OperationRunner:
         self.run_login = conn_guard.guarded(self._run_login)
         self.run_change_warehouse = conn_guard.guarded(self._run_change_warehouse)
         self.run_post_message = conn_guard.guarded(self._post_impl)
+        self.run_post_messages = self._post_batch_impl  # checks the guard after every message
         self.run_open_ui = conn_guard.guarded(self._run_open_ui)
+        self.run_restore_session = conn_guard.guarded(self._restore_session)
 
     def _run_login(self) -> None:
         self.auth_mgr.login()
 
+    def _restore_session(self) -> None:
+        self.auth_mgr.restore_session()
+        self._run_change_warehouse()
+
     def _run_change_warehouse(self) -> None:
         self.nav_mgr.change_warehouse(self.settings.app.change_warehouse)
+        if self.detour_nav and self._detour_page_loaded():  # a fresh detour page picks it up on load
+            try:
+                self.detour_nav.change_warehouse(self.settings.app.change_warehouse, onDemand=False)
+            except Exception as exc:
+                app_log(f"⚠️ Could not switch the detour page's warehouse: {exc}")
+
+    def _detour_page_loaded(self) -> bool:
+        try:
+            url = self.detour_page.url
+        except Exception:
+            return False
+        return isinstance(url, str) and url not in ("", "about:blank") and "chrome-error" not in url
 
     def _receive_impl(
         self,
@@ -86,6 +116,9 @@ class OperationRunner:
             detour_page=detour_page,
             detour_nav=detour_nav,
             settings=self.settings,
+            detour_windows=self.detour_windows,
+            detour_worker=self._get_detour_worker(),
+            state_latency=self.state_latency,
         )
         return receive_op.execute(
             asn,
@@ -108,6 +141,8 @@ class OperationRunner:
         return load_op.execute(shipment, dock_door, bol)
 
     def _post_impl(self, payload: str | None = None) -> bool:
+        if self._uses_http_transport():
+            return self._post_batch_impl([payload or self.settings.app.post_message_text])[0]
         self.nav_mgr.open_menu_item("POST", "Post Message (Integration)")
         try:
             self.nav_mgr.maximize_non_rf_windows()
@@ -132,6 +167,43 @@ class OperationRunner:
         )
         return success
 
+    def _post_batch_impl(self, payloads: Iterable[str]) -> list[bool]:
+        """Post several payloads through a single Post Message window (or the HTTP transport).
+
+        A connection reset stops the batch at once: PostBatchInterrupted carries the outcomes
+        read before it, so callers replay only the posts that were not accepted.
+        """
+        self.conn_guard.ensure_ok()
+        results: list[tuple[bool, dict[str, Any]]] = []
+        try:
+            if self._uses_http_transport():
+                with HttpPostTransport.from_settings(self.settings) as transport:
+                    results = transport.send_messages(payloads)
+            else:
+                self.nav_mgr.open_menu_item("POST", "Post Message (Integration)")
+                try:
+                    self.nav_mgr.maximize_non_rf_windows()
+                except Exception:
+                    pass
+                post_message_mgr = PostMessageManager(self.page, self.screenshot_mgr)
+                for outcome in post_message_mgr.iter_send_messages(payloads):
+                    results.append(outcome)
+                    self.conn_guard.ensure_ok()
+        except Exception as exc:
+            try:
+                self.conn_guard.ensure_ok()
+            except ConnectionResetDetected as reset:
+                raise PostBatchInterrupted(str(reset), [success for success, _ in results]) from exc
+            raise
+        for index, (success, response_info) in enumerate(results, 1):
+            app_log(f"Response summary #{index}: {response_info['summary']}")
+            if not success:
+                app_log(f"⚠️ Post Message #{index} failed.")
+        return [success for success, _ in results]
+
+    def _uses_http_transport(self) -> bool:
+        return self.settings.app.post_message_transport == "http"
+
     def _run_open_ui(self, search_term: str, match_text: str) -> bool:
         """Open a UI window by search term and match text."""
         succeeded = self.nav_mgr.open_menu_item(search_term, match_text)
@@ -139,6 +211,44 @@ class OperationRunner:
             app_log(f"❌ UI navigation failed for '{match_text}'")
         return succeeded
 
+    def _get_detour_worker(self) -> DetourWorker | None:
+        """Start the background detour worker once per session when async detours are enabled."""
+        if self.settings.app.async_detours is not True:
+            return None
+        if self.detour_worker and self.detour_worker.is_alive():
+            return self.detour_worker
+        try:
+            self.detour_worker = DetourWorker(
+                self.settings,
+                storage_state=self.page.context.storage_state(),
+                app_url=self.page.url,
+            ).start()
+        except Exception as exc:
+            app_log(f"⚠️ Could not start detour worker, running detours inline: {exc}")
+            self.detour_worker = None
+        return self.detour_worker
+
+    def join_detours(self) -> bool:
+        """Wait for queued background detours and report whether they all succeeded."""
+        if not self.detour_worker:
+            return True
+        return self._report_detours(self.detour_worker.drain())
+
+    def close_detours(self):
+        """Stop the detour worker (reporting anything it still finishes); the next detour starts a fresh one."""
+        if self.detour_worker:
+            self._report_detours(self.detour_worker.close())
+            self.detour_worker = None
+
+    @staticmethod
+    def _report_detours(results) -> bool:
+        failed = [r for r in results if not r.success]
+        for result in failed:
+            app_log(f"❌ Background detour failed ({result.label}): {result.error or 'see detour log'}")
+        if results:
+            app_log(f"🧭 Background detours: {len(results) - len(failed)}/{len(results)} succeeded")
+        return not failed
+
     def _get_detour_resources(self):
         """Create detour page/nav once and reuse for all detours."""
         if self.detour_page and self.detour_nav:
@@ -152,12 +262,71 @@ class OperationRunner:
         except Exception:
             self.detour_page = None
             self.detour_nav = None
+            self.detour_windows = None
             return None, None
         self.detour_page = new_page
         self.detour_nav = NavigationManager(new_page, self.screenshot_mgr)
+        self.detour_windows = DetourWindowCache(new_page)
         return self.detour_page, self.detour_nav
 
 
+def _build_runner(
+    settings: Any,
+    page: Any,
+    screenshot_mgr: ScreenshotManager,
+    state_latency: StateLatencyStats,
+) -> OperationRunner:
+    """Create the page-bound managers and the runner that uses them."""
+    # Page manager (injects click highlighter, disables animations)
+    page_mgr = PageManager(page)
+
+    # Auth manager (handles login)
+    auth_mgr = AuthManager(page, screenshot_mgr, settings)
+    detour_page = None
+
+    # Navigation manager (menu search, window management)
+    nav_mgr = NavigationManager(page, screenshot_mgr)
+
+    # RF menu manager (RF terminal interactions)
+    rf_menu = RFMenuManager(
+        page,
+        page_mgr,
+        screenshot_mgr,
+        verbose_logging=settings.app.rf_verbose_logging,
+        auto_click_info_icon=settings.app.auto_click_info_icon,
+        show_tran_id=settings.app.show_tran_id,
+    )
+
+    # Connection guard (detects if browser loses connection)
+    conn_guard = ConnectionResetGuard(page, screenshot_mgr)
+
+    return OperationRunner(
+        settings,
+        page,
+        page_mgr,
+        screenshot_mgr,
+        auth_mgr,
+        nav_mgr,
+        detour_page,
+        rf_menu,
+        conn_guard,
+        state_latency=state_latency,
+    )
+
+
+def _bind_steps(step_execution: StepExecution, runner: OperationRunner):
+    """Point an existing StepExecution at a (re)built runner."""
+    step_execution.run_login = runner.run_login
+    step_execution.run_change_warehouse = runner.run_change_warehouse
+    step_execution.run_post_message = runner.run_post_message
+    step_execution.run_post_messages = runner.run_post_messages
+    step_execution.run_receive = runner.run_receive
+    step_execution.run_loading = runner.run_loading
+    step_execution.run_open_ui = runner.run_open_ui
+    step_execution.join_detours = runner.join_detours
+    step_execution.close_detours = runner.close_detours
+
+
 @contextmanager
 def create_operation_services(settings: Any) -> Generator[OperationServices, None, None]:
     # 1. Create browser
@@ -171,48 +340,16 @@ def create_operation_services(settings: Any) -> Generator[OperationServices, Non
             settings.browser.screenshot_dir,
             image_format=settings.browser.screenshot_format,
             image_quality=settings.browser.screenshot_quality,
+            capture_level=getattr(settings.browser, "capture_level", "all"),
         )
 
-        # 4. Create page manager (injects click highlighter, disables animations)
-        page_mgr = PageManager(page)
-
-        # 5. Create auth manager (handles login)
-        auth_mgr = AuthManager(page, screenshot_mgr, settings)
-        detour_page = None
-
-        # 6. Create navigation manager (menu search, window management)
-        nav_mgr = NavigationManager(page, screenshot_mgr)
-
-        # 7. Create RF menu manager (RF terminal interactions)
-        rf_menu = RFMenuManager(
-            page,
-            page_mgr,
-            screenshot_mgr,
-            verbose_logging=settings.app.rf_verbose_logging,
-            auto_click_info_icon=settings.app.auto_click_info_icon,
-            show_tran_id=settings.app.show_tran_id,
-        )
-
-        # 7. Create connection guard (detects if browser loses connection)
-        conn_guard = ConnectionResetGuard(page, screenshot_mgr)
-
-         # 8. Create orchestrator (retry logic, result tracking)
+        # 4. Create orchestrator (retry logic, result tracking)
         orchestrator = AutomationOrchestrator(settings)
 
-        # 9. Create the operation runner that ties it all together
-        runner = OperationRunner(
-            settings,
-            page,
-            page_mgr,
-            screenshot_mgr,
-            auth_mgr,
-            nav_mgr,
-            detour_page,
-            rf_menu,
-            conn_guard,
-        )
+        # 5. Create the page-bound managers and the runner that ties them together
+        runner = _build_runner(settings, page, screenshot_mgr, orchestrator.state_latency)
 
-        # 10. Create step execution wrapper
+        # 6. Create step execution wrapper
         step_execution = StepExecution(
             run_login=runner.run_login,
             run_change_warehouse=runner.run_change_warehouse,
@@ -220,17 +357,57 @@ def create_operation_services(settings: Any) -> Generator[OperationServices, Non
             run_receive=runner.run_receive,
             run_loading=runner.run_loading,
             run_open_ui=runner.run_open_ui,
+            join_detours=runner.join_detours,
+            close_detours=runner.close_detours,
+            run_post_messages=runner.run_post_messages,
         )
 
-        # 11. Create workflow stage executor
-        executor = WorkflowStageExecutor(settings, orchestrator, step_execution)
+        # 7. Create workflow stage executor
+        prefetch_depth = getattr(settings.app, "post_prefetch_depth", 0)
+        prefetcher = (
+            PostPayloadPrefetcher(settings, prefetch_depth)
+            if isinstance(prefetch_depth, int) and prefetch_depth > 0 else None
+        )
+        executor = WorkflowStageExecutor(settings, orchestrator, step_execution, prefetcher)
+
+        def reconnect():
+            """Swap in a fresh context/page seeded with the old session, then log back in."""
+            nonlocal runner
+            runner.close_detours()
+            old_context = runner.page.context
+            try:
+                storage_state = old_context.storage_state()
+            except Exception:
+                storage_state = None
+            try:
+                old_context.close()
+            except Exception:
+                pass
+            browser_mgr.context = browser_mgr.new_context(storage_state=storage_state)
+            runner = _build_runner(
+                settings,
+                browser_mgr.context.new_page(),
+                screenshot_mgr,
+                orchestrator.state_latency,
+            )
+            _bind_steps(step_execution, runner)
+            services.nav_mgr = runner.nav_mgr
+            runner.run_restore_session()
 
-        # 12. Package everything into a services object
+        # 8. Package everything into a services object
         services = OperationServices(
             screenshot_mgr=screenshot_mgr,
-            nav_mgr=nav_mgr,
+            nav_mgr=runner.nav_mgr,
             orchestrator=orchestrator,
             step_execution=step_execution,
             executor=executor,
+            recovery=SessionRecovery(reconnect, settings.app.max_session_recoveries),
+            prefetcher=prefetcher,
         )
-        yield services
+        PlaywrightCallCounter.install()
+        try:
+            yield services
+        finally:
+            runner.close_detours()
+            TabImageStitcher.close()  # let queued combined-tab screenshots finish writing
+            PlaywrightCallCounter.uninstall()
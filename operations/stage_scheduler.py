@@ -0,0 +1,295 @@
+"""
+Stage scheduler - run workflow steps as a dependency graph instead of workflow by workflow.
+
+Workflows are taken in waves. Inside a wave every step is a node that waits only for the
+earlier steps of its own workflow whose output it needs (STAGE_DEPENDENCIES: a receive
+needs its post's asn_id / receive_items). Ready nodes are run by resource:
+
+- post: every ready post step in the wave is built on a pool of `db_concurrency` threads
+  (object lookup, XML fetch, customization) and sent through one Post Message window;
+- rf: receives, loading and UI detours drive the session's page, so they run one at a
+  time on the session thread, lowest workflow first.
+
+A failed step halts its workflow (its remaining steps are skipped), as in run_workflow.
+
+A batch entry that was not accepted is re-sent on its own through run_with_retry. An
+"unknown" outcome (the reply was lost, not rejected) may therefore post the same ASN twice.
+Payload builds open their DB connections concurrently; DB.connect serializes them until
+the JVM has started.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from config.settings import StepNames
+from core.checkpoint import CheckpointStore
+from core.connection_guard import ConnectionResetDetected, PostBatchInterrupted
+from core.logger import app_log
+from core.orchestrator import WorkflowResult
+from operations.recovery import SessionRecovery
+
+RESOURCE_POST = "post"
+RESOURCE_RF = "rf"
+
+PENDING, DONE, FAILED, SKIPPED = "pending", "done", "failed", "skipped"
+
+# StepNames attribute -> earlier stages of the same workflow it needs
+STAGE_DEPENDENCIES = {
+    "postMessage": (),
+    "runReceiving": ("postMessage",),  # asn_id / receive_items
+    "runLoading": ("runReceiving",),
+    "OpenIlpnUi": ("runReceiving",),
+    "OpenTasksUi": ("runReceiving",),
+}
+
+
+@dataclass
+class StageNode:
+    """One workflow step in the wave's graph."""
+    step_index: int
+    step_name: str
+    step_data: Any
+    resource: str
+    depends_on: tuple[int, ...] = ()  # step indexes in the same workflow
+    state: str = PENDING
+
+
+@dataclass
+class _WorkflowRun:
+    index: int
+    name: str
+    steps: dict[str, Any]
+    nodes: list[StageNode]
+    result: WorkflowResult
+    metadata: dict[str, Any] = field(default_factory=dict)
+    started: float = field(default_factory=time.monotonic)
+
+
+def plan_stages(steps: dict[str, Any], step_names: StepNames | None = None) -> list[StageNode]:
+    """Graph nodes for one workflow; unknown stages wait for every earlier step."""
+    names = step_names or StepNames()
+    needs = {
+        getattr(names, attr).lower(): {getattr(names, dep).lower() for dep in deps}
+        for attr, deps in STAGE_DEPENDENCIES.items()
+    }
+    post_stage = names.postMessage.lower()
+
+    nodes: list[StageNode] = []
+    for step_index, (step_name, step_data) in enumerate(steps.items(), 1):
+        key = step_name.lower()
+        earlier = nodes if key not in needs else [n for n in nodes if n.step_name.lower() in needs[key]]
+        nodes.append(StageNode(
+            step_index,
+            step_name,
+            step_data,
+            RESOURCE_POST if key == post_stage else RESOURCE_RF,
+            tuple(n.step_index for n in earlier),
+        ))
+    return nodes
+
+
+class StageScheduler:
+    """Wave-by-wave DAG runner with batched posts and serialized RF stages."""
+
+    def __init__(
+        self,
+        executor: Any,
+        *,
+        screenshot_mgr: Any = None,
+        recovery: SessionRecovery | None = None,
+        checkpoints: CheckpointStore | None = None,
+        wave_size: int = 25,
+        db_concurrency: int = 4,
+    ):
+        self.executor = executor
+        self.screenshot_mgr = screenshot_mgr
+        self.recovery = recovery
+        self.checkpoints = checkpoints
+        self.wave_size = max(1, int(wave_size))
+        self.db_concurrency = max(1, int(db_concurrency))
+        self.step_names = executor.settings.app.step_names
+
+    @classmethod
+    def for_services(cls, settings: Any, wmOps: Any, checkpoints: CheckpointStore | None = None) -> "StageScheduler":
+        recovery = getattr(wmOps, "recovery", None)
+        return cls(
+            wmOps.executor,
+            screenshot_mgr=wmOps.screenshot_mgr,
+            recovery=recovery if isinstance(recovery, SessionRecovery) else None,
+            checkpoints=checkpoints,
+            wave_size=settings.app.scheduler_wave_size,
+            db_concurrency=settings.app.scheduler_db_concurrency,
+        )
+
+    def run(self, jobs: Iterable[tuple[int, str, dict[str, Any]]]) -> Iterator[WorkflowResult]:
+        """Run (index, name, steps) jobs wave by wave, yielding each wave's results."""
+        source = iter(jobs)
+        while wave := list(islice(source, self.wave_size)):
+            app_log(f"🗓️ Scheduling wave of {len(wave)} workflows (#{wave[0][0]}-#{wave[-1][0]})")
+            yield from self._run_wave(wave)
+
+    # ------------------------------------------------------------------ wave
+
+    def _run_wave(self, wave: list[tuple[int, str, dict[str, Any]]]) -> list[WorkflowResult]:
+        runs = [self._plan(index, name, steps) for index, name, steps in wave]
+        while True:
+            ready = [(run, node) for run in runs for node in self._ready(run)]
+            posts = [(run, node) for run, node in ready if node.resource == RESOURCE_POST]
+            if posts:
+                self._run_posts(posts)
+            elif ready:
+                self._run_rf(*ready[0])
+            else:
+                break
+
+        if self.screenshot_mgr is not None:
+            self.screenshot_mgr.set_scenario(None)
+        detours_ok = self.executor.step_execution.join_detours()
+        for run in runs:
+            if not detours_ok and run.result.status == "passed":
+                run.result.status, run.result.error = "failed", "background detours failed"
+            run.result.duration_s = round(time.monotonic() - run.started, 3)
+        return [run.result for run in runs]
+
+    def _plan(self, index: int, name: str, steps: dict[str, Any]) -> _WorkflowRun:
+        run = _WorkflowRun(index, name, steps, plan_stages(steps, self.step_names), WorkflowResult(index, name, "passed"))
+        if self.checkpoints is not None:
+            completed, run.metadata = self.checkpoints.resume_point(index, name, steps)
+            for node in run.nodes[:completed]:
+                node.state = DONE
+            run.result.completed_steps = completed
+            if steps and completed == len(steps):
+                run.result.status = "skipped"
+        return run
+
+    @staticmethod
+    def _ready(run: _WorkflowRun) -> list[StageNode]:
+        done = {node.step_index for node in run.nodes if node.state == DONE}
+        return [
+            node for node in run.nodes
+            if node.state == PENDING and all(dep in done for dep in node.depends_on)
+        ]
+
+    def _complete(self, run: _WorkflowRun, node: StageNode):
+        node.state = DONE
+        run.result.completed_steps = sum(1 for n in run.nodes if n.state == DONE)
+        if self.checkpoints is not None:
+            self.checkpoints.record_step(
+                run.index, run.name, node.step_index, node.step_name, node.step_data, run.metadata
+            )
+
+    @staticmethod
+    def _fail(run: _WorkflowRun, node: StageNode, error: str | None = None):
+        node.state = FAILED
+        run.result.status, run.result.failed_step = "failed", node.step_name
+        run.result.error = error
+        for other in run.nodes:
+            if other.state == PENDING:
+                other.state = SKIPPED
+
+    # ------------------------------------------------------------------ rf
+
+    def _run_rf(self, run: _WorkflowRun, node: StageNode):
+        if self.screenshot_mgr is not None:
+            self.screenshot_mgr.set_scenario(run.name)
+            self.screenshot_mgr.set_stage(node.step_name)
+        if self.recovery is not None:
+            metadata, ok = self.recovery.run_step(
+                self.executor, node.step_name, node.step_data, run.metadata, run.index
+            )
+        else:
+            metadata, ok = self.executor.run_step(node.step_name, node.step_data, run.metadata, run.index)
+        run.metadata = metadata
+        if ok:
+            self._complete(run, node)
+        else:
+            self._fail(run, node)
+
+    # ------------------------------------------------------------------ post
+
+    def _run_posts(self, posts: list[tuple[_WorkflowRun, StageNode]]):
+        to_send = []
+        for run, node in posts:
+            data = node.step_data if isinstance(node.step_data, dict) else {}
+            if not data.get("enabled"):
+                self._complete(run, node)
+            elif not data.get("type"):
+                app_log(f"❌ Post workflow {run.index} missing 'type'; halting.")
+                self._fail(run, node, "post step missing 'type'")
+            elif not self.executor.confirm_prod_post(run.index):
+                self._fail(run, node, "PROD post not confirmed")
+            else:
+                to_send.append((run, node))
+        if not to_send:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.db_concurrency, thread_name_prefix="post-build") as pool:
+            resolved = list(pool.map(self._resolve_payload, to_send))
+
+        batch = []
+        for (run, node), (payload, payload_metadata) in zip(to_send, resolved):
+            if payload:
+                batch.append((run, node, payload, payload_metadata))
+            else:
+                app_log(f"❌ Unable to resolve post message payload for workflow {run.index}; halting.")
+                self._fail(run, node, "post payload unavailable")
+        if not batch:
+            return
+
+        if self.screenshot_mgr is not None:
+            self.screenshot_mgr.set_scenario(None)
+            self.screenshot_mgr.set_stage(self.step_names.postMessage)
+        app_log(f"📨 Posting {len(batch)} messages through one Post Message window")
+        try:
+            self._send_and_settle(batch)
+        except ConnectionResetDetected as exc:
+            if self.recovery is None or not self.recovery.recover(str(exc)):
+                raise
+            # Accepted posts are already DONE; the unsent or unknown ones stay pending and are
+            # rebuilt and re-sent on the next pass, like a replayed post step.
+            pending = sum(1 for _, node, _, _ in batch if node.state == PENDING)
+            app_log(f"🔁 Replaying {pending} batched posts after session recovery")
+
+    def _send_and_settle(self, batch: list[tuple[_WorkflowRun, StageNode, str, dict[str, Any]]]):
+        try:
+            sent = self._send_batch([payload for _, _, payload, _ in batch])
+        except PostBatchInterrupted as exc:
+            for (run, node, _, payload_metadata), ok in zip(batch, exc.sent):
+                if ok:
+                    self._accept(run, node, payload_metadata)
+            raise
+
+        for (run, node, payload, payload_metadata), ok in zip(batch, sent):
+            if not ok:
+                ok = self.executor.orchestrator.run_with_retry(
+                    lambda payload=payload: self.executor.step_execution.run_post_message(payload),
+                    f"Post Message (Workflow {run.index})",
+                ).success
+            if ok:
+                self._accept(run, node, payload_metadata)
+            else:
+                app_log(f"⏹️ Halting workflow {run.index} due to post message failure")
+                self._fail(run, node, "post message failed")
+
+    def _accept(self, run: _WorkflowRun, node: StageNode, payload_metadata: dict[str, Any]):
+        run.metadata.update(payload_metadata)
+        self._complete(run, node)
+
+    def _resolve_payload(self, item: tuple[_WorkflowRun, StageNode]) -> tuple[str | None, dict[str, Any]]:
+        run, node = item
+        try:
+            return self.executor.resolve_post_payload(node.step_data, run.index)
+        except Exception as exc:
+            app_log(f"⚠️ Building post payload for workflow {run.index} failed: {exc}")
+            return None, {}
+
+    def _send_batch(self, payloads: list[str]) -> list[bool]:
+        send_many = self.executor.step_execution.run_post_messages
+        if send_many is None:
+            return [False] * len(payloads)  # no batch path: each post goes through the single-post retry
+        sent = list(send_many(payloads))
+        return sent + [False] * (len(payloads) - len(sent))
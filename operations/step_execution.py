@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
 
 
 @dataclass
@@ -10,3 +10,6 @@ class StepExecution:
     run_receive: Callable[..., bool]
     run_loading: Callable[..., bool]
     run_open_ui: Callable[..., bool]
+    join_detours: Callable[[], bool] = lambda: True
+    close_detours: Callable[[], None] = lambda: None
+    run_post_messages: Callable[[Iterable[str]], list[bool]] | None = None
@@ -3,6 +3,7 @@ from typing import Any, Sequence, Tuple
 from core.logger import app_log
 from core.orchestrator import AutomationOrchestrator
 from core.post_message_payload import build_post_message_payload
+from core.post_payload_prefetch import PostPayloadPrefetcher
 from config.settings import Settings
 from operations.step_execution import StepExecution
 
@@ -13,10 +14,12 @@ class WorkflowStageExecutor:
         settings: Settings,
         orchestrator: AutomationOrchestrator,
         step_execution: StepExecution,
+        prefetcher: PostPayloadPrefetcher | None = None,
     ):
         self.settings = settings
         self.orchestrator = orchestrator
         self.step_execution = step_execution
+        self.prefetcher = prefetcher
         step_names = self.settings.app.step_names
         self.step_handlers = {
             step_names.postMessage.lower(): self.handle_post_step,
@@ -26,9 +29,19 @@ class WorkflowStageExecutor:
             step_names.OpenIlpnUi.lower(): self.handle_ilpns_step,
         }
 
-    def _confirm_prod_post(self, workflow_index: int) -> bool:
+    def confirm_prod_post(self, workflow_index: int) -> bool:
         if not self.settings.app.requires_prod_confirmation:
             return True
+        token = getattr(self.settings.app, "prod_confirmation_token", "") or ""
+        if isinstance(token, str) and token.strip().upper() == "PROD":
+            app_log(f"✅ Workflow {workflow_index}: PROD post pre-authorized by token.")
+            return True
+        if getattr(self.settings.app, "interactive", True) is False:
+            app_log(
+                f"❌ Workflow {workflow_index}: PROD post needs a confirmation token in "
+                "non-interactive mode; aborting PROD post."
+            )
+            return False
         app_log(f"⚠️ Workflow {workflow_index}: about to send a PROD post message.")
         first = input("Type PROD to continue: ").strip().upper()
         if first != "PROD":
@@ -46,27 +59,12 @@ class WorkflowStageExecutor:
     ) -> Tuple[dict[str, Any], bool]:
         if not bool(step_data_input.get("enabled")):
             return metadata, True
-        post_type = step_data_input.get("type")
-        if not post_type:
+        if not step_data_input.get("type"):
             app_log(f"❌ Post workflow {workflow_idx} missing 'type'; halting.")
             return metadata, False
-        source = (step_data_input.get("source") or "db").lower()
-        db_env = step_data_input.get("db_env")
-        if not self._confirm_prod_post(workflow_idx):
+        if not self.confirm_prod_post(workflow_idx):
             return metadata, False
-        payload_metadata: dict[str, Any] = {}
-        message_payload = None
-        if source == "db":
-            message_payload, payload_metadata = build_post_message_payload(
-                step_data_input,
-                post_type,
-                self.settings.app.change_warehouse,
-                db_env,
-            )
-        else:
-            message_payload = (
-                step_data_input.get("message") or self.settings.app.post_message_text
-            )
+        message_payload, payload_metadata = self.resolve_post_payload(step_data_input, workflow_idx)
         if not message_payload:
             app_log(
                 f"❌ Unable to resolve post message payload for workflow {workflow_idx}; halting."
@@ -84,6 +82,28 @@ class WorkflowStageExecutor:
         metadata.update(payload_metadata)
         return metadata, True
 
+    def resolve_post_payload(
+        self, step_data_input: dict[str, Any], workflow_idx: int
+    ) -> Tuple[str | None, dict[str, Any]]:
+        """Message payload and metadata for a post step: prefetched, built from the DB, or configured."""
+        source = (step_data_input.get("source") or "db").lower()
+        if source != "db":
+            return step_data_input.get("message") or self.settings.app.post_message_text, {}
+        facility = self.settings.app.change_warehouse
+        prefetched = (
+            self.prefetcher.take(workflow_idx, step_data_input, facility)
+            if self.prefetcher else None
+        )
+        if prefetched is not None:
+            app_log(f"⚡ Workflow {workflow_idx}: using prefetched post payload")
+            return prefetched.payload, prefetched.metadata
+        return build_post_message_payload(
+            step_data_input,
+            step_data_input.get("type"),
+            facility,
+            step_data_input.get("db_env"),
+        )
+
     def handle_receive_step(
         self, step_data_input: dict[str, Any], metadata: dict[str, Any], workflow_idx: int
     ) -> Tuple[dict[str, Any], bool]:
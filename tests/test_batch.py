@@ -0,0 +1,189 @@
+"""
+Tests for the non-interactive batch entry point and the pieces it relies on.
+"""
+import json
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import batch
+from config.settings import StepNames
+from config.workflow_config import Workflow, filter_workflows
+from config.workflow_files import load_workflow_file
+from core.orchestrator import WorkflowResult
+from core.screenshot import ScreenshotManager
+from operations.workflow import WorkflowStageExecutor
+
+
+SUITE = [
+    {"name": "happy", "bucket": "inbound", "steps": {"runReceiving": {"flow": "HAPPY_PATH"}}},
+    {"name": "blind", "bucket": "inbound", "steps": {"runReceiving": {"flow": "IB_RULE_EXCEPTION_BLIND_ILPN"}}},
+    {"name": "load", "bucket": "outbound", "steps": {"runLoading": {"shipment": "S1", "dock_door": "D1", "bol": "B1"}}},
+]
+
+
+@pytest.fixture
+def suite_file(tmp_path):
+    path = tmp_path / "suite.json"
+    path.write_text(json.dumps({"workflows": SUITE}), encoding="utf-8")
+    return path
+
+
+class TestWorkflowSelection:
+
+    def test_load_workflow_file(self, suite_file):
+        workflows = load_workflow_file(suite_file)
+
+        assert [w.full_name for w in workflows] == ["inbound.happy", "inbound.blind", "outbound.load"]
+
+    def test_load_workflow_file_rejects_unnamed_records(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps([{"steps": {}}]), encoding="utf-8")
+
+        with pytest.raises(ValueError, match="needs a 'name'"):
+            load_workflow_file(path)
+
+    def test_filters_by_bucket_name_and_flow(self, suite_file):
+        workflows = load_workflow_file(suite_file)
+
+        by_bucket = [w.name for w in filter_workflows(workflows, buckets=["OUTBOUND"])]
+        by_name = [w.name for w in filter_workflows(workflows, names=["inbound.b*"])]
+        by_flow = [w.name for w in filter_workflows(workflows, flows=["blind_ilpn", "happy_path"])]
+
+        assert by_bucket == ["load"]
+        assert by_name == ["blind"]
+        assert by_flow == ["happy", "blind"]
+
+
+class TestProdConfirmation:
+
+    @staticmethod
+    def _executor(**app_fields):
+        settings = MagicMock()
+        settings.app.step_names = StepNames()
+        settings.app.requires_prod_confirmation = True
+        for key, value in app_fields.items():
+            setattr(settings.app, key, value)
+        return WorkflowStageExecutor(settings, MagicMock(), MagicMock())
+
+    def test_token_pre_authorizes_without_prompt(self):
+        executor = self._executor(prod_confirmation_token="prod", interactive=False)
+
+        with patch("builtins.input") as prompt, patch("operations.workflow.app_log"):
+            assert executor.confirm_prod_post(1) is True
+        prompt.assert_not_called()
+
+    def test_non_interactive_without_token_refuses(self):
+        executor = self._executor(prod_confirmation_token="", interactive=False)
+
+        with patch("builtins.input") as prompt, patch("operations.workflow.app_log"):
+            assert executor.confirm_prod_post(1) is False
+        prompt.assert_not_called()
+
+
+class TestCaptureLevel:
+
+    def test_errors_level_only_keeps_failure_captures(self, tmp_path):
+        mgr = ScreenshotManager(str(tmp_path / "shots"), capture_level="errors")
+
+        assert mgr.capture(MagicMock(), "logged_in") is None
+        assert mgr._level_allows("login_failed") is True
+
+    def test_none_level_skips_rf_captures(self, tmp_path):
+        mgr = ScreenshotManager(str(tmp_path / "shots"), capture_level="none")
+        page = MagicMock()
+
+        assert mgr.capture_rf_window(page, "RF_HOME") is None
+        page.locator.assert_not_called()
+
+
+class TestBatchMain:
+
+    @staticmethod
+    def _services(step_ok=True):
+        wm_ops = MagicMock()
+        wm_ops.recovery = None
+        wm_ops.orchestrator.results = []
+        wm_ops.executor.run_step.side_effect = lambda name, data, meta, idx: (meta, step_ok)
+
+        @contextmanager
+        def factory(settings):
+            yield wm_ops
+
+        return wm_ops, factory
+
+    def _run(self, argv, tmp_path, step_ok=True):
+        wm_ops, factory = self._services(step_ok)
+        settings = MagicMock()
+        settings.app.checkpoint_path = str(tmp_path / "cp.sqlite3")
+        with patch.object(batch, "create_operation_services", factory), \
+             patch.object(batch.Settings, "from_env", return_value=settings), \
+             patch("batch.app_log"), patch("main.app_log"), \
+             patch("builtins.input", side_effect=AssertionError("batch must not prompt")):
+            return batch.main(argv), wm_ops, settings
+
+    def test_success_writes_results_and_exits_zero(self, suite_file, tmp_path):
+        results = tmp_path / "out" / "results.json"
+
+        code, wm_ops, settings = self._run(
+            ["--workflows", str(suite_file), "--bucket", "inbound", "--results", str(results)], tmp_path
+        )
+
+        assert code == batch.EXIT_OK
+        assert settings.app.interactive is False
+        assert settings.browser.capture_level == "errors"
+        payload = json.loads(results.read_text(encoding="utf-8"))
+        assert payload["summary"]["passed"] == 2
+        assert [w["name"] for w in payload["workflows"]] == ["inbound.happy", "inbound.blind"]
+
+    def test_failed_step_gives_non_zero_exit(self, suite_file, tmp_path):
+        code, _, _ = self._run(["--workflows", str(suite_file)], tmp_path, step_ok=False)
+
+        assert code == batch.EXIT_FAILURES
+
+    def test_matrix_shard_switches_warehouse_per_workflow(self, tmp_path):
+        code, wm_ops, settings = self._run(
+            ["--items", "ITEM-1", "--flow", "HAPPY_PATH", "--warehouses", "AUR,COP", "--shard", "1/2"], tmp_path
+        )
+
+        assert code == batch.EXIT_OK
+        ran = [call.args[0] for call in wm_ops.screenshot_mgr.set_scenario.call_args_list]
+        assert ran == ["inbound.AUR.HAPPY_PATH.ITEM-1.q2000"]
+        assert settings.app.change_warehouse == "AUR"
+        assert wm_ops.step_execution.run_change_warehouse.call_count == 2  # session setup + switch
+
+    def test_matrix_rejects_several_warehouses_in_parallel(self):
+        with pytest.raises(SystemExit):
+            batch.parse_args(["--items", "ITEM-1", "--warehouses", "all", "--concurrency", "2"])
+
+    def test_no_matching_workflows_is_a_setup_error(self, suite_file, tmp_path):
+        code, wm_ops, _ = self._run(["--workflows", str(suite_file), "--bucket", "nope"], tmp_path)
+
+        assert code == batch.EXIT_SETUP_ERROR
+        wm_ops.step_execution.run_login.assert_not_called()
+
+    def test_login_failure_is_a_setup_error(self, suite_file, tmp_path):
+        wm_ops, factory = self._services()
+        wm_ops.step_execution.run_login.side_effect = RuntimeError("bad creds")
+        settings = MagicMock()
+        settings.app.checkpoint_path = str(tmp_path / "cp.sqlite3")
+
+        with patch.object(batch, "create_operation_services", factory), \
+             patch.object(batch.Settings, "from_env", return_value=settings), \
+             patch("batch.app_log"):
+            code = batch.main(["--workflows", str(suite_file)])
+
+        assert code == batch.EXIT_SETUP_ERROR
+
+
+class TestBatchRun:
+
+    def test_not_run_workflows_fail_the_batch(self):
+        run = batch.BatchRun()
+        with patch("batch.app_log"):
+            run.add(WorkflowResult(1, "a", "passed"))
+        run.not_run = 2
+
+        assert run.exit_code() == batch.EXIT_FAILURES
+        assert run.summary()["total"] == 3
@@ -0,0 +1,98 @@
+"""
+Tests for the workflow checkpoint store and resume handling in main.run_automation.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+import main
+from core.checkpoint import CheckpointStore
+
+
+STEPS = {
+    "postMessage": {"enabled": True, "type": "ASN"},
+    "runReceiving": {"item": "ITEM-1"},
+    "runLoading": {"shipment": "S1"},
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with CheckpointStore(tmp_path / "run" / CheckpointStore.FILENAME) as checkpoints:
+        yield checkpoints
+
+
+class TestCheckpointStore:
+
+    def test_resume_point_empty(self, store):
+        assert store.resume_point(1, "inbound.receive", STEPS) == (0, {})
+
+    def test_resume_point_returns_leading_completed_steps(self, store):
+        store.record_step(1, "inbound.receive", 1, "postMessage", STEPS["postMessage"], {"asn_id": "A1"})
+        store.record_step(
+            1, "inbound.receive", 2, "runReceiving", STEPS["runReceiving"],
+            {"asn_id": "A1", "receive_items": [{"item": "ITEM-1"}]},
+        )
+
+        completed, metadata = store.resume_point(1, "inbound.receive", STEPS)
+
+        assert completed == 2
+        assert metadata == {"asn_id": "A1", "receive_items": [{"item": "ITEM-1"}]}
+
+    def test_changed_step_config_invalidates_checkpoint(self, store):
+        store.record_step(1, "inbound.receive", 1, "postMessage", STEPS["postMessage"], {"asn_id": "A1"})
+        edited = dict(STEPS, postMessage={"enabled": True, "type": "PO"})
+
+        assert store.resume_point(1, "inbound.receive", edited) == (0, {})
+
+    def test_checkpoints_survive_reopen_and_reset_clears(self, tmp_path):
+        path = tmp_path / CheckpointStore.FILENAME
+        with CheckpointStore(path) as first:
+            first.record_step(2, "outbound.load", 1, "postMessage", STEPS["postMessage"], {"asn_id": "A2"})
+
+        with CheckpointStore(path) as second:
+            assert second.resume_point(2, "outbound.load", STEPS)[0] == 1
+            second.reset()
+            assert second.resume_point(2, "outbound.load", STEPS)[0] == 0
+
+    def test_for_settings_defaults_to_run_dir_beside_screenshots(self, tmp_path):
+        settings = MagicMock()
+        settings.app.checkpoint_path = ""
+        settings.browser.screenshot_dir = str(tmp_path / "shots")
+
+        with CheckpointStore.for_settings(settings) as checkpoints:
+            assert checkpoints.path == tmp_path / CheckpointStore.RUN_DIR / CheckpointStore.FILENAME
+
+
+class TestRunAutomationResume:
+
+    def test_skips_completed_steps_and_reuses_metadata(self, store):
+        store.record_step(1, "inbound.receive", 1, "postMessage", STEPS["postMessage"], {"asn_id": "A1"})
+        wm_ops = MagicMock()
+        wm_ops.recovery = None
+        calls = []
+
+        def run_step(step_name, step_data, metadata, idx):
+            calls.append((step_name, dict(metadata)))
+            return metadata, True
+
+        wm_ops.executor.run_step.side_effect = run_step
+
+        with patch.object(main, "load_workflows", return_value=[("inbound.receive", STEPS)]), \
+             patch("builtins.input", return_value=""), \
+             patch("main.app_log"):
+            main.run_automation(MagicMock(), wm_ops, store)
+
+        assert calls == [("runReceiving", {"asn_id": "A1"}), ("runLoading", {"asn_id": "A1"})]
+        assert store.resume_point(1, "inbound.receive", STEPS)[0] == 3
+
+    def test_failed_step_is_not_checkpointed(self, store):
+        wm_ops = MagicMock()
+        wm_ops.recovery = None
+        wm_ops.executor.run_step.side_effect = [({"asn_id": "A1"}, True), ({"asn_id": "A1"}, False)]
+
+        with patch.object(main, "load_workflows", return_value=[("inbound.receive", STEPS)]), \
+             patch("builtins.input", return_value=""), \
+             patch("main.app_log"):
+            main.run_automation(MagicMock(), wm_ops, store)
+
+        assert store.resume_point(1, "inbound.receive", STEPS) == (1, {"asn_id": "A1"})
@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 import os
 
-from config.settings import Settings, BrowserConfig, AppConfig, StepNames
+from config.settings import Settings, BrowserConfig, AppConfig, StepNames, _env_float, _env_int
 from config.operations_config import OperationConfig, MenuConfig, ScreenSelectors
 
 
@@ -115,6 +115,15 @@ class TestSettings:
         assert settings.app.auto_accept_rf_messages is False
         assert settings.app.auto_click_info_icon is True
 
+    @patch.dict(os.environ, {"INTEGRATION_CONCURRENCY": "four", "RETRY_BACKOFF_CAP_S": "", "RETRY_BUDGET": " 7 "})
+    def test_numeric_env_values_are_best_effort(self):
+        """Test malformed or blank numeric values keep the default instead of raising."""
+        with patch('config.settings.app_log'):
+            assert _env_int("INTEGRATION_CONCURRENCY", 4) == 4
+            assert _env_float("RETRY_BACKOFF_CAP_S", 8.0) == 8.0
+            assert _env_int("RETRY_BUDGET", 20) == 7
+            assert _env_float("UNSET_FLOAT_SETTING", 0.5) == 0.5
+
     @patch('config.settings.DB')
     def test_from_env_loads_credentials(self, mock_db):
         """Test loading credentials from database."""
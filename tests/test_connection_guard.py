@@ -50,7 +50,9 @@ class TestConnectionResetGuardInitialization:
         guard = ConnectionResetGuard(mock_page)
 
         # Check that event handlers were registered
-        assert mock_page.on.call_count == 3
+        assert mock_page.on.call_count == 5
+        mock_page.on.assert_any_call("response", guard._handle_response)
+        mock_page.on.assert_any_call("requestfailed", guard._handle_request_failed)
         mock_page.on.assert_any_call("framenavigated", guard._handle_frame_navigation)
         mock_page.on.assert_any_call("domcontentloaded", guard._handle_page_event)
         mock_page.on.assert_any_call("load", guard._handle_page_event)
@@ -216,9 +218,10 @@ class TestCheckFrame:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = "https://example.com"
-        mock_frame.evaluate.return_value = "The connection was reset by the server"
+        mock_frame.evaluate.return_value = {"marker": False, "text": "The connection was reset by the server"}
 
         guard = ConnectionResetGuard(mock_page)
+        guard._suspect = True
         guard._trip = MagicMock()
 
         guard._check_frame(mock_frame)
@@ -230,9 +233,10 @@ class TestCheckFrame:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = "https://example.com"
-        mock_frame.evaluate.return_value = "ERR_CONNECTION_RESET"
+        mock_frame.evaluate.return_value = {"marker": False, "text": "ERR_CONNECTION_RESET"}
 
         guard = ConnectionResetGuard(mock_page)
+        guard._suspect = True
         guard._trip = MagicMock()
 
         guard._check_frame(mock_frame)
@@ -244,9 +248,10 @@ class TestCheckFrame:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = "https://example.com"
-        mock_frame.evaluate.return_value = "This site can't be reached"
+        mock_frame.evaluate.return_value = {"marker": False, "text": "This site can't be reached"}
 
         guard = ConnectionResetGuard(mock_page)
+        guard._suspect = True
         guard._trip = MagicMock()
 
         guard._check_frame(mock_frame)
@@ -273,7 +278,7 @@ class TestCheckFrame:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = None
-        mock_frame.evaluate.return_value = "normal page content"
+        mock_frame.evaluate.return_value = {"marker": False, "text": "normal page content"}
 
         guard = ConnectionResetGuard(mock_page)
         guard._trip = MagicMock()
@@ -288,7 +293,7 @@ class TestCheckFrame:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = "https://example.com"
-        mock_frame.evaluate.return_value = None
+        mock_frame.evaluate.return_value = {"marker": False, "text": None}
 
         guard = ConnectionResetGuard(mock_page)
         guard._trip = MagicMock()
@@ -316,9 +321,10 @@ class TestCheckFrame:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = "https://example.com"
-        mock_frame.evaluate.return_value = "CONNECTION WAS RESET"
+        mock_frame.evaluate.return_value = {"marker": False, "text": "CONNECTION WAS RESET"}
 
         guard = ConnectionResetGuard(mock_page)
+        guard._suspect = True
         guard._trip = MagicMock()
 
         guard._check_frame(mock_frame)
@@ -326,6 +332,102 @@ class TestCheckFrame:
         guard._trip.assert_called_once()
 
 
+class TestNetworkSignals:
+    """Tests for response/requestfailed handling and the DOM marker probe."""
+
+    @staticmethod
+    def _make(url="https://example.com/app"):
+        mock_page = MagicMock()
+        mock_frame = MagicMock()
+        mock_frame.url = url
+        mock_page.main_frame = mock_frame
+        guard = ConnectionResetGuard(mock_page)
+        guard._trip = MagicMock()
+        return guard, mock_frame
+
+    @staticmethod
+    def _request(frame, failure=None, navigation=True):
+        request = MagicMock(failure=failure, frame=frame)
+        request.is_navigation_request.return_value = navigation
+        return request
+
+    def test_reset_failure_trips_without_dom_access(self):
+        guard, frame = self._make()
+
+        guard._handle_request_failed(self._request(frame, "net::ERR_CONNECTION_RESET"))
+
+        guard._trip.assert_called_once()
+        assert "ERR_CONNECTION_RESET" in guard._trip.call_args[0][0]
+        frame.evaluate.assert_not_called()
+
+    def test_aborted_navigation_is_ignored(self):
+        guard, frame = self._make()
+
+        guard._handle_request_failed(self._request(frame, "net::ERR_ABORTED"))
+
+        guard._trip.assert_not_called()
+        assert guard._suspect is False
+
+    def test_subresource_failures_are_ignored(self):
+        guard, frame = self._make()
+
+        guard._handle_request_failed(
+            self._request(frame, "net::ERR_CONNECTION_RESET", navigation=False)
+        )
+        guard._handle_request_failed(self._request(MagicMock(), "net::ERR_CONNECTION_RESET"))
+
+        guard._trip.assert_not_called()
+
+    def test_ok_response_skips_dom_probe(self):
+        guard, frame = self._make("https://example.com/app#tab")
+        response = MagicMock(url="https://example.com/app", status=200)
+        response.request = self._request(frame)
+
+        guard._handle_response(response)
+        guard._check_frame(frame)
+
+        frame.evaluate.assert_not_called()
+        guard._trip.assert_not_called()
+
+    def test_error_response_requests_body_text(self):
+        guard, frame = self._make()
+        frame.evaluate.return_value = {"marker": False, "text": "Gateway: connection was reset"}
+        response = MagicMock(url="https://example.com/app", status=502)
+        response.request = self._request(frame)
+
+        guard._handle_response(response)
+        guard._check_frame(frame)
+
+        assert frame.evaluate.call_args[0][1] is True
+        guard._trip.assert_called_once_with("browser reported the connection was reset")
+
+    def test_unconfirmed_navigation_checks_marker_only(self):
+        guard, frame = self._make()
+        frame.evaluate.return_value = {"marker": False, "text": None}
+
+        guard._check_frame(frame)
+
+        assert frame.evaluate.call_args[0][1] is False
+        guard._trip.assert_not_called()
+
+    def test_error_page_marker_trips(self):
+        guard, frame = self._make()
+        frame.evaluate.return_value = {"marker": True, "code": "ERR_CONNECTION_RESET", "text": None}
+
+        guard._check_frame(frame)
+
+        guard._trip.assert_called_once_with("browser error page shown (ERR_CONNECTION_RESET)")
+
+    def test_chrome_error_response_trips(self):
+        guard, frame = self._make()
+        response = MagicMock(url="chrome-error://chromewebdata/", status=200)
+        response.request = self._request(frame)
+
+        guard._handle_response(response)
+
+        guard._trip.assert_called_once()
+
+
 class TestTrip:
     """Tests for _trip method."""
 
@@ -425,13 +527,16 @@ class TestIntegration:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = "https://example.com"
-        mock_frame.evaluate.return_value = "The connection was reset"
+        mock_frame.evaluate.return_value = {"marker": False, "text": "The connection was reset"}
         mock_page.main_frame = mock_frame
 
         guard = ConnectionResetGuard(mock_page)
+        failed = MagicMock(failure="net::ERR_HTTP2_PROTOCOL_ERROR", frame=mock_frame)
+        failed.is_navigation_request.return_value = True
 
         with patch('core.connection_guard.app_log'):
-            # Simulate page load event
+            # An unrecognized navigation failure makes the load event read body text
+            guard._handle_request_failed(failed)
             guard._handle_page_event(mock_page)
 
             # Now ensure_ok should raise
@@ -443,7 +548,7 @@ class TestIntegration:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = "https://example.com"
-        mock_frame.evaluate.return_value = "normal content"
+        mock_frame.evaluate.return_value = {"marker": False, "text": "normal content"}
         mock_page.main_frame = mock_frame
 
         guard = ConnectionResetGuard(mock_page)
@@ -463,7 +568,7 @@ class TestIntegration:
         mock_page = MagicMock()
         mock_frame = MagicMock()
         mock_frame.url = "https://example.com"
-        mock_frame.evaluate.return_value = "Normal page content without error keywords"
+        mock_frame.evaluate.return_value = {"marker": False, "text": "Normal page content without error keywords"}
         mock_page.main_frame = mock_frame
 
         guard = ConnectionResetGuard(mock_page)
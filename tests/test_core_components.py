@@ -1,4 +1,5 @@
 """Additional coverage for core components and orchestration helpers."""
+import json
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
@@ -6,6 +7,7 @@ import pytest
 
 from core.orchestrator import AutomationOrchestrator, OperationResult
 from core.page_manager import PageManager
+from core.state_metrics import StateTiming
 from core.screenshot import ScreenshotManager, PlaywrightTimeoutError
 from operations.base_operation import BaseOperation
 from operations.runner import OperationRunner
@@ -384,6 +386,21 @@ def test_automation_orchestrator_summary(monkeypatch):
     assert any("Op2" in line for line in logs)
 
 
+def test_automation_orchestrator_exports_metrics(tmp_path, monkeypatch):
+    settings = MagicMock()
+    settings.app.metrics_export_path = str(tmp_path / "metrics.json")
+    orch = AutomationOrchestrator(settings=settings)
+    orch.results = [OperationResult(True, "Receive")]
+    orch.state_latency.add([StateTiming("ASN_SCANNED", 0.0, 0.2, 3, 1)])
+    monkeypatch.setattr("core.orchestrator.app_log", lambda msg: None)
+
+    orch.print_summary()
+
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data["operations"][0]["operation"] == "Receive"
+    assert data["state_latency"]["ASN_SCANNED"]["playwright_calls"] == 3
+
+
 class DummyGuard:
     def __init__(self):
         self.calls = []
@@ -218,6 +218,28 @@ close_pallet=Y
         assert connection == mock_connection
         mock_connection.jconn.setAutoCommit.assert_called_once_with(False)
 
+    @pytest.mark.parametrize("jvm_started", [False, True])
+    @patch('DB.database.jaydebeapi.connect')
+    @patch('DB.database.DB.get_config_from_server')
+    def test_connect_serializes_until_jvm_started(self, mock_get_config, mock_connect, jvm_started):
+        """Test connect() holds the JVM start lock only while the JVM is not yet running."""
+        from DB import database
+
+        mock_get_config.return_value = (
+            "[where]\nwhere=dev\nwhse=TEST\nclose_pallet=Y\n[dev]\nconn_str=jdbc:x\n"
+            "app_server=a\napp_server_user=u\napp_server_pass=p\ndb_user=d\ndb_password=p\n"
+            "schema=s\nautocommit=0\n",
+            'Linux',
+            'testnode',
+        )
+        locked = []
+        mock_connect.side_effect = lambda *args: locked.append(database._jvm_start_lock.locked()) or MagicMock()
+
+        with patch('DB.database.jpype.isJVMStarted', return_value=jvm_started):
+            DB().connect()
+
+        assert locked == [not jvm_started]
+
     @patch('DB.database.jaydebeapi.connect')
     @patch('DB.database.DB.get_config_from_server')
     def test_context_manager_enter(self, mock_get_config, mock_connect):
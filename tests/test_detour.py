@@ -4,7 +4,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from core.detour import ensure_detour_page_ready, run_open_ui_detours
+from core.detour import DetourWindowCache, ensure_detour_page_ready, run_open_ui_detours
 
 
 def test_ensure_detour_page_ready_short_circuit():
@@ -189,3 +189,117 @@ def test_run_open_ui_detours_handles_disabled_and_failure(monkeypatch):
     assert run_open_ui_detours(
         {"search_term": "bad", "match_text": "Bad"}, main_page=detour_page, screenshot_mgr=None
     ) is False
+
+
+def test_run_open_ui_detours_reuses_cached_window(monkeypatch):
+    """Second detour for the same match_text refreshes the cached window instead of reopening."""
+    monkeypatch.setattr("core.detour.ensure_detour_page_ready", lambda *a, **k: True)
+    monkeypatch.setattr("core.detour.WaitUtils", MagicMock())
+
+    detour_page = MagicMock()
+    detour_page.evaluate.side_effect = [
+        {"id": "win-7", "title": "iLPNs"},  # remember after first open
+        True,  # refresh on second detour
+    ]
+    detour_nav = MagicMock()
+    detour_nav.open_menu_item.return_value = True
+    cache = DetourWindowCache(detour_page)
+    cfg = {"search_term": "ilpns", "match_text": "iLPNs"}
+
+    for _ in range(2):
+        assert run_open_ui_detours(
+            cfg,
+            main_page=MagicMock(),
+            screenshot_mgr=None,
+            detour_page=detour_page,
+            detour_nav=detour_nav,
+            window_cache=cache,
+        ) is True
+
+    detour_nav.open_menu_item.assert_called_once_with("ilpns", "iLPNs", onDemand=False)
+    detour_nav.close_active_windows.assert_called_with(skip_titles=["rf menu", "iLPNs"])
+
+
+def test_run_open_ui_detours_alternating_kinds_keep_both_windows(monkeypatch):
+    """Alternating iLPNs and Tasks detours opens each window once; later visits refresh it."""
+    monkeypatch.setattr("core.detour.ensure_detour_page_ready", lambda *a, **k: True)
+    monkeypatch.setattr("core.detour.WaitUtils", MagicMock())
+    windows = {}  # id -> title, the detour page's open windows
+    opened = []
+
+    class Page:
+        def evaluate(self, script, arg=None):
+            if arg is None:  # active window after a launch
+                win_id = list(windows)[-1]
+                return {"id": win_id, "title": windows[win_id]}
+            return arg in windows  # refresh of a cached window
+
+    class Nav:
+        def close_active_windows(self, skip_titles=None):
+            skip = [t.lower() for t in skip_titles or []]
+            for win_id, title in list(windows.items()):
+                if not any(s in title.lower() for s in skip):
+                    del windows[win_id]
+
+        def open_menu_item(self, search_term, match_text, onDemand=True, skip_titles=None):
+            self.close_active_windows(skip_titles)
+            opened.append(match_text)
+            windows[f"win-{len(opened)}"] = match_text
+            return True
+
+        def maximize_non_rf_windows(self):
+            pass
+
+    page, nav = Page(), Nav()
+    cache = DetourWindowCache(page)
+    for match_text in ["iLPNs", "Tasks", "iLPNs", "Tasks"]:
+        assert run_open_ui_detours(
+            {"search_term": match_text.lower(), "match_text": match_text},
+            main_page=MagicMock(),
+            screenshot_mgr=None,
+            detour_page=page,
+            detour_nav=nav,
+            window_cache=cache,
+        ) is True
+
+    assert opened == ["iLPNs", "Tasks"]
+    assert sorted(windows.values()) == ["Tasks", "iLPNs"]
+
+
+def test_detour_window_cache_forgets_closed_window():
+    """Refresh reports False and drops the entry when the window is gone."""
+    page = MagicMock()
+    page.evaluate.side_effect = [{"id": "win-1", "title": "Tasks"}, False]
+    cache = DetourWindowCache(page)
+
+    cache.remember("Tasks")
+    assert cache.titles() == ["Tasks"]
+    assert cache.refresh("Tasks") is False
+    assert cache.titles() == []
+    assert cache.refresh("Tasks") is False
+
+
+def test_run_open_ui_detours_verify_only_passes_expectations(monkeypatch):
+    """verify_only entries hand expectations to the iLPN callback instead of drilling rows."""
+    monkeypatch.setattr("core.detour.ensure_detour_page_ready", lambda *a, **k: True)
+    monkeypatch.setattr("core.detour.WaitUtils", MagicMock())
+    calls = []
+
+    def fill_ilpn_cb(ilpn, page=None, **kwargs):
+        calls.append((ilpn, kwargs))
+        return True
+
+    nav = MagicMock()
+    nav.open_menu_item.return_value = True
+    cfg = {"match_text": "iLPNs", "verify_only": True, "fill_ilpn": True, "expected_status": "Received"}
+
+    assert run_open_ui_detours(
+        cfg,
+        main_page=MagicMock(),
+        screenshot_mgr=None,
+        main_nav=nav,
+        fill_ilpn_cb=fill_ilpn_cb,
+        screen_context={"ilpn": "L1", "quantity": 5},
+    ) is True
+
+    assert calls == [("L1", {"expect": {"status": "Received", "quantity": 5, "location": None}})]
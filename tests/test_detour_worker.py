@@ -0,0 +1,93 @@
+"""Tests for core.detour_worker."""
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.detour_worker import DetourResult, DetourWorker
+
+
+@pytest.fixture
+def settings():
+    mock_settings = MagicMock()
+    mock_settings.browser.screenshot_dir = "screenshots"
+    mock_settings.app.change_warehouse = "WH1"
+    return mock_settings
+
+
+@pytest.fixture
+def worker_env(monkeypatch):
+    """Patch browser/screenshot/navigation so the worker thread runs without Playwright."""
+    monkeypatch.setattr("core.detour_worker.BrowserManager", MagicMock())
+    monkeypatch.setattr("core.detour_worker.ScreenshotManager", MagicMock())
+    monkeypatch.setattr("core.detour_worker.NavigationManager", MagicMock())
+    monkeypatch.setattr("core.detour_worker.WaitUtils", MagicMock())
+    calls = []
+
+    def fake_detours(cfg, **kwargs):
+        calls.append((cfg, kwargs["screen_context"], threading.current_thread().name))
+        return kwargs["screen_context"].get("ilpn") != "BAD"
+
+    monkeypatch.setattr("core.detour_worker.run_open_ui_detours", fake_detours)
+    return calls
+
+
+def test_submit_runs_on_worker_thread_and_drain_collects(settings, worker_env):
+    """Detours run on the worker thread with a snapshot of the submitted context."""
+    worker = DetourWorker(settings, storage_state={}, app_url="http://app").start()
+    ctx = {"ilpn": "L1"}
+    worker.submit({"match_text": "iLPNs"}, ctx, label="A1/I1")
+    ctx["ilpn"] = "mutated"
+    worker.submit({"match_text": "iLPNs"}, {"ilpn": "BAD"}, label="A1/I2")
+
+    results = worker.drain()
+    worker.close()
+
+    assert results == [DetourResult("A1/I1", True), DetourResult("A1/I2", False)]
+    assert worker_env[0][1] == {"ilpn": "L1"}
+    assert all(name == "detour-worker" for _, _, name in worker_env)
+    assert worker.drain() == []
+
+
+def test_submit_after_worker_died_records_failure(settings, monkeypatch):
+    """A dead worker never blocks drain(); queued work is reported as failed."""
+    browser = MagicMock()
+    browser.return_value.__enter__.side_effect = RuntimeError("no browser")
+    monkeypatch.setattr("core.detour_worker.BrowserManager", browser)
+
+    worker = DetourWorker(settings, storage_state={}, app_url="http://app").start()
+    worker._thread.join(timeout=5)
+    worker.submit({}, {"ilpn": "L1"}, label="late")
+
+    results = worker.drain()
+
+    assert len(results) == 1
+    assert results[0].success is False
+    assert results[0].label == "late"
+
+
+def test_full_queue_and_drain_deadline_record_failures(settings, worker_env, monkeypatch):
+    """A full queue rejects the submit and drain() stops waiting at its deadline."""
+    release = threading.Event()
+    monkeypatch.setattr(
+        "core.detour_worker.run_open_ui_detours", lambda cfg, **kwargs: release.wait(5) or True
+    )
+    worker = DetourWorker(
+        settings, storage_state={}, app_url="http://app", max_pending=1, submit_timeout_s=0.05
+    ).start()
+    assert worker.submit({}, {}, label="running") is True
+    while not worker._jobs.empty():  # let the worker pick up the first job
+        time.sleep(0.01)
+    assert worker.submit({}, {}, label="queued") is True
+    assert worker.submit({}, {}, label="overflow") is False
+
+    results = worker.drain(timeout=0.1)
+    release.set()
+    late = worker.close()
+
+    assert [(r.label, r.error) for r in results] == [
+        ("overflow", "detour queue full"),
+        ("queued", "detour drain timed out"),
+    ]
+    assert late == [DetourResult("running", True)]
@@ -1,8 +1,11 @@
 """Lightweight coverage for iLPN filter helper behavior."""
+import gc
 import sys
 from io import BytesIO
 from types import SimpleNamespace
 
+import pytest
+
 from operations.inbound import ilpn_filter_helper as helper
 
 
@@ -660,3 +663,293 @@ def test_open_single_filtered_ilpn_row_locator_path(monkeypatch):
 
     assert helper._open_single_filtered_ilpn_row(Target(), "ILPNB") is True
     assert calls["double"] >= 1
+
+
+def test_verify_ilpns_reads_store_once_and_captures_only_mismatches(monkeypatch):
+    """Data mode checks a batch from one store read and screenshots only failures."""
+    records = [
+        {"tcLpnId": "L1", "lpnFacilityStatus": "Received", "qtyOnHand": "5", "currLocn": "R-01"},
+        {"tcLpnId": "L2", "lpnFacilityStatus": "Received", "qtyOnHand": "3", "currLocn": "R-02"},
+    ]
+    evaluations = []
+
+    class Target:
+        def evaluate(self, script, *args):
+            evaluations.append(script)
+            return [{"source": "store", "records": records}]
+
+    target = Target()
+    monkeypatch.setattr(helper.FrameFinder, "wait_for_ilpn_frame", staticmethod(lambda *a, **k: target))
+    monkeypatch.setattr(helper.ViewStabilizer, "wait_for_ext_mask", staticmethod(lambda *a, **k: True))
+    captures = []
+    screenshot_mgr = SimpleNamespace(capture=lambda page, label, note: captures.append(label))
+
+    results = helper.verify_ilpns(
+        "page",
+        [
+            helper.ILPNExpectation("L1", status="received", quantity=5, location="R-01"),
+            {"ilpn": "L2", "quantity": 4},
+        ],
+        screenshot_mgr,
+        filter_missing=False,
+    )
+
+    assert [r.ok for r in results] == [True, False]
+    assert results[1].mismatches == {"quantity": (4, "3")}
+    assert captures == ["ilpn_verify_L2"]
+    assert evaluations == [helper.EXT_STORE_RECORDS_SCRIPT]
+
+
+def test_verify_ilpns_filters_missing_ilpn_then_rereads(monkeypatch):
+    """An iLPN outside the loaded page triggers one quick-filter pass and a re-read after the reload."""
+    reads = iter([[], [{"records": [{"lpn": "L9", "status": "Putaway"}]}]])
+    waits = []
+
+    class Target:
+        def evaluate(self, script, *args):
+            if script == helper.STORE_LOAD_MARK_SCRIPT:
+                return {"loads": 0, "count": 25}
+            return next(reads)
+
+        def wait_for_function(self, script, arg=None, timeout=None):
+            waits.append((script, arg))
+
+    target = Target()
+    monkeypatch.setattr(helper.FrameFinder, "wait_for_ilpn_frame", staticmethod(lambda *a, **k: target))
+    monkeypatch.setattr(helper.ViewStabilizer, "wait_for_ext_mask", staticmethod(lambda *a, **k: True))
+    filled = []
+    monkeypatch.setattr(helper.ILPNFilterFiller, "_fill_input", staticmethod(lambda t, ilpn: filled.append(ilpn) or True))
+
+    results = helper.verify_ilpns("page", [helper.ILPNExpectation("L9", status="Putaway")])
+
+    assert filled == ["L9"]
+    assert waits == [(helper.STORE_RELOADED_SCRIPT, {"loads": 0, "count": 25})]
+    assert results[0].ok
+
+
+def test_verify_ilpns_compares_one_resolved_column_per_field():
+    """A value in a sibling column (shipped vs on-hand qty, status code vs description) does not pass."""
+    record = {
+        "tcLpnId": "L1",
+        "lpnFacilityStatus": "30",
+        "lpnFacilityStatusDesc": "Received",
+        "shippedQty": "5",
+        "qtyOnHand": "3",
+    }
+
+    mismatches = helper.ILPNStoreVerifier.compare(helper.ILPNExpectation("L1", status="30", quantity=5), record)
+    pinned = helper.ILPNStoreVerifier.compare(
+        helper.ILPNExpectation("L1", quantity=5, columns={"quantity": "shippedQty"}), record
+    )
+
+    assert mismatches == {"status": ("30", "Received"), "quantity": (5, "3")}
+    assert pinned == {}
+
+
+def test_find_record_matches_only_the_ilpn_id_column():
+    """An iLPN number appearing in another column (parent LPN, ASN) does not select the record."""
+    records = [
+        {"tcLpnId": "L2", "parentLpnId": "L1", "tcAsnId": "L1"},
+        {"tcLpnId": "L1", "qtyOnHand": "5"},
+        {"lpnNbr": "L3", "shipmentId": "L4"},
+    ]
+
+    assert helper.ILPNStoreVerifier.find_record(records, "l1") is records[1]
+    assert helper.ILPNStoreVerifier.find_record(records, "L3") is records[2]
+    assert helper.ILPNStoreVerifier.find_record(records, "L4") is None
+    assert helper.ILPNStoreVerifier.find_record(records, "L4", {"ilpn": "shipmentId"}) is records[2]
+
+
+def test_ilpn_expectation_rejects_unknown_keys():
+    with pytest.raises(ValueError, match="qty, stat"):
+        helper.ILPNExpectation.from_dict({"ilpn": "L1", "qty": 5, "stat": "Received"})
+
+
+class ProbeFrame(SimpleNamespace):
+    def __init__(self, name, url, detached=False):
+        super().__init__(name=name, url=url, detached=detached)
+
+    def is_detached(self):
+        return self.detached
+
+
+class ProbePage(SimpleNamespace):
+    __hash__ = object.__hash__  # the frame cache is keyed on the page, like a Playwright Page
+
+    def __init__(self, frames, probes, attach=None):
+        super().__init__(frames=frames, main_frame=frames[0], probes=list(probes), probe_args=[], attach=attach)
+
+    def evaluate(self, script, arg=None):
+        assert script == helper.ILPN_FRAME_PROBE_SCRIPT
+        self.probe_args.append(arg)
+        return self.probes.pop(0) if self.probes else None
+
+    def wait_for_event(self, event, timeout=None):
+        assert event == "frameattached"
+        if self.attach is None:
+            raise TimeoutError("no frame")
+        frame, self.attach = self.attach, None
+        self.frames.append(frame)
+        return SimpleNamespace(wait_for_load_state=lambda *a, **k: None)
+
+
+def test_find_ilpn_frame_maps_probe_hit_and_caches_by_window():
+    helper.FrameFinder.clear_cache()
+    target = ProbeFrame("uxiframe-1", "https://example.com/lpn/list")
+    page = ProbePage(
+        [ProbeFrame("", "https://example.com/"), target],
+        [{"name": "uxiframe-1", "url": target.url, "windowId": "win-7"}, {"cached": True, "windowId": "win-7"}],
+    )
+
+    assert helper.FrameFinder.find_ilpn_frame(page) is target
+    assert helper.FrameFinder.find_ilpn_frame(page) is target
+    assert page.probe_args == [[], ["win-7"]]
+
+
+def test_find_ilpn_frame_drops_detached_cache_entry():
+    helper.FrameFinder.clear_cache()
+    stale = ProbeFrame("uxiframe-1", "https://example.com/lpn/list")
+    page = ProbePage([ProbeFrame("", "https://example.com/"), stale], [{"name": "uxiframe-1", "url": stale.url, "windowId": "w"}])
+
+    helper.FrameFinder.find_ilpn_frame(page)
+    stale.detached = True
+    page.probes = [None]
+    page.frames = [page.main_frame]
+
+    assert helper.FrameFinder.find_ilpn_frame(page) is None
+    assert page.probe_args[-1] == []
+
+
+def test_frame_cache_is_scoped_to_its_page():
+    helper.FrameFinder.clear_cache()
+    target = ProbeFrame("uxiframe-1", "https://example.com/lpn/list")
+    page = ProbePage([ProbeFrame("", "https://example.com/"), target], [{"name": "uxiframe-1", "url": target.url, "windowId": "win-7"}])
+    other = ProbePage([ProbeFrame("", "https://example.com/")], [None])
+
+    helper.FrameFinder.find_ilpn_frame(page)
+    helper.FrameFinder.find_ilpn_frame(other)
+
+    assert other.probe_args == [[]]
+    del page
+    gc.collect()
+    assert len(helper.FrameFinder._frame_cache) == 1  # only `other`'s (empty) entry is left
+
+
+def test_wait_for_ilpn_frame_reprobes_between_short_slices():
+    helper.FrameFinder.clear_cache()
+    late = ProbeFrame("panel-1", "https://example.com/app/view")  # no URL hint: only the probe finds it
+    page = ProbePage([ProbeFrame("", "https://example.com/"), late], [None, None, {"name": "panel-1", "url": late.url, "windowId": "w"}])
+
+    assert helper.FrameFinder.wait_for_ilpn_frame(page, timeout_ms=5000) is late
+    assert len(page.probe_args) == 3
+
+
+def test_wait_for_ilpn_frame_wakes_on_frame_attached():
+    helper.FrameFinder.clear_cache()
+    attached = ProbeFrame("", "https://example.com/uxiframe/lpn")
+    page = ProbePage([ProbeFrame("", "https://example.com/")], [None, {"name": "", "url": attached.url, "windowId": ""}], attach=attached)
+
+    assert helper.FrameFinder.wait_for_ilpn_frame(page, timeout_ms=5000) is attached
+    assert len(page.probe_args) == 2
+
+
+def test_wait_for_stable_view_waits_in_page_for_quiet_period():
+    calls = []
+    target = SimpleNamespace(wait_for_function=lambda script, **kwargs: calls.append((script, kwargs)))
+
+    assert helper.ViewStabilizer.wait_for_stable_view(target, quiet_ms=400, timeout_ms=2000) is True
+    script, kwargs = calls[0]
+    assert script == helper.VIEW_QUIET_SCRIPT
+    assert kwargs["arg"]["quietMs"] == 400
+    assert kwargs["timeout"] == 2000
+
+
+def test_wait_for_stable_view_quiet_period_defaults_from_samples():
+    calls = []
+    target = SimpleNamespace(wait_for_function=lambda script, **kwargs: calls.append(kwargs))
+
+    helper.ViewStabilizer.wait_for_stable_view(target, stable_samples=2, interval_ms=150)
+    helper.ViewStabilizer.wait_for_stable_view(target, stable_samples=2, interval_ms=150)
+
+    assert calls[0]["arg"]["quietMs"] == 300
+    assert calls[0]["arg"]["token"] != calls[1]["arg"]["token"]
+
+
+def test_wait_for_stable_view_returns_false_on_timeout():
+    def wait_for_function(*_a, **_k):
+        raise TimeoutError("still mutating")
+
+    released = []
+    target = SimpleNamespace(wait_for_function=wait_for_function, evaluate=lambda script, arg: released.append((script, arg)))
+    assert helper.ViewStabilizer.wait_for_stable_view(target, quiet_ms=100, timeout_ms=10) is False
+    assert len(released) == 1 and released[0][0] == helper.VIEW_QUIET_RELEASE_SCRIPT
+
+
+def _jpeg_bytes(size, color):
+    from PIL import Image
+
+    buf = BytesIO()
+    Image.new("RGB", size, color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def test_tab_image_stitcher_caps_tiles_and_preallocates_canvas():
+    stitcher = helper.TabImageStitcher(max_width=200, max_height=500)
+    assert stitcher.add(_jpeg_bytes((400, 300), "red")) is True
+    assert stitcher.add(_jpeg_bytes((100, 50), "blue")) is True
+    assert stitcher.add(b"") is False
+    assert stitcher.add(b"not an image") is False
+
+    combined = stitcher.render()
+
+    assert combined.mode == "RGB"
+    assert combined.size == (200, 150 + 50)
+    assert combined.getpixel((50, 50))[0] > 200
+    assert combined.getpixel((50, 175))[2] > 200
+    assert len(stitcher) == 0
+
+
+def test_tab_image_stitcher_blends_overlay_in_rgb():
+    stitcher = helper.TabImageStitcher()
+    stitcher.add(_jpeg_bytes((300, 120), "black"))
+
+    combined = stitcher.render("Scenario / Stage", "2024-01-01 00:00:00")
+
+    assert combined.mode == "RGB"
+    corner = combined.getpixel((combined.width - 8, combined.height - 8))
+    assert 100 < corner[0] < 255
+
+
+def test_capture_combined_tabs_saves_on_background_worker(tmp_path):
+    mgr = SimpleNamespace(
+        sequence=0,
+        image_format="jpeg",
+        image_quality=70,
+        current_scenario_label="S1",
+        current_stage_label=None,
+        _build_filename=lambda label: tmp_path / f"{label}.jpg",
+    )
+    stitcher = helper.TabImageStitcher()
+    stitcher.add(_jpeg_bytes((120, 80), "green"))
+    config = helper.TabClickConfig(screenshot_mgr=mgr)
+
+    future = helper.TabNavigator._capture_combined_tabs(None, stitcher, config, "iLPN tabs")
+
+    assert future.result(timeout=10) == tmp_path / "ilpn_tab_combined.jpg"
+    assert (tmp_path / "ilpn_tab_combined.jpg").exists()
+    assert mgr.sequence == 1
+
+
+def test_failed_background_save_raises_and_is_logged(tmp_path, monkeypatch):
+    logged = []
+    monkeypatch.setattr(helper, "app_log", logged.append)
+    stitcher = helper.TabImageStitcher()
+    stitcher.add(_jpeg_bytes((120, 80), "green"))
+
+    future = stitcher.save_async(tmp_path / "missing" / "combined.jpg", "JPEG", {}, "", "")
+    helper.TabImageStitcher.close()
+
+    with pytest.raises(OSError):
+        future.result()
+    assert any("Combined tab capture failed" in line for line in logged)
+    assert helper.TabImageStitcher._executor is None
@@ -0,0 +1,92 @@
+"""
+Tests for the HTTP integration transport against the local stub endpoint.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from operations.integration_stub import IntegrationStubServer, build_response
+from operations.post_message import HttpPostTransport
+
+ASN_XML = (
+    "<?xml version=\"1.0\"?><tXML><Header><Message_Type>ASN</Message_Type></Header>"
+    "<Message><ASN><ASNID>A1</ASNID></ASN></Message></tXML>"
+)
+
+
+@pytest.fixture
+def stub():
+    with IntegrationStubServer() as server:
+        yield server
+
+
+class TestBuildResponse:
+    """Tests for the stub response envelope."""
+
+    def test_success_response_is_interpreted_as_success(self):
+        """Test well-formed XML yields a response the interpreter accepts."""
+        transport = HttpPostTransport("http://unused", session=MagicMock())
+        info = transport._interpret_response(build_response(ASN_XML, 7))
+
+        assert info["is_error"] is False
+        assert info["payload"]["message_type"] == "ASN"
+        assert info["payload"]["internal_id"] == "7"
+
+    def test_invalid_xml_is_interpreted_as_error(self):
+        """Test malformed XML yields a rejection with exception details."""
+        transport = HttpPostTransport("http://unused", session=MagicMock())
+        info = transport._interpret_response(build_response("<tXML>", 1))
+
+        assert info["is_error"] is True
+        assert "Invalid XML" in info["summary"]
+
+
+class TestHttpPostTransport:
+    """Tests for HttpPostTransport posting to the stub server."""
+
+    def test_requires_endpoint(self):
+        """Test an empty endpoint is rejected."""
+        with pytest.raises(ValueError):
+            HttpPostTransport("")
+
+    def test_from_settings_uses_integration_credentials(self):
+        """Test basic auth comes from INTEGRATION_USER/PASS, never the UI login."""
+        settings = MagicMock()
+        settings.app.integration_endpoint = "http://unused"
+        settings.app.integration_concurrency = 2
+        settings.app.app_server_user = "ui-user"
+        settings.app.app_server_pass = "ui-pass"
+        settings.app.integration_user = ""
+
+        assert HttpPostTransport.from_settings(settings).session.auth is None
+
+        settings.app.integration_user = "svc"
+        settings.app.integration_pass = "secret"
+        assert HttpPostTransport.from_settings(settings).session.auth == ("svc", "secret")
+
+    def test_send_message_round_trip(self, stub):
+        """Test a single message is posted and interpreted."""
+        with HttpPostTransport(stub.url) as transport:
+            success, info = transport.send_message(ASN_XML)
+
+        assert success is True
+        assert info["payload"]["ack_code"] == "AA"
+        assert stub.received == [ASN_XML]
+
+    def test_send_messages_preserves_order(self, stub):
+        """Test concurrent batch results come back in input order."""
+        messages = [ASN_XML, "", "<broken", ASN_XML]
+        with HttpPostTransport(stub.url, concurrency=3) as transport:
+            results = transport.send_messages(messages)
+
+        assert [success for success, _ in results] == [True, False, False, True]
+        assert results[1][1]["summary"] == "Empty post message payload"
+        assert len(stub.received) == 3
+
+    def test_connection_error_returns_error_info(self):
+        """Test transport failures surface as error results instead of raising."""
+        transport = HttpPostTransport("http://127.0.0.1:1/integration", timeout_s=1)
+        success, info = transport.send_message(ASN_XML)
+        transport.close()
+
+        assert success is False
+        assert info["summary"].startswith("Integration POST failed")
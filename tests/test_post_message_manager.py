@@ -3,7 +3,13 @@ Comprehensive tests for operations/post_message.py PostMessageManager class.
 """
 import pytest
 from unittest.mock import MagicMock, Mock, patch, PropertyMock
-from operations.post_message import PostMessageManager
+from config.settings import Settings
+from operations.post_message import (
+    OVERLAY_MAX_CHARS,
+    RESPONSE_PRIORITY_SELECTORS,
+    SET_TEXTAREA_VALUE_JS,
+    PostMessageManager,
+)
 
 
 class TestPostMessageManagerInit:
@@ -100,6 +106,88 @@ class TestResolveFrame:
         assert result is mock_main_frame
 
 
+class TestSendMessages:
+    """Tests for send_messages batch method."""
+
+    def test_resolves_frame_once_for_all_messages(self):
+        """Test the frame is resolved and resized once per batch."""
+        mock_page = MagicMock()
+        mock_screenshot = MagicMock()
+        mock_frame = MagicMock()
+        mock_frame.is_detached.return_value = False
+        ok = {"raw": "", "summary": "OK", "payload": {}, "is_error": False}
+
+        manager = PostMessageManager(mock_page, mock_screenshot)
+
+        with patch.object(manager, '_resolve_frame', return_value=mock_frame) as resolve, \
+             patch.object(manager, '_resize_textareas') as resize, \
+             patch.object(manager, '_fill_message') as fill, \
+             patch.object(manager, '_submit_and_capture', return_value=ok):
+            results = manager.send_messages(["<A/>", "<B/>", "<C/>"])
+
+        assert [success for success, _ in results] == [True, True, True]
+        resolve.assert_called_once()
+        resize.assert_called_once()
+        assert fill.call_count == 3
+        fill.assert_called_with(mock_frame, "<C/>", capture=False)
+
+    def test_reports_per_message_errors(self):
+        """Test a failing message does not stop the batch."""
+        mock_page = MagicMock()
+        mock_screenshot = MagicMock()
+        mock_frame = MagicMock()
+        mock_frame.is_detached.return_value = False
+        ok = {"raw": "", "summary": "OK", "payload": {}, "is_error": False}
+
+        manager = PostMessageManager(mock_page, mock_screenshot)
+
+        with patch.object(manager, '_resolve_frame', return_value=mock_frame), \
+             patch.object(manager, '_resize_textareas'), \
+             patch.object(manager, '_fill_message', side_effect=[RuntimeError("boom"), None]), \
+             patch.object(manager, '_submit_and_capture', return_value=ok):
+            results = manager.send_messages(["<A/>", "<B/>"])
+
+        assert results[0][0] is False
+        assert "boom" in results[0][1]["summary"]
+        assert results[1][0] is True
+        mock_screenshot.capture.assert_called_once()
+
+    def test_skips_empty_messages(self):
+        """Test empty payloads are reported as errors without posting."""
+        mock_page = MagicMock()
+        mock_screenshot = MagicMock()
+        mock_frame = MagicMock()
+
+        manager = PostMessageManager(mock_page, mock_screenshot)
+
+        with patch.object(manager, '_resolve_frame', return_value=mock_frame), \
+             patch.object(manager, '_resize_textareas'), \
+             patch.object(manager, '_submit_and_capture') as submit:
+            results = manager.send_messages([""])
+
+        assert results == [(False, manager._error_info("Empty post message payload"))]
+        submit.assert_not_called()
+
+    def test_re_resolves_detached_frame(self):
+        """Test a detached frame is re-resolved before the next message."""
+        mock_page = MagicMock()
+        mock_screenshot = MagicMock()
+        stale_frame = MagicMock()
+        stale_frame.is_detached.return_value = True
+        fresh_frame = MagicMock()
+        ok = {"raw": "", "summary": "OK", "payload": {}, "is_error": False}
+
+        manager = PostMessageManager(mock_page, mock_screenshot)
+
+        with patch.object(manager, '_resolve_frame', side_effect=[stale_frame, fresh_frame]), \
+             patch.object(manager, '_resize_textareas'), \
+             patch.object(manager, '_fill_message') as fill, \
+             patch.object(manager, '_submit_and_capture', return_value=ok):
+            manager.send_messages(["<A/>"])
+
+        fill.assert_called_once_with(fresh_frame, "<A/>", capture=False)
+
+
 class TestIsErrorResponse:
     """Tests for _is_error_response method."""
 
@@ -418,6 +506,53 @@ class TestFormatXmlForOverlay:
 
         assert result == invalid_xml
 
+    def test_overlay_text_truncates_large_payloads(self):
+        """Test oversized overlay text is truncated instead of pretty-printed."""
+        mock_page = MagicMock()
+        mock_screenshot = MagicMock()
+        manager = PostMessageManager(mock_page, mock_screenshot)
+
+        large = "<ASN>" + "x" * (OVERLAY_MAX_CHARS * 2) + "</ASN>"
+
+        with patch.object(manager, '_format_xml_for_overlay') as fmt:
+            result = manager._overlay_text(large)
+
+        fmt.assert_not_called()
+        assert len(result) < OVERLAY_MAX_CHARS + 100
+        assert "truncated" in result
+
+
+class TestFillMessage:
+    """Tests for _fill_message method."""
+
+    def test_small_payload_is_formatted_and_filled(self):
+        """Test small payloads keep the pretty-printed fill path."""
+        manager = PostMessageManager(MagicMock(), MagicMock())
+        textarea = MagicMock()
+
+        with patch.object(manager, '_locate_textarea', return_value=textarea), \
+             patch.object(manager, '_mirror_response_for_capture'):
+            manager._fill_message(MagicMock(), "<ASN><ASNID>1</ASNID></ASN>", capture=False)
+
+        textarea.fill.assert_called_once()
+        textarea.evaluate.assert_not_called()
+
+    def test_large_payload_is_set_in_one_evaluate(self):
+        """Test payloads above the threshold skip formatting and keystroke fill."""
+        manager = PostMessageManager(MagicMock(), MagicMock())
+        textarea = MagicMock()
+        message = "<ASN>" + "x" * 100 + "</ASN>"
+
+        with patch.object(Settings.app, 'post_message_fast_fill_chars', 50), \
+             patch.object(manager, '_locate_textarea', return_value=textarea), \
+             patch.object(manager, '_format_xml_for_textarea') as fmt, \
+             patch.object(manager, '_mirror_response_for_capture'):
+            manager._fill_message(MagicMock(), message, capture=False)
+
+        fmt.assert_not_called()
+        textarea.fill.assert_not_called()
+        textarea.evaluate.assert_called_once_with(SET_TEXTAREA_VALUE_JS, message)
+
 
 class TestMarkResetRequired:
     """Tests for _mark_reset_required method."""
@@ -557,103 +692,79 @@ class TestReleasePostMessageFocus:
         manager._release_post_message_focus(mock_frame)
 
 
-class TestReadResponse:
-    """Tests for _read_response method."""
+class TestReadResult:
+    """Tests for _read_result method."""
 
-    def test_reads_response_from_priority_selector(self):
-        """Test reads response from priority textarea selector."""
-        mock_page = MagicMock()
-        mock_screenshot = MagicMock()
+    def test_reads_response_and_payload_in_one_evaluate(self):
+        """Test one evaluate returns the response, payload prefix and payload length."""
         mock_frame = MagicMock()
-        mock_locator = MagicMock()
-        mock_locator.input_value.return_value = "Response text"
-        mock_frame.locator.return_value.first = mock_locator
-
-        manager = PostMessageManager(mock_page, mock_screenshot)
+        mock_frame.evaluate.return_value = {
+            "response": {"selector": "textarea[id='dataForm:resultString']", "text": "Response  text"},
+            "body": "",
+            "payload": {"selector": "textarea[name='dataForm:xmlString']", "text": "<ASN>", "length": 15},
+        }
+        manager = PostMessageManager(MagicMock(), MagicMock())
 
-        with patch.object(manager, '_resize_textareas'):
-            result = manager._read_response(mock_frame)
+        result = manager._read_result(mock_frame)
 
-        assert result == "Response text"
+        assert result == ("Response text", "<ASN>", 15)
+        mock_frame.evaluate.assert_called_once()
+        assert mock_frame.evaluate.call_args[0][1]["maxChars"] == OVERLAY_MAX_CHARS
+        assert manager._payload_selector == "textarea[name='dataForm:xmlString']"
 
     def test_handles_html_entities_in_response(self):
         """Test handles HTML entities in response."""
-        mock_page = MagicMock()
-        mock_screenshot = MagicMock()
         mock_frame = MagicMock()
-        mock_locator = MagicMock()
-        mock_locator.input_value.return_value = "&lt;Response&gt;Test&lt;/Response&gt;"
-        mock_frame.locator.return_value.first = mock_locator
-
-        manager = PostMessageManager(mock_page, mock_screenshot)
+        mock_frame.evaluate.return_value = {
+            "response": {"selector": "textarea[name='dataForm:resultString']", "text": "&lt;Response&gt;Test&lt;/Response&gt;"},
+        }
+        manager = PostMessageManager(MagicMock(), MagicMock())
 
-        with patch.object(manager, '_resize_textareas'):
-            result = manager._read_response(mock_frame)
+        response, _, _ = manager._read_result(mock_frame)
 
-        assert "<Response>" in result
-        assert "Test" in result
+        assert response == "<Response>Test</Response>"
 
-    def test_returns_empty_when_no_response_found(self):
-        """Test returns empty string when no response found."""
-        mock_page = MagicMock()
-        mock_screenshot = MagicMock()
+    def test_remembers_only_priority_selectors(self):
+        """Test a priority selector that answered is tried first next time; fallback winners are not kept."""
         mock_frame = MagicMock()
-        mock_locator = MagicMock()
-        mock_locator.wait_for.side_effect = Exception("Not found")
-        mock_frame.locator.return_value.first = mock_locator
-
-        # Make body return empty
-        body_locator = MagicMock()
-        body_locator.inner_text.return_value = ""
-
-        def locator_side_effect(selector):
-            if selector == "body":
-                mock = MagicMock()
-                mock.inner_text.return_value = ""
-                return mock
-            return MagicMock(first=mock_locator)
-
-        mock_frame.locator.side_effect = locator_side_effect
-
-        manager = PostMessageManager(mock_page, mock_screenshot)
-
-        with patch.object(manager, '_resize_textareas'):
-            result = manager._read_response(mock_frame)
-
-        assert result == ""
-
+        mock_frame.evaluate.side_effect = [
+            {"response": {"selector": "textarea[name='resultString']", "text": "ok"}},
+            {"response": {"selector": "pre", "text": "stale"}},
+            {"response": None},
+        ]
+        manager = PostMessageManager(MagicMock(), MagicMock())
+
+        for _ in range(3):
+            manager._read_result(mock_frame)
+
+        priorities = [call[0][1]["priority"] for call in mock_frame.evaluate.call_args_list]
+        assert priorities[0] == list(RESPONSE_PRIORITY_SELECTORS)
+        assert priorities[1][0] == priorities[2][0] == "textarea[name='resultString']"
+        assert sorted(priorities[2]) == sorted(RESPONSE_PRIORITY_SELECTORS)
+
+    def test_falls_back_to_body_text(self):
+        """Test body text is used when no candidate has content."""
+        mock_frame = MagicMock()
+        mock_frame.evaluate.return_value = {"response": None, "body": "  Page   body  ", "payload": None}
+        manager = PostMessageManager(MagicMock(), MagicMock())
 
-class TestReadPayload:
-    """Tests for _read_payload method."""
+        assert manager._read_result(mock_frame) == ("Page body", "", 0)
 
-    def test_reads_payload_from_priority_selector(self):
-        """Test reads payload from priority textarea selector."""
-        mock_page = MagicMock()
-        mock_screenshot = MagicMock()
+    def test_returns_empty_when_evaluate_fails(self):
+        """Test returns empty values when the frame cannot be read."""
         mock_frame = MagicMock()
-        mock_locator = MagicMock()
-        mock_locator.input_value.return_value = "<ASN>Test</ASN>"
-        mock_frame.locator.return_value.first = mock_locator
+        mock_frame.evaluate.side_effect = Exception("Frame detached")
+        manager = PostMessageManager(MagicMock(), MagicMock())
 
-        manager = PostMessageManager(mock_page, mock_screenshot)
-        result = manager._read_payload(mock_frame)
+        assert manager._read_result(mock_frame) == ("", "", 0)
 
-        assert result == "<ASN>Test</ASN>"
-
-    def test_returns_empty_when_no_payload_found(self):
-        """Test returns empty string when no payload found."""
-        mock_page = MagicMock()
-        mock_screenshot = MagicMock()
-        mock_frame = MagicMock()
-        mock_locator = MagicMock()
-        mock_locator.wait_for.side_effect = Exception("Not found")
-        mock_locator.input_value.return_value = ""
-        mock_frame.locator.return_value.first = mock_locator
+    def test_truncated_payload_overlay_reports_full_length(self):
+        """Test the overlay notes the in-page length when only a prefix came back."""
+        manager = PostMessageManager(MagicMock(), MagicMock())
 
-        manager = PostMessageManager(mock_page, mock_screenshot)
-        result = manager._read_payload(mock_frame)
+        result = manager._overlay_text("x" * OVERLAY_MAX_CHARS, 3_000_000)
 
-        assert result == ""
+        assert "3,000,000 chars total" in result
 
 
 @pytest.mark.parametrize("response_text,expected_error", [
@@ -0,0 +1,155 @@
+"""
+Tests for background prefetching of post message payloads.
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import main
+from config.settings import StepNames
+from core.post_message_payload import customize_asn_payload
+from core.post_payload_prefetch import PostPayloadPrefetcher
+from operations.workflow import WorkflowStageExecutor
+
+
+def _settings(warehouse="AUR"):
+    settings = MagicMock()
+    settings.app.step_names = StepNames()
+    settings.app.change_warehouse = warehouse
+    settings.app.requires_prod_confirmation = False
+    return settings
+
+
+def _post(n):
+    return {"postMessage": {"enabled": True, "type": "ASN", "source": "db", "asn_items": [{"ItemName": f"I{n}"}]}}
+
+
+def _jobs(count):
+    return list(enumerate([(f"wf{n}", _post(n)) for n in range(1, count + 1)], 1))
+
+
+def _describe(job):
+    return job[0], job[1][1]
+
+
+def _builder(step_data, message_type, facility, db_env):
+    return f"<xml>{step_data['asn_items'][0]['ItemName']}@{facility}</xml>", {"asn_id": step_data["asn_items"][0]["ItemName"]}
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("core.post_payload_prefetch.app_log"), patch("operations.workflow.app_log"):
+        yield
+
+
+class TestPostPayloadPrefetcher:
+
+    def test_pipeline_yields_jobs_in_order_with_their_payloads(self):
+        prefetcher = PostPayloadPrefetcher(_settings(), depth=2, builder=_builder)
+        seen = []
+
+        for index, (name, steps) in prefetcher.pipeline(_jobs(4), _describe):
+            prefetched = prefetcher.take(index, steps["postMessage"], "AUR")
+            seen.append((name, prefetched.payload))
+
+        assert seen == [(f"wf{n}", f"<xml>I{n}@AUR</xml>") for n in range(1, 5)]
+
+    def test_producer_runs_at_most_depth_ahead(self):
+        built = []
+        fourth_built = threading.Event()
+
+        def builder(step_data, *args):
+            built.append(step_data["asn_items"][0]["ItemName"])
+            if len(built) == 4:
+                fourth_built.set()
+            return "<xml/>", {}
+
+        prefetcher = PostPayloadPrefetcher(_settings(), depth=2, builder=builder)
+        pipeline = prefetcher.pipeline(_jobs(10), _describe)
+        next(pipeline)  # runner is busy with workflow 1
+
+        # one handed over, two queued, one built and blocked waiting for room
+        assert fourth_built.wait(2)
+        time.sleep(3 * PostPayloadPrefetcher.POLL_S)
+        assert built == ["I1", "I2", "I3", "I4"]
+        pipeline.close()
+        assert prefetcher.abandoned == 3
+
+    def test_take_rejects_stale_payloads(self):
+        prefetcher = PostPayloadPrefetcher(_settings(), depth=1, builder=_builder)
+        pipeline = prefetcher.pipeline(_jobs(1), _describe)
+        index, (_, steps) = next(pipeline)
+
+        assert prefetcher.take(index, steps["postMessage"], "COP") is None  # warehouse changed
+        assert prefetcher.take(index, steps["postMessage"], "AUR") is None  # single use
+        pipeline.close()
+
+    def test_builder_errors_fall_back_to_no_prefetch(self):
+        prefetcher = PostPayloadPrefetcher(_settings(), builder=MagicMock(side_effect=RuntimeError("db down")))
+        jobs = list(prefetcher.pipeline(_jobs(2), _describe))
+
+        assert len(jobs) == 2
+        assert prefetcher.take(2, jobs[1][1][1]["postMessage"], "AUR") is None
+
+
+    def test_source_errors_reach_the_runner_after_earlier_jobs(self):
+        def source():
+            yield from _jobs(1)
+            raise ValueError("bad record 2")
+
+        prefetcher = PostPayloadPrefetcher(_settings(), builder=_builder)
+        seen = []
+
+        with pytest.raises(ValueError, match="bad record 2"):
+            for index, _ in prefetcher.pipeline(source(), _describe):
+                seen.append(index)
+
+        assert seen == [1]
+
+
+class TestExecutorUsesPrefetch:
+
+    def _executor(self, prefetcher):
+        step_execution = MagicMock()
+        orchestrator = MagicMock()
+        orchestrator.run_with_retry.side_effect = lambda fn, label: (fn(), MagicMock(success=True))[1]
+        return WorkflowStageExecutor(prefetcher.settings, orchestrator, step_execution, prefetcher), step_execution
+
+    def test_post_step_uses_prefetched_payload(self):
+        prefetcher = PostPayloadPrefetcher(_settings(), builder=_builder)
+        executor, step_execution = self._executor(prefetcher)
+        pipeline = prefetcher.pipeline(_jobs(1), _describe)
+        index, (_, steps) = next(pipeline)
+
+        with patch("operations.workflow.build_post_message_payload") as sync_build:
+            metadata, ok = executor.handle_post_step(steps["postMessage"], {}, index)
+
+        assert ok and metadata == {"asn_id": "I1"}
+        sync_build.assert_not_called()
+        step_execution.run_post_message.assert_called_once_with("<xml>I1@AUR</xml>")
+        pipeline.close()
+
+    def test_run_automation_pipelines_through_the_prefetcher(self):
+        prefetcher = PostPayloadPrefetcher(_settings(), builder=_builder)
+        wm_ops = MagicMock()
+        wm_ops.recovery = None
+        wm_ops.prefetcher = prefetcher
+        payloads = []
+        wm_ops.executor.run_step.side_effect = lambda name, data, meta, idx: (
+            payloads.append(prefetcher.take(idx, data, "AUR").payload) or meta, True
+        )
+
+        with patch("main.app_log"):
+            main.run_automation(MagicMock(), wm_ops, workflows=[name_steps for _, name_steps in _jobs(3)])
+
+        assert payloads == ["<xml>I1@AUR</xml>", "<xml>I2@AUR</xml>", "<xml>I3@AUR</xml>"]
+
+
+def test_asn_ids_stay_unique_when_built_in_the_same_second():
+    xml = "<root><ASN><ASNID>OLD</ASNID></ASN></root>"
+
+    ids = {customize_asn_payload(xml)[1]["asn_id"] for _ in range(3)}
+
+    assert len(ids) == 3
@@ -344,6 +344,21 @@ class TestOnQtyEntered:
             mock_cache.assert_not_called()
             mock_handle.assert_not_called()
 
+    def test_handle_open_ui_queues_to_worker(self, operation):
+        """Test detours are queued on the background worker instead of run inline."""
+        operation.detour_worker = MagicMock()
+        operation.detour_worker.submit.return_value = True
+        operation._screen_context = {"asn": "ASN1", "item": "ITEM1", "ilpn": "L1"}
+        cfg = {"match_text": "iLPNs"}
+
+        with patch('operations.inbound.receive.run_open_ui_detours') as mock_run:
+            assert operation._handle_open_ui(cfg) is True
+
+        mock_run.assert_not_called()
+        operation.detour_worker.submit.assert_called_once_with(
+            cfg, operation._screen_context, label="ASN1/ITEM1"
+        )
+
 
 class TestOnSuggestedLocation:
     """Tests for _on_suggested_location method."""
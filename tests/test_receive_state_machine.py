@@ -10,8 +10,11 @@ from operations.inbound.receive_state_machine import (
     ReceiveContext,
     InitHandler,
     QtyEnteredHandler,
+    ScreenSnapshot,
+    SCREEN_SNAPSHOT_JS,
 )
 from config.operations_config import OperationConfig
+from core.state_metrics import StateLatencyStats
 
 
 class TestReceiveContext:
@@ -141,6 +144,96 @@ class TestQtyEnteredHandler:
         assert "deviation" in (machine_with_location.context.error_message or "").lower()
 
 
+class TestScreenSnapshotClassifier:
+    """Tests for single-snapshot state classification."""
+
+    @pytest.fixture
+    def machine(self, mock_rf_workflows, mock_screenshot_mgr):
+        machine = ReceiveStateMachine(
+            rf=mock_rf_workflows,
+            screenshot_mgr=mock_screenshot_mgr,
+            selectors=OperationConfig.RECEIVE_SELECTORS,
+        )
+        machine.rf = MagicMock()
+        machine.read_screen_text = MagicMock(side_effect=AssertionError("should not read text separately"))
+        machine.is_element_visible = MagicMock(side_effect=AssertionError("should not probe selectors"))
+        return machine
+
+    def _frame(self, machine, text="", visible=()):
+        frame = machine.rf.primitive.get_iframe.return_value
+        frame.evaluate.return_value = {"text": text, "visible": {sel: True for sel in visible}}
+        return frame
+
+    def test_snapshot_uses_single_evaluate(self, machine):
+        """Test text and every selector's visibility come from one evaluate call."""
+        frame = self._frame(machine, "ACN: 123", [OperationConfig.RECEIVE_SELECTORS.item])
+
+        snapshot = machine.snapshot_screen()
+
+        frame.evaluate.assert_called_once_with(SCREEN_SNAPSHOT_JS, machine.snapshot_selectors())
+        assert snapshot.text == "acn: 123"
+        assert snapshot.shows(OperationConfig.RECEIVE_SELECTORS.item)
+        assert not snapshot.shows(OperationConfig.RECEIVE_SELECTORS.asn)
+
+    def test_detect_current_state_classifies_from_one_snapshot(self, machine):
+        """Test detection evaluates all predicates against one snapshot."""
+        frame = self._frame(machine, "blind ilpn#", [])
+
+        assert machine.detect_current_state() == ReceiveState.AWAITING_BLIND_ILPN
+        assert frame.evaluate.call_count == 1
+
+    def test_detect_prefers_states_likely_after_last_state(self, machine):
+        """Test a screen matching several states resolves to the one following the failed step."""
+        selectors = OperationConfig.RECEIVE_SELECTORS
+        self._frame(machine, "", [selectors.asn, selectors.location])
+        machine.context = ReceiveContext()
+        machine.state = ReceiveState.ITEM_SCANNED
+        machine._transition_to(ReceiveState.ERROR, "qty failed")
+
+        assert machine.detect_current_state() == ReceiveState.AWAITING_LOCATION
+
+    def test_qty_branch_checks_share_snapshot(self, machine):
+        """Test post-quantity branching reads the screen once."""
+        frame = self._frame(machine, "exception r-stage", [])
+        machine.context = ReceiveContext()
+
+        assert QtyEnteredHandler().execute(machine) == ReceiveState.CANT_FIND_PUTAWAY_LOCATION
+        assert frame.evaluate.call_count == 1
+
+    def test_qty_branch_waits_for_the_next_prompt_to_render(self, machine):
+        """Test a snapshot taken before the next prompt renders is retried, not classified unknown."""
+        frame = machine.rf.primitive.get_iframe.return_value
+        frame.evaluate.side_effect = [{"text": "", "visible": {}}, {"text": "aloc: a-01", "visible": {}}]
+        machine.context = ReceiveContext()
+
+        assert QtyEnteredHandler().execute(machine) == ReceiveState.AWAITING_LOCATION
+        assert frame.evaluate.call_count == 2
+
+    def test_qty_branch_gives_up_after_the_bounded_wait(self, machine, monkeypatch):
+        """Test an unrecognised screen still errors once the short wait runs out."""
+        self._frame(machine, "something else", [])
+        machine.context = ReceiveContext()
+        monkeypatch.setattr(QtyEnteredHandler, "BRANCH_WAIT_MS", 50)
+
+        assert QtyEnteredHandler().execute(machine) == ReceiveState.ERROR
+        assert machine.context.error_message == "Unknown screen state after quantity"
+
+    def test_snapshot_falls_back_without_waiting(self, mock_rf_workflows, mock_screenshot_mgr):
+        """Test frames that can't evaluate fall back to zero-wait selector probes."""
+        machine = ReceiveStateMachine(
+            rf=mock_rf_workflows,
+            screenshot_mgr=mock_screenshot_mgr,
+            selectors=OperationConfig.RECEIVE_SELECTORS,
+        )
+        machine.read_screen_text = MagicMock(return_value="aloc")
+        machine.is_element_visible = MagicMock(return_value=False)
+
+        snapshot = machine.snapshot_screen()
+
+        assert snapshot == ScreenSnapshot("aloc", {sel: False for sel in machine.snapshot_selectors()})
+        assert all(call.kwargs == {"timeout": 0} for call in machine.is_element_visible.call_args_list)
+
+
 class TestInitHandler:
     """Tests for initialization handler."""
 
@@ -217,6 +310,44 @@ class TestFullWorkflow:
         assert machine.state == ReceiveState.COMPLETE
         assert len(machine.context.transitions) > 0
 
+    def test_run_records_state_timings(self, mock_rf_workflows, mock_screenshot_mgr):
+        """Test each executed state gets a timing and the run feeds shared latency stats."""
+        stats = StateLatencyStats()
+        machine = ReceiveStateMachine(
+            rf=mock_rf_workflows,
+            screenshot_mgr=mock_screenshot_mgr,
+            selectors=OperationConfig.RECEIVE_SELECTORS,
+            latency_stats=stats,
+        )
+        mock_rf_workflows.navigate_to_menu_by_search.return_value = False
+
+        machine.run(asn="12345678", item="TESTITEM", quantity=1)
+
+        assert machine.context.timings[0].state == "INIT"
+        assert len(machine.context.transition_times) == len(machine.context.transitions)
+        assert stats.summary()["INIT"]["count"] == 1
+
+    @pytest.mark.parametrize("auto_handle,flow_hint,warmed", [
+        (True, None, True),
+        (False, "CANT_FIND_PUTAWAY_LOCATION", True),
+        (False, None, False),
+    ])
+    def test_rstage_pool_warmed_for_auto_handled_receives(
+        self, mock_rf_workflows, mock_screenshot_mgr, auto_handle, flow_hint, warmed
+    ):
+        """Test any receive that may auto-handle the R-stage prompt starts the location prefetch."""
+        machine = ReceiveStateMachine(
+            rf=mock_rf_workflows,
+            screenshot_mgr=mock_screenshot_mgr,
+            selectors=OperationConfig.RECEIVE_SELECTORS,
+        )
+        mock_rf_workflows.navigate_to_menu_by_search.return_value = False
+
+        with patch("operations.inbound.receive_state_machine._rstage_provider") as provider:
+            machine.run(asn="12345678", item="TESTITEM", quantity=1, flow_hint=flow_hint, auto_handle=auto_handle)
+
+        assert provider.called is warmed
+
     def test_error_recovery_with_retry(self, mock_rf_workflows, mock_screenshot_mgr):
         """Test that errors trigger retry logic."""
         machine = ReceiveStateMachine(
@@ -0,0 +1,153 @@
+"""
+Tests for retry backoff, error classification and the per-run retry budget.
+"""
+import random
+
+import pytest
+from unittest.mock import MagicMock, patch
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from core.orchestrator import AutomationOrchestrator
+from utils.eval_utils import PageUnavailableError
+from utils.retry import (
+    DETERMINISTIC,
+    TRANSIENT,
+    UNKNOWN,
+    BackoffPolicy,
+    RetryBudget,
+    RetryExhausted,
+    classify_error,
+    retry,
+)
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    with patch("utils.retry.app_log"):
+        yield
+
+
+class TestBackoffPolicy:
+
+    def test_exponential_growth_is_capped(self):
+        policy = BackoffPolicy(base_s=0.5, cap_s=3.0, jitter=False)
+
+        assert [policy.delay(n) for n in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    def test_full_jitter_stays_within_capped_window(self):
+        policy = BackoffPolicy(base_s=1.0, cap_s=4.0)
+        rng = random.Random(7)
+
+        delays = [policy.delay(5, rng) for _ in range(200)]
+
+        assert all(0.0 <= d <= 4.0 for d in delays)
+        assert max(delays) - min(delays) > 1.0
+
+
+class TestClassifyError:
+
+    @pytest.mark.parametrize("exc", [
+        PlaywrightTimeoutError("Timeout 5000ms exceeded"),
+        PageUnavailableError("page closed"),
+        RuntimeError("Target closed"),
+        Exception("java.sql.SQLRecoverableException: IO Error: Connection reset"),
+        Exception("ORA-12170: TNS:Connect timeout occurred"),
+    ])
+    def test_transient(self, exc):
+        assert classify_error(exc) == TRANSIENT
+
+    @pytest.mark.parametrize("exc", [
+        RuntimeError("Navigation failed at ASN: Invalid test data"),
+        ValueError("Validation failed for quantity"),
+        KeyError("asn"),
+        AssertionError("bad state"),
+    ])
+    def test_deterministic(self, exc):
+        assert classify_error(exc) == DETERMINISTIC
+
+    @pytest.mark.parametrize("exc", [
+        ValueError("boom"),
+        RuntimeError("WebSocket frame rejected: invalid payload"),
+        RuntimeError("Disk io errors logged for report.csv"),
+    ])
+    def test_unrecognized_errors_are_unknown(self, exc):
+        assert classify_error(exc) == UNKNOWN
+
+
+class TestRetryPolicies:
+
+    def test_deterministic_error_is_not_retried(self):
+        func = MagicMock(side_effect=RuntimeError("Invalid test data"))
+
+        wrapped = retry(max_attempts=3, classify=classify_error, reraise=True, log_prefix="op")(func)
+
+        with pytest.raises(RetryExhausted) as info:
+            wrapped()
+        assert func.call_count == 1
+        assert info.value.attempts == 1
+
+    @pytest.mark.parametrize("side_effect", [[ValueError("boom"), "ok"], [False, "ok"]])
+    def test_unknown_errors_and_false_results_retry_only_when_enabled(self, side_effect):
+        strict = MagicMock(side_effect=list(side_effect))
+        lenient = MagicMock(side_effect=list(side_effect))
+
+        assert retry(max_attempts=2, classify=classify_error, retry_unknown=False, log_prefix="op")(strict)() is None
+        assert retry(max_attempts=2, classify=classify_error, log_prefix="op")(lenient)() == "ok"
+        assert strict.call_count == 1
+
+    def test_backoff_sleeps_between_attempts(self):
+        sleeps = []
+        func = MagicMock(side_effect=[PlaywrightTimeoutError("t"), PlaywrightTimeoutError("t"), "ok"])
+        policy = BackoffPolicy(base_s=0.1, cap_s=1.0, jitter=False)
+
+        result = retry(max_attempts=3, backoff=policy, sleep=sleeps.append, log_prefix="op")(func)()
+
+        assert result == "ok"
+        assert sleeps == [0.1, 0.2]
+
+    def test_shared_budget_stops_retry_storm(self):
+        budget = RetryBudget(1)
+        failing = MagicMock(side_effect=PlaywrightTimeoutError("t"))
+        wrapped = retry(max_attempts=3, budget=budget, log_prefix="op")(failing)
+
+        wrapped()
+        wrapped()
+
+        assert failing.call_count == 3  # 1 + one budgeted retry, then 1 with no retries
+        assert budget.remaining == 0
+
+
+class TestOrchestratorRetryPolicy:
+
+    def test_uses_configured_budget_and_backoff(self):
+        settings = MagicMock()
+        settings.app.retry_budget = 0
+        settings.app.retry_backoff_base_s = 0.25
+        settings.app.retry_backoff_cap_s = 2.0
+
+        orch = AutomationOrchestrator(settings, max_retries=3)
+        func = MagicMock(side_effect=PlaywrightTimeoutError("t"))
+
+        with patch("core.orchestrator.app_log"):
+            result = orch.run_with_retry(func, "Op")
+
+        assert result.success is False
+        assert func.call_count == 1
+        assert orch.backoff.base_s == 0.25
+        assert orch.backoff.cap_s == 2.0
+
+    @pytest.mark.parametrize("retry_unknown,calls", [(False, 1), (True, 2)])
+    def test_unknown_failures_retry_behind_setting(self, retry_unknown, calls):
+        settings = MagicMock()
+        settings.app.retry_budget = 5
+        settings.app.retry_backoff_base_s = 0
+        settings.app.retry_backoff_cap_s = 0
+        settings.app.retry_unknown_errors = retry_unknown
+
+        orch = AutomationOrchestrator(settings, max_retries=2)
+        func = MagicMock(return_value=False)
+
+        with patch("core.orchestrator.app_log"):
+            orch.run_with_retry(func, "Op")
+
+        assert func.call_count == calls
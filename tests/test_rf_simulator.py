@@ -0,0 +1,181 @@
+"""
+Tests for the offline RF terminal simulator.
+"""
+import http.cookiejar
+import os
+import urllib.parse
+import urllib.request
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.page_manager import PageManager
+from operations.inbound.receive import ReceiveOperation
+from operations.outbound.loading import LoadingOperation
+from operations.rf_simulator import RFSession, RFSimulatorServer
+from ui.navigation import NavigationManager
+from ui.rf_menu import RFMenuManager
+
+
+def _text(session: RFSession) -> str:
+    screen = session.screen()
+    return " ".join([screen.title, *screen.lines]).lower()
+
+
+class TestRFSession:
+    """Tests for the simulated RF screen flow."""
+
+    def test_search_and_receive_location_flow(self):
+        """Test search, ASN, item, qty and location screens in order."""
+        session = RFSession()
+        session.hotkey("search")
+        session.submit({"choice": "Recv - ASN"})
+        assert "search results" in _text(session)
+
+        session.submit({"choice": "1"})
+        session.submit({"shipinpId": "10000001"})
+        session.submit({"verfiyItemBrcd": "ITEM-A"})
+        assert "shpd: 100" in _text(session)
+
+        session.submit({"input1input2": "5"})
+        assert "aloc" in _text(session)
+
+        session.submit({"dataForm:locn": "A0101"})
+        assert session.screen_name == "item"
+        assert session.received[("10000001", "ITEM-A")] == 5
+
+    @pytest.mark.parametrize("asn,item,marker", [
+        ("10000002", "ITEM-B", "blind ilpn"),
+        ("10000003", "ITEM-C", "r-stage"),
+    ])
+    def test_deviation_prompts(self, asn, item, marker):
+        """Test flows configured for blind iLPN and R-stage show their prompts."""
+        session = RFSession()
+        session.screen_name = "asn"
+        session.submit({"shipinpId": asn})
+        session.submit({"verfiyItemBrcd": item})
+        session.submit({"input1input2": "1"})
+
+        text = _text(session)
+        assert marker in text
+        assert "location" not in text
+
+    def test_error_screen_and_accept(self):
+        """Test invalid input shows an error screen and Ctrl+A returns to the prompt."""
+        session = RFSession()
+        session.screen_name = "asn"
+        session.submit({"shipinpId": "NOPE"})
+
+        assert session.screen().error is True
+        assert "invalid asn" in _text(session)
+
+        session.hotkey("accept")
+        assert session.screen_name == "asn"
+        assert session.message is None
+
+    def test_tran_id_toggle(self):
+        """Test Ctrl+P shows tran ids on the home menu."""
+        session = RFSession()
+        assert "#" not in _text(session)
+        session.hotkey("tran")
+        assert "#1012408" in _text(session)
+
+    def test_load_trailer_info_screen(self):
+        """Test a valid load shows an info message and records the load."""
+        session = RFSession()
+        session.screen_name = "load"
+        session.submit({"barcode20": "SHP0001", "barcode13": "DD01", "barcode32": "BOL9"})
+
+        assert "info: shipment shp0001 loaded" in _text(session)
+        assert session.loaded == [{"shipment": "SHP0001", "dock_door": "DD01", "bol": "BOL9"}]
+
+
+class TestRFSimulatorServer:
+    """Tests for the simulator HTTP endpoints."""
+
+    def test_shell_and_rf_round_trip(self):
+        """Test the shell hosts the menu launcher and uxiframe, and form posts advance the session."""
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        with RFSimulatorServer() as server:
+            shell = opener.open(server.url).read().decode()
+            assert 'name="uxiframe-' in shell and 'id="mps_menu-' in shell
+            assert "RF Menu (Distribution)" in shell and "/RFMenu/key?k=home" in shell
+
+            home = opener.open(server.url + "RFMenu/screen").read().decode()
+            assert "RF Home" in home
+
+            form = urllib.parse.urlencode({"choice": "1"}).encode()
+            asn = opener.open(server.url + "RFMenu/submit", data=form).read().decode()
+            assert 'id="shipinpId"' in asn
+            assert len(server.sessions) == 1
+
+
+@pytest.fixture(scope="module")
+def browser():
+    """Headless Chromium (PLAYWRIGHT_CHROMIUM_EXECUTABLE overrides the binary), or skip when none is installed."""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch(
+                headless=True, executable_path=os.environ.get("PLAYWRIGHT_CHROMIUM_EXECUTABLE") or None
+            )
+        except Exception as exc:
+            pytest.skip(f"Chromium not available: {exc}")
+        yield browser
+        browser.close()
+
+
+class TestSimulatorEndToEnd:
+    """Drive the real operations against the simulator in headless Chromium."""
+
+    def _open_rf_menu(self, browser, server):
+        page = browser.new_page(viewport={"width": 1280, "height": 900})
+        page_mgr = PageManager(page)
+        screenshot_mgr = MagicMock()
+        page.goto(server.url)
+        assert NavigationManager(page, screenshot_mgr).open_menu_item("RF MENU", "RF Menu (Distribution)")
+        return page, page_mgr, screenshot_mgr, RFMenuManager(page, page_mgr, screenshot_mgr)
+
+    def test_menu_catalog_and_window_registry(self, browser):
+        """Test the Ext shim launches the RF Menu from the catalog and feeds the window registry."""
+        with RFSimulatorServer() as server:
+            page = browser.new_page(viewport={"width": 1280, "height": 900})
+            try:
+                page.goto(server.url)
+                nav = NavigationManager(page, MagicMock())
+                assert nav._launch_from_catalog("rf menu (distribution)") is True
+                windows = nav.windows.list_windows()
+                nav.close_active_windows()
+                remaining = nav.windows.list_windows()
+            finally:
+                page.close()
+
+            assert [w["title"] for w in windows] == ["RF Menu (Distribution)"]
+            assert remaining is None
+
+    def test_receive_operation(self, browser):
+        """Test ReceiveOperation receives an ASN line through the launched RF Menu."""
+        with RFSimulatorServer() as server:
+            page, page_mgr, screenshot_mgr, rf_menu = self._open_rf_menu(browser, server)
+            try:
+                ok = ReceiveOperation(page, page_mgr, screenshot_mgr, rf_menu).execute("10000001", "ITEM-A", 5)
+            finally:
+                page.close()
+
+            assert ok is True
+            (session,) = server.sessions.values()
+            assert session.received == {("10000001", "ITEM-A"): 5}
+
+    def test_loading_operation(self, browser):
+        """Test LoadingOperation loads a shipment through the launched RF Menu."""
+        with RFSimulatorServer() as server:
+            page, page_mgr, screenshot_mgr, rf_menu = self._open_rf_menu(browser, server)
+            try:
+                ok = LoadingOperation(page, page_mgr, screenshot_mgr, rf_menu).execute("SHP0001", "DD01", "BOL9")
+            finally:
+                page.close()
+
+            assert ok is True
+            (session,) = server.sessions.values()
+            assert session.loaded == [{"shipment": "SHP0001", "dock_door": "DD01", "bol": "BOL9"}]
@@ -0,0 +1,92 @@
+"""
+Tests for the prefetched R-stage location provider.
+"""
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from operations.inbound import rstage_locations
+from operations.inbound.rstage_locations import RStageLocationProvider, load_rstage_locations
+
+
+@pytest.fixture(autouse=True)
+def reset_providers():
+    RStageLocationProvider.reset()
+    yield
+    RStageLocationProvider.reset()
+
+
+class TestLoadRStageLocations:
+    """Tests for the batch query helper."""
+
+    def test_reads_batch_from_one_connection(self):
+        """Test the batch query uses the limit and skips blank rows."""
+        db = MagicMock()
+        db.__enter__.return_value = db
+        db.fetchall.return_value = ([("RST01",), (None,), ("RST02 ",)], ["LOCN_BRCD"])
+
+        with patch.object(rstage_locations, "DB", return_value=db) as db_cls:
+            assert load_rstage_locations("dev", "WH1", 5) == ["RST01", "RST02"]
+
+        db_cls.assert_called_once_with("dev", "WH1")
+        assert "fetch first 5 rows only" in db.runSQL.call_args[0][0]
+
+
+class TestRStageLocationProvider:
+    """Tests for rotation, refresh and sharing."""
+
+    def test_rotates_least_recently_used(self):
+        """Test locations are handed out round-robin from one load."""
+        loader = MagicMock(return_value=["R1", "R2", "R3"])
+        provider = RStageLocationProvider("dev", "WH1", loader=loader)
+
+        picks = [provider.next_location() for _ in range(4)]
+
+        assert picks == ["R1", "R2", "R3", "R1"]
+        loader.assert_called_once_with("dev", "WH1", 25)
+
+    def test_refresh_keeps_usage_order_and_adds_new(self):
+        """Test a refresh puts unseen locations first and drops removed ones."""
+        provider = RStageLocationProvider("dev", "WH1", loader=MagicMock(return_value=["R1", "R2"]))
+        assert provider.next_location() == "R1"
+
+        provider._merge(["R2", "R1", "R9"])
+
+        assert list(provider._pool) == ["R9", "R2", "R1"]
+        provider._merge(["R1"])
+        assert list(provider._pool) == ["R1"]
+
+    def test_stale_pool_refreshes_in_background(self):
+        """Test a stale pool still answers immediately while a reload runs."""
+        release = threading.Event()
+        calls = []
+
+        def loader(env, whse, limit):
+            calls.append(whse)
+            if len(calls) > 1:
+                release.wait(5)
+            return ["R1"]
+
+        provider = RStageLocationProvider("dev", "WH1", refresh_s=0, loader=loader)
+        assert provider.next_location() == "R1"
+        assert provider.next_location() == "R1"
+        release.set()
+        provider._loading.join(5)
+
+        assert len(calls) >= 2
+
+    def test_failed_load_returns_none(self):
+        """Test loader errors surface as no location rather than an exception."""
+        provider = RStageLocationProvider("dev", "WH1", loader=MagicMock(side_effect=RuntimeError("down")))
+
+        assert provider.next_location() is None
+
+    def test_for_warehouse_shares_provider(self):
+        """Test providers are cached per environment and warehouse."""
+        with patch.object(RStageLocationProvider, "prefetch") as prefetch:
+            first = RStageLocationProvider.for_warehouse("dev", "WH1")
+            assert RStageLocationProvider.for_warehouse("dev", "WH1") is first
+            assert RStageLocationProvider.for_warehouse("dev", "WH2") is not first
+
+        assert prefetch.call_count == 2
@@ -277,6 +277,90 @@ class TestOperationRunner:
             log_calls = [str(call) for call in mock_log.call_args_list]
             assert any("payload" in str(call) for call in log_calls)
 
+    def test_post_batch_impl_opens_window_once(self, runner):
+        """Test _post_batch_impl opens Post Message once for all payloads."""
+        with patch('operations.runner.PostMessageManager') as mock_post_class:
+            mock_post = MagicMock()
+            mock_post.iter_send_messages.return_value = iter([
+                (True, {"summary": "Success", "payload": {}}),
+                (False, {"summary": "Error", "payload": {}}),
+            ])
+            mock_post_class.return_value = mock_post
+
+            result = runner._post_batch_impl(["A", "B"])
+
+            runner.nav_mgr.open_menu_item.assert_called_once_with(
+                "POST", "Post Message (Integration)"
+            )
+            mock_post.iter_send_messages.assert_called_once_with(["A", "B"])
+            assert result == [True, False]
+
+    def test_post_batch_impl_stops_at_first_reset(self, runner):
+        """Test a reset mid-batch stops sending and reports the outcomes read so far."""
+        from core.connection_guard import ConnectionResetDetected, PostBatchInterrupted
+
+        sent = []
+
+        def outcomes(payloads):
+            for payload in payloads:
+                sent.append(payload)
+                yield True, {"summary": "Success", "payload": {}}
+
+        runner.conn_guard.ensure_ok.side_effect = [None, None, ConnectionResetDetected("reset"), ConnectionResetDetected("reset")]
+        with patch('operations.runner.PostMessageManager') as mock_post_class:
+            mock_post_class.return_value.iter_send_messages.side_effect = outcomes
+
+            with pytest.raises(PostBatchInterrupted) as excinfo:
+                runner._post_batch_impl(["A", "B", "C"])
+
+        assert excinfo.value.sent == [True, True]
+        assert sent == ["A", "B"]
+
+    def test_post_batch_impl_uses_http_transport(self, runner):
+        """Test _post_batch_impl skips the UI when the HTTP transport is configured."""
+        runner.settings.app.post_message_transport = "http"
+        with patch('operations.runner.HttpPostTransport') as mock_transport_class:
+            transport = mock_transport_class.from_settings.return_value.__enter__.return_value
+            transport.send_messages.return_value = [(True, {"summary": "OK", "payload": {}})]
+
+            result = runner._post_batch_impl(["A"])
+
+            runner.nav_mgr.open_menu_item.assert_not_called()
+            transport.send_messages.assert_called_once_with(["A"])
+            assert result == [True]
+
+    def test_join_detours_reports_background_failures(self, runner):
+        """Test join_detours drains the worker and fails when any detour failed."""
+        from core.detour_worker import DetourResult
+
+        runner.detour_worker = MagicMock()
+        runner.detour_worker.drain.return_value = [
+            DetourResult("A/1", True),
+            DetourResult("A/2", False, "grid timeout"),
+        ]
+
+        assert runner.join_detours() is False
+        runner.detour_worker.drain.assert_called_once()
+
+    def test_close_detours_reports_and_drops_worker(self, runner):
+        """Test close_detours reports the worker's last results and forgets it."""
+        from core.detour_worker import DetourResult
+
+        worker = MagicMock()
+        worker.close.return_value = [DetourResult("A/1", False, "grid timeout")]
+        runner.detour_worker = worker
+
+        with patch("operations.runner.app_log") as mock_log:
+            runner.close_detours()
+
+        worker.close.assert_called_once()
+        assert runner.detour_worker is None
+        assert any("grid timeout" in call.args[0] for call in mock_log.call_args_list)
+
+    def test_get_detour_worker_disabled_by_default(self, runner):
+        """Test no worker is started unless async detours are enabled."""
+        assert runner._get_detour_worker() is None
+
     def test_run_open_ui_calls_nav_mgr(self, runner):
         """Test _run_open_ui delegates to nav manager."""
         runner.nav_mgr.open_menu_item.return_value = True
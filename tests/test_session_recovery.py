@@ -0,0 +1,151 @@
+"""
+Tests for SessionRecovery and the reconnect wiring in create_operation_services.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from core.connection_guard import ConnectionResetDetected
+from operations.recovery import SessionRecovery
+from operations.runner import create_operation_services
+
+
+class TestRecover:
+
+    def test_successful_reconnect_spends_one_recovery(self):
+        reconnect = MagicMock()
+        recovery = SessionRecovery(reconnect, max_recoveries=2)
+
+        with patch("operations.recovery.app_log"):
+            assert recovery.recover("reset") is True
+
+        reconnect.assert_called_once_with()
+        assert recovery.remaining == 1
+
+    def test_failed_reconnects_retry_until_budget_exhausted(self):
+        reconnect = MagicMock(side_effect=[RuntimeError("still down"), RuntimeError("down")])
+        recovery = SessionRecovery(reconnect, max_recoveries=2)
+
+        with patch("operations.recovery.app_log"):
+            assert recovery.recover("reset") is False
+
+        assert reconnect.call_count == 2
+        assert recovery.remaining == 0
+
+    def test_zero_budget_never_reconnects(self):
+        reconnect = MagicMock()
+        recovery = SessionRecovery(reconnect, max_recoveries=0)
+
+        with patch("operations.recovery.app_log"):
+            assert recovery.recover("reset") is False
+
+        reconnect.assert_not_called()
+
+
+class TestRunStep:
+
+    def test_replays_step_with_metadata_from_before_the_step(self):
+        seen = []
+
+        def run_step(name, data, metadata, idx):
+            seen.append(dict(metadata))
+            if len(seen) == 1:
+                metadata["partial"] = True
+                raise ConnectionResetDetected("reset")
+            metadata["done"] = name
+            return metadata, True
+
+        executor = MagicMock()
+        executor.run_step.side_effect = run_step
+        recovery = SessionRecovery(MagicMock(), max_recoveries=1)
+
+        with patch("operations.recovery.app_log"):
+            metadata, ok = recovery.run_step(executor, "receive", {}, {"asn_id": "A1"}, 1)
+
+        assert ok is True
+        assert seen == [{"asn_id": "A1"}, {"asn_id": "A1"}]
+        assert metadata == {"asn_id": "A1", "done": "receive"}
+
+    def test_reraises_when_recovery_fails(self):
+        executor = MagicMock()
+        executor.run_step.side_effect = ConnectionResetDetected("reset")
+        recovery = SessionRecovery(MagicMock(), max_recoveries=1)
+
+        with patch("operations.recovery.app_log"), pytest.raises(ConnectionResetDetected):
+            recovery.run_step(executor, "receive", {}, {}, 1)
+
+        assert executor.run_step.call_count == 2
+
+
+    def test_post_step_is_recovered_but_not_replayed(self):
+        executor = MagicMock()
+        executor.settings.app.step_names.postMessage = "postMessage"
+        executor.run_step.side_effect = ConnectionResetDetected("reset")
+        reconnect = MagicMock()
+        recovery = SessionRecovery(reconnect, max_recoveries=2)
+
+        with patch("operations.recovery.app_log"):
+            metadata, ok = recovery.run_step(executor, "PostMessage", {}, {"k": 1}, 1)
+
+        assert (metadata, ok) == ({"k": 1}, False)
+        assert executor.run_step.call_count == 1
+        reconnect.assert_called_once_with()
+
+
+class TestRunAction:
+
+    def test_recovered_action_is_not_called_again(self):
+        action = MagicMock(side_effect=ConnectionResetDetected("reset"))
+        reconnect = MagicMock()
+        recovery = SessionRecovery(reconnect, max_recoveries=1)
+
+        with patch("operations.recovery.app_log"):
+            recovery.run_action(action, "Login")
+
+        action.assert_called_once_with()
+        reconnect.assert_called_once_with()
+
+    def test_reraises_without_budget(self):
+        recovery = SessionRecovery(MagicMock(), max_recoveries=0)
+
+        with patch("operations.recovery.app_log"), pytest.raises(ConnectionResetDetected):
+            recovery.run_action(MagicMock(side_effect=ConnectionResetDetected("reset")), "Login")
+
+
+class TestReconnectWiring:
+
+    def test_reconnect_rebuilds_runner_and_rebinds_steps(self):
+        settings = MagicMock()
+        settings.app.max_session_recoveries = 2
+
+        with patch("operations.runner.BrowserManager") as browser_cls, \
+             patch("operations.runner.PageManager"), \
+             patch("operations.runner.ScreenshotManager"), \
+             patch("operations.runner.AuthManager"), \
+             patch("operations.runner.NavigationManager"), \
+             patch("operations.runner.RFMenuManager"), \
+             patch("operations.runner.ConnectionResetGuard"), \
+             patch("operations.runner.AutomationOrchestrator"), \
+             patch("operations.runner.WorkflowStageExecutor"), \
+             patch("operations.runner.OperationRunner") as runner_cls, \
+             patch("operations.recovery.app_log"):
+            browser_mgr = MagicMock()
+            browser_mgr.__enter__.return_value = browser_mgr
+            browser_mgr.__exit__.return_value = False
+            browser_cls.return_value = browser_mgr
+            first, second = MagicMock(name="first"), MagicMock(name="second")
+            runner_cls.side_effect = [first, second]
+
+            with create_operation_services(settings) as services:
+                assert services.step_execution.run_receive is first.run_receive
+                assert services.recovery.recover("reset") is True
+
+                first.close_detours.assert_called_once()
+                first.page.context.close.assert_called_once()
+                browser_mgr.new_context.assert_called_once_with(
+                    storage_state=first.page.context.storage_state.return_value
+                )
+                second.run_restore_session.assert_called_once()
+                assert services.step_execution.run_receive is second.run_receive
+                assert services.nav_mgr is second.nav_mgr
+
+            second.close_detours.assert_called_once()
@@ -0,0 +1,275 @@
+"""
+Tests for the dependency-aware stage scheduler.
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import main
+from config.settings import StepNames
+from core.connection_guard import ConnectionResetDetected, PostBatchInterrupted
+from core.orchestrator import OperationResult
+from operations.recovery import SessionRecovery
+from operations.stage_scheduler import RESOURCE_POST, RESOURCE_RF, StageScheduler, plan_stages
+from operations.step_execution import StepExecution
+from operations.workflow import WorkflowStageExecutor
+
+
+def _steps(n, with_loading=False):
+    steps = {
+        "postMessage": {"enabled": True, "type": "ASN", "source": "db"},
+        "runReceiving": {"flow": "HAPPY_PATH", "auto_handle_deviation": True},
+    }
+    if with_loading:
+        steps["runLoading"] = {"shipment": f"S{n}", "dock_door": "D1", "bol": "B1"}
+    return steps
+
+
+class _Harness:
+    """Executor with recorded UI calls and fake payload builds."""
+
+    def __init__(self, post_results=None):
+        self.calls = []
+        settings = MagicMock()
+        settings.app.step_names = StepNames()
+        settings.app.requires_prod_confirmation = False
+        settings.app.change_warehouse = "AUR"
+        orchestrator = MagicMock()
+        orchestrator.run_with_retry.side_effect = lambda fn, label, *a, **kw: OperationResult(fn(*a, **kw), label)
+
+        def post_many(payloads):
+            self.calls.append(("post_batch", list(payloads)))
+            return post_results or [True] * len(payloads)
+
+        def post_one(payload):
+            self.calls.append(("post", payload))
+            return True
+
+        def receive(**kwargs):
+            self.calls.append(("receive", kwargs["asn"]))
+            return True
+
+        def loading(**kwargs):
+            self.calls.append(("loading", kwargs["shipment"]))
+            return True
+
+        self.step_execution = StepExecution(
+            run_login=MagicMock(),
+            run_change_warehouse=MagicMock(),
+            run_post_message=post_one,
+            run_receive=receive,
+            run_loading=loading,
+            run_open_ui=MagicMock(return_value=True),
+            run_post_messages=post_many,
+        )
+        self.executor = WorkflowStageExecutor(settings, orchestrator, self.step_execution)
+        self.builds = 0
+
+        def build(step_data, post_type, facility, db_env):
+            self.builds += 1
+            asn = f"ASN{self.builds}"
+            return f"<xml>{asn}</xml>", {"asn_id": asn, "receive_items": [{"item": "I", "quantity": 1}]}
+
+        self.build = build
+
+    def run(self, jobs, **kwargs):
+        kwargs.setdefault("db_concurrency", 1)  # keeps the fake ASN numbering in workflow order
+        scheduler = StageScheduler(self.executor, **kwargs)
+        with patch("operations.workflow.build_post_message_payload", side_effect=self.build), \
+             patch("operations.stage_scheduler.app_log"), patch("operations.workflow.app_log"):
+            return list(scheduler.run(jobs))
+
+
+@pytest.fixture
+def harness():
+    return _Harness()
+
+
+class TestPlanStages:
+
+    def test_receive_depends_on_post_and_post_is_a_root(self):
+        nodes = plan_stages(_steps(1, with_loading=True))
+
+        assert [(n.step_name, n.resource, n.depends_on) for n in nodes] == [
+            ("postMessage", RESOURCE_POST, ()),
+            ("runReceiving", RESOURCE_RF, (1,)),
+            ("runLoading", RESOURCE_RF, (2,)),
+        ]
+
+    def test_unknown_stage_waits_for_every_earlier_step(self):
+        nodes = plan_stages({"postMessage": {}, "runReceiving": {}, "customStage": {}})
+
+        assert nodes[-1].depends_on == (1, 2)
+
+
+class TestStageScheduler:
+
+    def test_posts_batch_through_one_window_before_receives(self, harness):
+        jobs = [(n, f"wf{n}", _steps(n)) for n in (1, 2, 3)]
+
+        results = harness.run(jobs)
+
+        assert [r.status for r in results] == ["passed"] * 3
+        assert harness.calls == [
+            ("post_batch", ["<xml>ASN1</xml>", "<xml>ASN2</xml>", "<xml>ASN3</xml>"]),
+            ("receive", "ASN1"),
+            ("receive", "ASN2"),
+            ("receive", "ASN3"),
+        ]
+
+    def test_waves_bound_each_post_batch(self, harness):
+        jobs = [(n, f"wf{n}", _steps(n)) for n in (1, 2, 3)]
+
+        harness.run(jobs, wave_size=2)
+
+        assert [name for name, _ in harness.calls] == ["post_batch", "receive", "receive", "post_batch", "receive"]
+
+    def test_payload_builds_honour_db_concurrency(self, harness):
+        active, peak = [], []
+        lock = threading.Lock()
+        build = harness.build
+
+        def slow_build(*args):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return build(*args)
+
+        harness.build = slow_build
+        results = harness.run([(n, f"wf{n}", _steps(n)) for n in range(1, 6)], db_concurrency=2)
+
+        assert [r.status for r in results] == ["passed"] * 5
+        assert max(peak) == 2
+        assert [name for name, _ in harness.calls].count("post_batch") == 1
+
+    def test_failed_batched_post_retries_alone_then_halts_only_its_workflow(self):
+        harness = _Harness(post_results=[True, False])
+        harness.step_execution.run_post_message = MagicMock(return_value=False)
+
+        results = harness.run([(1, "wf1", _steps(1)), (2, "wf2", _steps(2))])
+
+        assert [(r.status, r.failed_step) for r in results] == [("passed", None), ("failed", "postMessage")]
+        harness.step_execution.run_post_message.assert_called_once_with("<xml>ASN2</xml>")
+        assert ("receive", "ASN2") not in harness.calls
+
+    def test_reset_during_post_batch_recovers_and_rebuilds(self, harness):
+        attempts = []
+
+        def flaky_batch(payloads):
+            attempts.append(list(payloads))
+            if len(attempts) == 1:
+                raise ConnectionResetDetected("ERR_CONNECTION_RESET")
+            return [True] * len(payloads)
+
+        harness.step_execution.run_post_messages = flaky_batch
+        recovery = SessionRecovery(MagicMock(), max_recoveries=1)
+
+        with patch("operations.recovery.app_log"):
+            results = harness.run([(1, "wf1", _steps(1))], recovery=recovery)
+
+        assert results[0].status == "passed"
+        assert attempts == [["<xml>ASN1</xml>"], ["<xml>ASN2</xml>"]]
+        assert ("receive", "ASN2") in harness.calls
+
+    def test_reset_mid_batch_replays_only_unaccepted_posts(self, harness):
+        attempts = []
+
+        def interrupted_batch(payloads):
+            attempts.append(list(payloads))
+            if len(attempts) == 1:
+                raise PostBatchInterrupted("ERR_CONNECTION_RESET", [True])
+            return [True] * len(payloads)
+
+        harness.step_execution.run_post_messages = interrupted_batch
+        recovery = SessionRecovery(MagicMock(), max_recoveries=1)
+
+        with patch("operations.recovery.app_log"):
+            results = harness.run([(1, "wf1", _steps(1)), (2, "wf2", _steps(2))], recovery=recovery)
+
+        assert [r.status for r in results] == ["passed", "passed"]
+        assert attempts == [["<xml>ASN1</xml>", "<xml>ASN2</xml>"], ["<xml>ASN3</xml>"]]
+        assert ("receive", "ASN1") in harness.calls and ("receive", "ASN3") in harness.calls
+
+    def test_reset_in_single_post_retry_is_recovered(self):
+        harness = _Harness(post_results=[False])
+        resets = iter([ConnectionResetDetected("ERR_CONNECTION_RESET")])
+
+        def post_one(payload):
+            harness.calls.append(("post", payload))
+            exc = next(resets, None)
+            if exc:
+                raise exc
+            return True
+
+        harness.step_execution.run_post_message = post_one
+        recovery = SessionRecovery(MagicMock(), max_recoveries=1)
+
+        with patch("operations.recovery.app_log"):
+            results = harness.run([(1, "wf1", _steps(1))], recovery=recovery)
+
+        assert results[0].status == "passed"
+        assert recovery.recoveries == 1
+
+    def test_checkpointed_steps_are_not_rerun(self, harness, tmp_path):
+        from core.checkpoint import CheckpointStore
+
+        steps = _steps(1)
+        with CheckpointStore(tmp_path / "cp.sqlite3") as store, patch("core.checkpoint.app_log"):
+            store.record_step(
+                1, "wf1", 1, "postMessage", steps["postMessage"], {"asn_id": "OLD", "receive_items": [{"item": "I"}]}
+            )
+            results = harness.run([(1, "wf1", steps)], checkpoints=store)
+
+            assert store.resume_point(1, "wf1", steps)[0] == 2
+        assert results[0].completed_steps == 2
+        assert harness.calls == [("receive", "OLD")]
+
+
+def test_run_automation_uses_scheduler_when_enabled(harness):
+    settings = MagicMock()
+    settings.app.stage_scheduler = True
+    settings.app.scheduler_wave_size = 10
+    settings.app.scheduler_db_concurrency = 2
+    wm_ops = MagicMock()
+    wm_ops.recovery = None
+    wm_ops.executor = harness.executor
+    wm_ops.step_execution = harness.step_execution
+
+    with patch("operations.workflow.build_post_message_payload", side_effect=harness.build), \
+         patch("operations.stage_scheduler.app_log"), patch("operations.workflow.app_log"), \
+         patch("main.app_log"):
+        results = main.run_automation(settings, wm_ops, workflows=[("wf1", _steps(1)), ("wf2", _steps(2))])
+
+    assert [r.status for r in results] == ["passed", "passed"]
+    assert harness.calls[0][0] == "post_batch"
+
+
+def test_run_automation_switches_warehouse_between_workflow_groups(harness):
+    settings = MagicMock()
+    settings.app.stage_scheduler = True
+    settings.app.scheduler_wave_size = 10
+    settings.app.scheduler_db_concurrency = 1
+    settings.app.change_warehouse = "AUR"
+    wm_ops = MagicMock()
+    wm_ops.recovery = None
+    wm_ops.executor = harness.executor
+    wm_ops.step_execution = harness.step_execution
+    switched = []
+    harness.step_execution.run_change_warehouse = lambda: switched.append(settings.app.change_warehouse)
+    harness.step_execution.close_detours = lambda: switched.append("close_detours")
+    workflows = [("wf1", _steps(1), "AUR"), ("wf2", _steps(2), "COP"), ("wf3", _steps(3), "COP"), ("wf4", _steps(4))]
+
+    with patch("operations.workflow.build_post_message_payload", side_effect=harness.build), \
+         patch("operations.stage_scheduler.app_log"), patch("operations.workflow.app_log"), \
+         patch("main.app_log"):
+        results = main.run_automation(settings, wm_ops, workflows=workflows)
+
+    assert [r.index for r in results] == [1, 2, 3, 4]
+    # login selection, then the detour worker is closed and the session switched for the COP group
+    assert switched == ["AUR", "close_detours", "COP"]
+    assert [len(payloads) for name, payloads in harness.calls if name == "post_batch"] == [1, 2, 1]
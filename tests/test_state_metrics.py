@@ -0,0 +1,150 @@
+"""
+Tests for per-state latency metrics.
+"""
+import json
+import threading
+from unittest.mock import patch
+
+from core.state_metrics import (
+    PlaywrightCallCounter,
+    StateLatencyStats,
+    StateTimer,
+    StateTiming,
+    percentile,
+)
+
+
+class TestPercentile:
+    """Tests for the nearest-rank percentile helper."""
+
+    def test_empty_is_zero(self):
+        """Test an empty sample yields 0."""
+        assert percentile([], 95) == 0.0
+
+    def test_nearest_rank(self):
+        """Test p50/p95 pick nearest-rank values."""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([7], 95) == 7
+
+
+class TestStateTimer:
+    """Tests for StateTimer and the thread-local call counter."""
+
+    def test_counts_calls_made_during_state(self):
+        """Test only calls made between start and stop are attributed."""
+        PlaywrightCallCounter.bump("Frame.evaluate")
+        timer = StateTimer("ASN_SCANNED")
+        PlaywrightCallCounter.bump("Locator.fill")
+        PlaywrightCallCounter.bump("Page.screenshot")
+
+        with patch("core.state_metrics.time.monotonic", return_value=timer.started + 0.25):
+            timing = timer.stop()
+
+        assert timing.state == "ASN_SCANNED"
+        assert timing.playwright_calls == 2
+        assert timing.screenshots == 1
+        assert timing.duration_ms == 250
+
+    def test_counts_are_thread_local(self):
+        """Test calls from another thread don't leak into this thread's state."""
+        timer = StateTimer("QTY_ENTERED")
+        worker = threading.Thread(target=lambda: PlaywrightCallCounter.bump("Page.goto"))
+        worker.start()
+        worker.join()
+
+        assert timer.stop().playwright_calls == 0
+
+    def test_install_is_shared_and_the_last_uninstall_restores(self):
+        """Test nested installs keep a single wrapper that the last uninstall removes."""
+        from playwright._impl._sync_base import SyncBase
+
+        original = SyncBase._sync
+        assert PlaywrightCallCounter.install() is True
+        hooked = SyncBase._sync
+        assert PlaywrightCallCounter.install() is True
+        assert SyncBase._sync is hooked
+
+        PlaywrightCallCounter.uninstall()
+        assert SyncBase._sync is hooked
+        PlaywrightCallCounter.uninstall()
+        assert SyncBase._sync is original
+
+    def test_hook_counts_only_tracked_threads(self):
+        """Test the dispatcher hook leaves threads that never timed a state uncounted."""
+        from playwright._impl._sync_base import SyncBase
+
+        original = SyncBase._sync
+        SyncBase._sync = lambda self, coro: None
+        counts = {}
+
+        def untracked():
+            SyncBase._sync(object(), None)
+            counts["worker"] = PlaywrightCallCounter.read()[0]
+
+        try:
+            PlaywrightCallCounter.install()
+            timer = StateTimer("RECEIVE")
+            SyncBase._sync(object(), None)
+            worker = threading.Thread(target=untracked)
+            worker.start()
+            worker.join()
+            assert timer.stop().playwright_calls == 1
+            assert counts["worker"] == 0
+        finally:
+            PlaywrightCallCounter.uninstall()
+            SyncBase._sync = original
+
+
+    def test_install_skips_an_unexpected_dispatcher(self):
+        """Test a changed SyncBase._sync is left untouched and counting degrades to zero."""
+        from playwright._impl._sync_base import SyncBase
+
+        original = SyncBase._sync
+        changed = lambda self, coro, timeout: None  # noqa: E731
+        SyncBase._sync = changed
+        try:
+            with patch("core.state_metrics.app_log"):
+                assert PlaywrightCallCounter.install() is False
+            assert SyncBase._sync is changed
+            PlaywrightCallCounter.uninstall()
+            assert SyncBase._sync is changed
+        finally:
+            SyncBase._sync = original
+
+
+class TestStateLatencyStats:
+    """Tests for run-level aggregation and export."""
+
+    def _timing(self, state, ms, calls=1, shots=0):
+        return StateTiming(state, 0.0, ms / 1000, calls, shots)
+
+    def test_summary_per_state(self):
+        """Test p50/p95/max and call totals are computed per state."""
+        stats = StateLatencyStats()
+        stats.add([self._timing("ASN_SCANNED", ms, calls=2) for ms in (100, 200, 300, 400)])
+        stats.add([self._timing("AWAITING_LOCATION", 900, shots=1)])
+
+        summary = stats.summary()
+
+        assert summary["ASN_SCANNED"]["count"] == 4
+        assert summary["ASN_SCANNED"]["p50_ms"] == 200
+        assert summary["ASN_SCANNED"]["p95_ms"] == 400
+        assert summary["ASN_SCANNED"]["max_ms"] == 400
+        assert summary["ASN_SCANNED"]["playwright_calls"] == 8
+        assert summary["AWAITING_LOCATION"]["screenshots"] == 1
+        histogram = summary["ASN_SCANNED"]["histogram_ms"]
+        assert (histogram["<=100"], histogram["<=250"], histogram["<=500"]) == (1, 1, 2)
+        assert sum(histogram.values()) == 4 and histogram[">10000"] == 0
+
+    def test_export_json(self, tmp_path):
+        """Test the JSON export carries the summary and extra sections."""
+        stats = StateLatencyStats()
+        stats.add([self._timing("ITEM_SCANNED", 50)])
+
+        path = stats.export_json(tmp_path / "out" / "metrics.json", {"operations": []})
+        data = json.loads(path.read_text())
+
+        assert data["operations"] == []
+        assert data["state_latency"]["ITEM_SCANNED"]["max_ms"] == 50
@@ -4,7 +4,7 @@ Comprehensive tests for UI navigation (ui/navigation.py).
 import pytest
 from unittest.mock import Mock, MagicMock, patch, call
 from playwright.sync_api import TimeoutError as PlaywrightTimeout
-from ui.navigation import NavigationManager
+from ui.navigation import MENU_WINDOW_OPEN_JS, NavigationManager
 
 
 class TestNavigationManagerInitialization:
@@ -186,6 +186,108 @@ class TestNavigationManagerOpenMenuItem:
         assert result is False
 
 
+    def test_open_menu_item_uses_catalog_launch(self):
+        """Test catalogued items launch via the Ext API without searching."""
+        mock_page = MagicMock()
+        mock_screenshot = MagicMock()
+
+        nav_mgr = NavigationManager(mock_page, mock_screenshot)
+        nav_mgr._open_menu_panel = MagicMock()
+        nav_mgr._do_search = MagicMock()
+        nav_mgr._launch_from_catalog = MagicMock(return_value=True)
+        nav_mgr._finish_menu_open = MagicMock()
+        nav_mgr.close_active_windows = MagicMock()
+
+        result = nav_mgr.open_menu_item("POST", "Post Message (Integration)")
+
+        assert result is True
+        nav_mgr._launch_from_catalog.assert_called_once_with("post message (integration)")
+        nav_mgr._do_search.assert_not_called()
+
+    def test_open_menu_item_keeps_skipped_windows_open(self):
+        """Test skip_titles reach the pre-open window sweep."""
+        nav_mgr = NavigationManager(MagicMock(), MagicMock())
+        nav_mgr._open_menu_panel = MagicMock()
+        nav_mgr._launch_from_catalog = MagicMock(return_value=True)
+        nav_mgr._finish_menu_open = MagicMock()
+        nav_mgr.close_active_windows = MagicMock()
+
+        nav_mgr.open_menu_item("tasks", "Tasks", skip_titles=["rf menu", "iLPNs"])
+
+        nav_mgr.close_active_windows.assert_called_once_with(["rf menu", "iLPNs"])
+
+    def test_load_menu_catalog_indexes_by_normalized_title(self):
+        """Test catalog is read once and keyed by normalized title."""
+        mock_page = MagicMock()
+        mock_page.evaluate.return_value = [
+            {"title": "Post\xa0Message  (Integration)", "viewId": "v1", "recordId": 1},
+            {"title": "iLPNs", "viewId": "v1", "recordId": 2},
+        ]
+
+        nav_mgr = NavigationManager(mock_page, MagicMock())
+        catalog = nav_mgr._load_menu_catalog()
+        nav_mgr._load_menu_catalog()
+
+        assert set(catalog) == {"post message (integration)", "ilpns"}
+        mock_page.evaluate.assert_called_once()
+
+    def test_empty_menu_catalog_is_retried_after_interval(self):
+        """Test an empty catalog is not cached for good, only until the retry interval passes."""
+        mock_page = MagicMock()
+        mock_page.evaluate.side_effect = [[], [{"title": "Tasks", "viewId": "v1", "recordId": 1}], True]
+
+        nav_mgr = NavigationManager(mock_page, MagicMock())
+        with patch("ui.navigation.time.monotonic", side_effect=[0.0, 0.0, 1.0, 31.0, 31.0]):
+            assert nav_mgr._launch_from_catalog("tasks") is False
+            assert nav_mgr._launch_from_catalog("tasks") is False  # within the retry interval
+            assert nav_mgr._launch_from_catalog("tasks") is True
+
+        assert mock_page.evaluate.call_count == 3
+        assert set(nav_mgr._menu_catalog) == {"tasks"}
+
+    def test_launch_timeout_rechecks_window_before_search(self):
+        """Test a slow window that is up by the time the wait expires is not opened again by search."""
+        mock_page = MagicMock()
+        mock_page.evaluate.side_effect = [[{"title": "iLPNs", "viewId": "v1", "recordId": 2}], True, True]
+        mock_page.wait_for_function.side_effect = PlaywrightTimeout("timeout")
+
+        nav_mgr = NavigationManager(mock_page, MagicMock())
+
+        assert nav_mgr._launch_from_catalog("ilpns") is True
+        assert mock_page.evaluate.call_args_list[-1][0] == (MENU_WINDOW_OPEN_JS, "ilpns")
+
+    def test_launch_from_catalog_waits_for_the_matching_window(self):
+        """Test the launch waits for a window titled like the item, not any visible window."""
+        mock_page = MagicMock()
+        mock_page.evaluate.side_effect = [[{"title": "iLPNs", "viewId": "v1", "recordId": 2}], True]
+
+        nav_mgr = NavigationManager(mock_page, MagicMock())
+
+        assert nav_mgr._launch_from_catalog("ilpns") is True
+        mock_page.wait_for_function.assert_called_once_with(MENU_WINDOW_OPEN_JS, arg="ilpns", timeout=3000)
+
+    def test_launch_from_catalog_miss_returns_false(self):
+        """Test items missing from the catalog fall back to the search UI."""
+        mock_page = MagicMock()
+        mock_page.evaluate.return_value = [{"title": "iLPNs", "viewId": "v1", "recordId": 2}]
+
+        nav_mgr = NavigationManager(mock_page, MagicMock())
+
+        assert nav_mgr._launch_from_catalog("tasks") is False
+
+    def test_launch_from_catalog_drops_stale_entry(self):
+        """Test a failed launch evicts the entry so the search UI is used."""
+        mock_page = MagicMock()
+        mock_page.evaluate.side_effect = [
+            [{"title": "iLPNs", "viewId": "v1", "recordId": 2}],
+            False,
+        ]
+
+        nav_mgr = NavigationManager(mock_page, MagicMock())
+
+        assert nav_mgr._launch_from_catalog("ilpns") is False
+        assert "ilpns" not in nav_mgr._menu_catalog
+
 class TestNavigationManagerWindowManagement:
     """Test suite for window management."""
 
@@ -217,6 +319,21 @@ class TestNavigationManagerWindowManagement:
 
         nav_mgr._close_window.assert_called_once_with(mock_window)
 
+    def test_close_active_windows_uses_registry(self):
+        """Test registry bulk close skips the per-window locator loop."""
+        mock_page = MagicMock()
+        mock_screenshot = MagicMock()
+
+        nav_mgr = NavigationManager(mock_page, mock_screenshot)
+        nav_mgr.windows = MagicMock()
+        nav_mgr.windows.close_all_except.return_value = ["Tasks"]
+        nav_mgr._find_closeable_window = MagicMock()
+
+        nav_mgr.close_active_windows(skip_titles=["RF Menu"])
+
+        nav_mgr.windows.close_all_except.assert_called_once_with(["RF Menu"])
+        nav_mgr._find_closeable_window.assert_not_called()
+
     def test_close_active_windows_with_skip_list(self):
         """Test closing windows with skip list."""
         mock_page = MagicMock()
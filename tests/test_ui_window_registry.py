@@ -0,0 +1,93 @@
+"""
+Tests for ui/window_registry.py WindowRegistry class.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from ui.window_registry import (
+    CLOSE_ALL_EXCEPT_JS,
+    MAXIMIZE_NON_RF_JS,
+    WINDOWS_GONE_JS,
+    WindowRegistry,
+)
+
+
+@pytest.fixture
+def page():
+    """Page whose registry install succeeds."""
+    mock_page = MagicMock()
+    mock_page.evaluate.return_value = True
+    return mock_page
+
+
+class TestUnavailable:
+    """Tests for pages where the registry cannot run."""
+
+    def test_returns_none_on_evaluate_error(self):
+        """Test a closed page yields None so callers fall back to locators."""
+        mock_page = MagicMock()
+        mock_page.evaluate.side_effect = Exception("Target closed")
+
+        assert WindowRegistry(mock_page).list_windows() is None
+
+    def test_returns_none_without_ext(self):
+        """Test a page without Ext yields None."""
+        mock_page = MagicMock()
+        mock_page.evaluate.return_value = None
+
+        assert WindowRegistry(mock_page).maximize_non_rf() is None
+
+
+class TestCloseAllExcept:
+    """Tests for close_all_except."""
+
+    def test_closes_in_one_evaluate_and_waits_once(self, page):
+        """Test bulk close runs one close evaluate and one readiness wait."""
+        page.evaluate.return_value = [{"id": "win-1", "title": "Tasks"}, {"id": "win-2", "title": ""}]
+
+        closed = WindowRegistry(page).close_all_except(["RF Menu"])
+
+        assert closed == ["Tasks", "Unnamed"]
+        page.evaluate.assert_called_once_with(CLOSE_ALL_EXCEPT_JS, ["rf menu"])
+        page.wait_for_function.assert_called_once_with(
+            WINDOWS_GONE_JS, arg=["win-1", "win-2"], timeout=2000
+        )
+
+    def test_no_wait_when_nothing_closed(self, page):
+        """Test no readiness wait when no window matched."""
+        page.evaluate.return_value = []
+
+        assert WindowRegistry(page).close_all_except() == []
+        page.wait_for_function.assert_not_called()
+
+    def test_returns_none_when_unavailable_or_empty(self):
+        """Test None (no Ext, or no tracked visible window) signals the locator fallback."""
+        mock_page = MagicMock()
+        mock_page.evaluate.return_value = None
+
+        assert WindowRegistry(mock_page).close_all_except() is None
+        mock_page.evaluate.assert_called_once()
+        mock_page.wait_for_function.assert_not_called()
+
+    def test_scripts_install_the_registry_themselves(self):
+        """Test each bulk script carries the install step, so no separate round trip is needed."""
+        for script in (CLOSE_ALL_EXCEPT_JS, MAXIMIZE_NON_RF_JS):
+            assert "window.__winRegistry = {" in script
+
+
+class TestMaximizeNonRf:
+    """Tests for maximize_non_rf."""
+
+    def test_returns_resized_count(self, page):
+        """Test maximize returns how many windows were resized."""
+        page.evaluate.return_value = 3
+
+        assert WindowRegistry(page).maximize_non_rf() == 3
+        page.evaluate.assert_called_once_with(MAXIMIZE_NON_RF_JS)
+        page.wait_for_function.assert_called_once()
+
+    def test_returns_none_on_unexpected_result(self, page):
+        """Test non-integer results are treated as unavailable."""
+        page.evaluate.return_value = MagicMock()
+
+        assert WindowRegistry(page).maximize_non_rf() is None
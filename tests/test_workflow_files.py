@@ -0,0 +1,142 @@
+"""
+Tests for loading workflow suites from YAML, JSON and JSONL files.
+"""
+import json
+
+import pytest
+
+from config.workflow_config import (
+    AsnItem,
+    FlowType,
+    OpenIlpnUiStep,
+    OpenTasksUiStep,
+    OpenUIConfig,
+    PostMessageStep,
+    ReceivingStep,
+    WorkflowBuilder,
+)
+from config.workflow_files import (
+    WorkflowFileError,
+    iter_workflow_file,
+    load_workflow_file,
+    parse_workflow_record,
+    step_schema,
+)
+
+
+RECEIVE_RECORD = {
+    "name": "receive_blind",
+    "bucket": "inbound",
+    "steps": {
+        "postMessage": {
+            "type": "ASN",
+            "db_env": "prod",
+            "asn_items": [{"item_name": "45119VA010", "shipped_qty": 10000}],
+        },
+        "runReceiving": {
+            "flow": "blind_ilpn",
+            "open_ui": [{"kind": "ilpns", "drill_detail": True}, {"kind": "tasks"}],
+        },
+    },
+}
+
+YAML_SUITE = """\
+name: receive_happy
+steps:
+  postMessage: {type: ASN, asn_items: [{item_name: ITEM-1}]}
+  runReceiving: {flow: HAPPY_PATH}
+---
+workflows:
+  - name: load_s1
+    bucket: outbound
+    steps:
+      runLoading: {shipment: S1, dock_door: D1, bol: B1}
+  - name: tasks_only
+    steps:
+      OpenTasksUi: {drill_detail: true}
+"""
+
+
+class TestParseWorkflowRecord:
+
+    def test_matches_builder_output(self):
+        expected = (
+            WorkflowBuilder("receive_blind", "inbound")
+            .postMessageStep(PostMessageStep(
+                message_type="ASN",
+                db_env="prod",
+                asn_items=[AsnItem(item_name="45119VA010", shipped_qty=10000)],
+            ))
+            .receivingStep(ReceivingStep(
+                flow=FlowType.BLIND_ILPN,
+                open_ui=OpenUIConfig(entries=[OpenIlpnUiStep(drill_detail=True), OpenTasksUiStep()]),
+            ))
+            .build()
+        )
+
+        assert parse_workflow_record(RECEIVE_RECORD) == expected
+
+    def test_stage_keys_are_case_insensitive(self):
+        workflow = parse_workflow_record({"name": "w", "steps": {"openilpnui": {"verify_only": True}}})
+
+        assert workflow.steps["OpenIlpnUi"]["verify_only"] is True
+
+    @pytest.mark.parametrize(
+        "record, message",
+        [
+            ({"steps": {}}, "needs a 'name'"),
+            ({"name": "w", "owner": "x"}, "unknown workflow key"),
+            ({"name": "w", "steps": {"runPacking": {}}}, "unknown stage 'runPacking'"),
+            ({"name": "w", "steps": {"runLoading": {"shipment": "S1"}}}, "missing required field"),
+            ({"name": "w", "steps": {"runReceiving": {"quantity": "ten"}}}, r"runReceiving\.quantity: expected int"),
+            ({"name": "w", "steps": {"runReceiving": {"flow": "SIDEWAYS"}}}, "unknown FlowType 'SIDEWAYS'"),
+            ({"name": "w", "steps": {"runReceiving": {"open_ui": [{"kind": "orders"}]}}}, "unknown open_ui kind"),
+            ({"name": "w", "steps": {"postMessage": {"type": "ASN", "colour": "red"}}}, "unknown field 'colour'"),
+        ],
+    )
+    def test_validation_errors_name_the_problem(self, record, message):
+        with pytest.raises(WorkflowFileError, match=message):
+            parse_workflow_record(record)
+
+    def test_schema_is_cached_per_class(self):
+        assert step_schema(ReceivingStep) is step_schema(ReceivingStep)
+        assert step_schema(PostMessageStep)["message_type"].required is True
+        assert step_schema(PostMessageStep)["source"].required is False
+
+
+class TestWorkflowFileFormats:
+
+    def test_yaml_multi_document(self, tmp_path):
+        path = tmp_path / "suite.yaml"
+        path.write_text(YAML_SUITE, encoding="utf-8")
+
+        workflows = load_workflow_file(path)
+
+        assert [w.full_name for w in workflows] == ["inbound.receive_happy", "outbound.load_s1", "inbound.tasks_only"]
+        assert workflows[0].steps["postMessage"]["asn_items"][0]["ItemName"] == "ITEM-1"
+
+    def test_json_document(self, tmp_path):
+        path = tmp_path / "suite.json"
+        path.write_text(json.dumps([RECEIVE_RECORD]), encoding="utf-8")
+
+        (workflow,) = load_workflow_file(path)
+
+        assert workflow.steps["runReceiving"]["flow"] == FlowType.BLIND_ILPN.value
+
+    def test_jsonl_streams_records_before_reading_bad_lines(self, tmp_path):
+        path = tmp_path / "suite.jsonl"
+        good = json.dumps({"name": "first", "steps": {"runReceiving": {}}})
+        path.write_text(f"# comment\n{good}\n\n{{not json\n", encoding="utf-8")
+
+        workflows = iter_workflow_file(path)
+
+        assert next(workflows).name == "first"
+        with pytest.raises(WorkflowFileError, match="suite.jsonl:4: invalid JSON"):
+            next(workflows)
+
+    def test_unsupported_suffix(self, tmp_path):
+        path = tmp_path / "suite.toml"
+        path.write_text("", encoding="utf-8")
+
+        with pytest.raises(WorkflowFileError, match="unsupported workflow file type"):
+            load_workflow_file(path)
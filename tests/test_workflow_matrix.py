@@ -0,0 +1,88 @@
+"""
+Tests for the lazy workflow matrix expander.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from config.settings import StepNames
+from config.workflow_config import FlowType, filter_workflows
+from config.workflow_matrix import WorkflowMatrix, parse_shard
+
+
+def _matrix(**overrides):
+    options = dict(
+        items=["ITEM-1", "ITEM-2"],
+        quantities=[1, 500],
+        flows=[FlowType.HAPPY_PATH, FlowType.BLIND_ILPN],
+        warehouses=["AUR", "COP", "DOU"],
+    )
+    options.update(overrides)
+    return WorkflowMatrix(**options)
+
+
+class TestWorkflowMatrix:
+
+    def test_len_is_product_of_dimensions(self):
+        assert len(_matrix()) == 2 * 2 * 2 * 3
+
+    def test_indexing_matches_iteration_and_names_are_deterministic(self):
+        matrix = _matrix()
+        names = [w.name for w in matrix]
+
+        assert len(set(names)) == len(matrix)
+        assert names[0] == "AUR.HAPPY_PATH.ITEM-1.q1"
+        assert matrix[-1].name == "DOU.BLIND_ILPN.ITEM-2.q500"
+        assert [w.name for w in _matrix()] == names
+
+    def test_scenario_builds_post_and_receive_stages(self):
+        names = StepNames()
+        workflow = _matrix()[10]  # COP, ITEM-1, qty 500, HAPPY_PATH
+
+        assert workflow.warehouse == "COP"
+        assert workflow.steps[names.postMessage]["asn_items"][0]["ItemName"] == "ITEM-1"
+        assert workflow.steps[names.postMessage]["asn_items"][0]["Quantity"]["ShippedQty"] == 500
+        assert workflow.steps[names.runReceiving]["flow"] == FlowType.HAPPY_PATH.value
+
+    def test_without_warehouses_names_omit_them(self):
+        workflow = _matrix(warehouses=())[0]
+
+        assert workflow.name == "HAPPY_PATH.ITEM-1.q1"
+        assert workflow.warehouse == ""
+
+    def test_shards_partition_the_matrix(self):
+        matrix = _matrix()
+        shards = [[w.name for w in matrix.shard(i, 5)] for i in range(1, 6)]
+
+        assert sorted(name for shard in shards for name in shard) == sorted(w.name for w in matrix)
+        assert max(map(len, shards)) - min(map(len, shards)) <= 1
+
+    def test_shards_cover_every_flow_and_few_warehouses(self):
+        for shard in (list(_matrix().shard(i, 3)) for i in range(1, 4)):
+            assert {w.steps[StepNames().runReceiving]["flow"] for w in shard} == {FlowType.HAPPY_PATH.value, FlowType.BLIND_ILPN.value}
+            assert len({w.warehouse for w in shard}) == 1
+
+    def test_shard_only_builds_its_own_scenarios(self):
+        matrix = _matrix(items=[f"ITEM-{n}" for n in range(10_000)])
+
+        with patch.object(WorkflowMatrix, "build", wraps=matrix.build) as build:
+            first = next(matrix.shard(4, 1000))
+
+        assert first.name == matrix[len(matrix) * 3 // 1000].name
+        assert build.call_count == 1
+
+    def test_filters_compose_lazily(self):
+        blind = list(filter_workflows(_matrix().shard(1, 2), flows=["BLIND_ILPN"]))
+
+        assert blind and all("BLIND_ILPN" in w.name for w in blind)
+
+
+class TestParseShard:
+
+    def test_valid(self):
+        assert parse_shard("2/4") == (2, 4)
+
+    @pytest.mark.parametrize("spec", ["0/4", "5/4", "x/4", "3"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError, match="Invalid shard"):
+            parse_shard(spec)
@@ -5,6 +5,7 @@ from core.logger import app_log
 from DB import DB
 from config.settings import Settings
 from utils.wait_utils import WaitUtils
+from ui.window_registry import WindowRegistry
 
 
 class AuthManager:
@@ -152,6 +153,23 @@ class AuthManager:
         self.screenshot_mgr.capture(self.page, "logged_in", "Logged In")
         app_log("✅ Logged in successfully")
 
+    def restore_session(self) -> bool:
+        """Reopen the app, reusing cached session cookies when the server still accepts them.
+
+        Falls back to a full login; returns True when the cached session was reused.
+        """
+        base_url = self.settings.app.app_server
+        app_log(f"🌐 Restoring session: {base_url}")
+        self.page.goto(base_url, wait_until="networkidle")
+        if self.page.locator("#username").count():
+            self.login()
+            return False
+        if self.settings.app.auto_close_post_login_windows:
+            self._close_default_windows()
+        self.screenshot_mgr.capture(self.page, "session_restored", "Session restored")
+        app_log("✅ Session restored from cached state")
+        return True
+
     def _get_credentials(self) -> dict[str, str]:
         if self._credentials is None:
             self._credentials = DB.get_credentials(self.credentials_env)
@@ -167,6 +185,18 @@ class AuthManager:
                 app_log("ℹ️ No post-login windows detected.")
                 return
 
+            registry = WindowRegistry(self.page)
+            open_windows = registry.list_windows()
+            if open_windows is not None:
+                if not open_windows:
+                    app_log("ℹ️ No post-login windows required closing.")
+                    return
+                app_log(f"⚠️ Detected {len(open_windows)} post-login window(s); closing.")
+                self.screenshot_mgr.capture(self.page, "Default Windows", "Default Windows, will be closed")
+                closed_titles = registry.close_all_except() or []
+                app_log(f"✅ Closed post-login windows: {', '.join(closed_titles)}")
+                return
+
             for _ in range(5):
                 windows = self.page.locator("div.x-window:visible")
                 count = windows.count()
@@ -15,6 +15,79 @@ from core.logger import app_log
 from utils.wait_utils import WaitUtils
 from utils.hash_utils import HashUtils
 from utils.eval_utils import safe_page_evaluate
+from ui.window_registry import WindowRegistry
+
+
+MENU_CATALOG_JS = """
+() => {
+    if (!window.Ext || !Ext.ComponentQuery) return [];
+    const titleFields = ['text', 'title', 'name', 'displayName', 'label'];
+    const titleOf = (rec) => {
+        for (const field of titleFields) {
+            const value = rec.get ? rec.get(field) : undefined;
+            if (typeof value === 'string' && value.trim()) return value;
+        }
+        return '';
+    };
+    const inMenu = (view) => !!(view.el && view.el.dom && view.el.dom.closest("[id^='mps_menu']"));
+    const views = Ext.ComponentQuery.query('dataview').filter(
+        (view) => view.isXType('boundlist') || inMenu(view)
+    );
+    const out = [];
+    for (const view of views) {
+        const store = view.getStore && view.getStore();
+        if (!store) continue;
+        const data = store.getData ? store.getData() : store.data;
+        const source = (data && data.getSource && data.getSource()) || store.snapshot || data;
+        const records = (source && (source.items || (source.getRange && source.getRange()))) || [];
+        for (const rec of records) {
+            const title = titleOf(rec);
+            if (title) out.push({ title, viewId: view.getId(), recordId: rec.getId() });
+        }
+    }
+    return out;
+}
+"""
+
+MENU_LAUNCH_JS = """
+({ viewId, recordId }) => {
+    const view = window.Ext && Ext.getCmp(viewId);
+    if (!view || view.isDestroyed) return false;
+    const store = view.getStore();
+    let rec = store.getById(recordId);
+    if (!rec || store.indexOf(rec) < 0) {
+        store.clearFilter();
+        rec = store.getById(recordId);
+    }
+    if (!rec) return false;
+    const node = view.getNode && view.getNode(rec);
+    if (node) {
+        node.click();
+        return true;
+    }
+    view.getSelectionModel && view.getSelectionModel().select(rec);
+    view.fireEvent('itemclick', view, rec, null, store.indexOf(rec), {});
+    return true;
+}
+"""
+
+
+# True once a visible Ext window's title matches the launched item (either may abbreviate the other).
+MENU_WINDOW_OPEN_JS = """
+(match) => {
+    if (!window.Ext || !Ext.ComponentQuery) return false;
+    const norm = (text) => String(text || '').replace(/<[^>]*>/g, '').replace(/\\u00a0/g, ' ')
+        .replace(/\\s+/g, ' ').trim().toLowerCase();
+    return Ext.ComponentQuery.query('window{isVisible()}').some((win) => {
+        const title = norm(win.getTitle ? win.getTitle() : win.title);
+        return !!title && (title.includes(match) || match.includes(title));
+    });
+}
+"""
+
+
+# A page whose menu stores were empty (not loaded yet, or none at all) is re-read after this long.
+MENU_CATALOG_RETRY_S = 30.0
 
 
 class NavigationManager:
@@ -23,6 +96,9 @@ class NavigationManager:
     def __init__(self, page: Page, screenshot_mgr: ScreenshotManager):
         self.page = page
         self.screenshot_mgr = screenshot_mgr
+        self._menu_catalog: dict[str, dict] | None = None  # None until a non-empty read
+        self._menu_catalog_retry_at = 0.0
+        self.windows = WindowRegistry(page)
 
     # =========================================================================
     # PUBLIC METHODS
@@ -57,17 +133,28 @@ class NavigationManager:
         search_term: str,
         match_text: str,
         onDemand: bool = True,
+        skip_titles: list[str] | None = None,
     ) -> bool:
-        """Open a menu item by searching and selecting exact match."""
+        """Open a menu item by searching and selecting exact match.
+
+        Visible windows are closed first, except those whose titles match `skip_titles`.
+        """
         normalized_match = self._normalize(match_text)
 
         try:
-            # Always start clean: close all visible windows before opening a new one.
-            self.close_active_windows()
+            # Start clean: close visible windows (bar kept ones) before opening a new one.
+            self.close_active_windows(skip_titles)
         except Exception:
             pass
 
         self._open_menu_panel()
+        use_info_button = "rf menu" in normalized_match
+
+        if not use_info_button and self._launch_from_catalog(normalized_match):
+            app_log(f"✅ Opened '{match_text}' from menu catalog")
+            self._finish_menu_open(normalized_match)
+            return True
+
         self._reset_menu_filter()
         self._do_search(search_term)
 
@@ -90,31 +177,34 @@ class NavigationManager:
                 self.screenshot_mgr.capture(self.page, f"select_{text}", f"Selecting {match_text}", onDemand)
 
                 try:
-                    self._click_menu_item(item, "rf menu" in normalized_match)
+                    self._click_menu_item(item, use_info_button)
                 except PlaywrightTimeout:
                     app_log("⚠️ Menu went stale while clicking match.")
                     return False
-                
-                # ✅ NEW: Wait for window to fully load before any adjustments
-                self._wait_for_window_ready(normalized_match)
-                
-                self._post_selection_adjustments(normalized_match)
-                
-                # ✅ NEW: Maximize with retry after confirming window is stable
-                try:
-                    if "rf menu" in normalized_match:
-                        self.maximize_rf_window()
-                    else:
-                        self._maximize_with_wait(normalized_match)
-                except Exception as e:
-                    app_log(f"⚠️ Maximize failed: {e}")
-                
+
+                self._finish_menu_open(normalized_match)
                 return True
 
         app_log(f"⚠️ No exact match found for '{match_text}'")
         app_log(f"❌ Could not find: '{match_text}'")
         return False
     
+    def _finish_menu_open(self, normalized_match: str):
+        """Wait for the launched window, then position and maximize it."""
+        # ✅ NEW: Wait for window to fully load before any adjustments
+        self._wait_for_window_ready(normalized_match)
+
+        self._post_selection_adjustments(normalized_match)
+
+        # ✅ NEW: Maximize with retry after confirming window is stable
+        try:
+            if "rf menu" in normalized_match:
+                self.maximize_rf_window()
+            else:
+                self._maximize_with_wait(normalized_match)
+        except Exception as e:
+            app_log(f"⚠️ Maximize failed: {e}")
+
     def _wait_for_window_ready(self, normalized_match: str, timeout_ms: int = 5000):
         """Wait for ExtJS window to be fully loaded and ready."""
         from playwright.sync_api import TimeoutError as PlaywrightTimeout
@@ -261,8 +351,13 @@ class NavigationManager:
 
     def close_active_windows(self, skip_titles: list[str] = None):
         """Close all workspace windows except those in skip list."""
-        skip = {t.lower() for t in (skip_titles or []) if t}
+        closed = self.windows.close_all_except(skip_titles)
+        if closed is not None:
+            for title in closed:
+                app_log(f"🧹 Closing: {title}")
+            return
 
+        skip = {t.lower() for t in (skip_titles or []) if t}
         while True:
             window = self._find_closeable_window(skip)
             if not window:
@@ -287,6 +382,66 @@ class NavigationManager:
     # MENU HELPERS
     # =========================================================================
 
+    def _load_menu_catalog(self) -> dict[str, dict]:
+        """Read every menu record from the Ext stores in one evaluate, indexed by normalized title.
+
+        An empty read is not cached: the stores may still be loading, so it is retried
+        after MENU_CATALOG_RETRY_S.
+        """
+        if self._menu_catalog is not None:
+            return self._menu_catalog
+        if time.monotonic() < self._menu_catalog_retry_at:
+            return {}
+        self._menu_catalog_retry_at = time.monotonic() + MENU_CATALOG_RETRY_S
+        try:
+            entries = safe_page_evaluate(self.page, MENU_CATALOG_JS, description="menu catalog")
+        except Exception as e:
+            app_log(f"⚠️ Menu catalog unavailable: {e}")
+            return {}
+
+        catalog: dict[str, dict] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            title = self._normalize(str(entry.get("title") or ""))
+            if title and title not in catalog:
+                catalog[title] = entry
+        if catalog:
+            app_log(f"📇 Menu catalog indexed {len(catalog)} items")
+            self._menu_catalog = catalog
+        return catalog
+
+    def _launch_from_catalog(self, normalized_match: str, timeout_ms: int = 3000) -> bool:
+        """Launch a catalogued menu item through the Ext API; False means use the search UI."""
+        entry = self._load_menu_catalog().get(normalized_match)
+        if not entry:
+            return False
+        try:
+            launched = safe_page_evaluate(
+                self.page, MENU_LAUNCH_JS, entry, description="menu launch"
+            )
+            if launched is not True:
+                raise RuntimeError("menu record not found")
+            self.page.wait_for_function(MENU_WINDOW_OPEN_JS, arg=normalized_match, timeout=timeout_ms)
+            return True
+        except PlaywrightTimeout:
+            # The launch went through; if the window made it up after all, searching would open it twice.
+            if self._menu_window_open(normalized_match):
+                return True
+            app_log(f"⚠️ '{normalized_match}' did not open from the menu catalog; using search")
+            return False
+        except Exception as e:
+            app_log(f"⚠️ Catalog launch failed for '{normalized_match}': {e}; using search")
+            if self._menu_catalog:
+                self._menu_catalog.pop(normalized_match, None)
+            return False
+
+    def _menu_window_open(self, normalized_match: str) -> bool:
+        try:
+            return safe_page_evaluate(
+                self.page, MENU_WINDOW_OPEN_JS, normalized_match, description="menu window check"
+            ) is True
+        except Exception:
+            return False
+
     def _open_menu_panel(self):
         """Open the navigation panel - optimized."""
         try:
@@ -476,6 +631,11 @@ class NavigationManager:
 
     def _maximize_non_rf_windows(self):
         """Maximize all visible non-RF windows for better capture."""
+        registry_resized = self.windows.maximize_non_rf()
+        if registry_resized:
+            app_log(f"🪟 Maximized {registry_resized} non-RF window(s)")
+            return
+
         # First, try the native maximize buttons on visible windows (if present).
         clicked = 0
         try:
@@ -0,0 +1,161 @@
+"""
+Window Registry - Tracks ExtJS windows registered with Ext.WindowManager.
+
+Responsibilities:
+- Keep an in-page registry of windows by wrapping WindowManager.register/unregister
+  (the ZIndexManager fires no register events to listen to)
+- Close or maximize many windows in a single evaluate
+"""
+from playwright.sync_api import Page
+
+from core.logger import app_log
+from utils.eval_utils import safe_page_evaluate
+
+# Installs window.__winRegistry once per document (no-op while Ext is not loaded). Every
+# script below starts with it, so each bulk operation costs a single evaluate.
+_INSTALL_BLOCK = """
+    if (!window.__winRegistry && window.Ext && Ext.WindowManager && Ext.WindowManager.register) {
+        const mgr = Ext.WindowManager;
+        const registry = new Map();
+        const track = (win) => { if (win && win.getId) registry.set(win.getId(), win); };
+        const untrack = (win) => { if (win && win.getId) registry.delete(win.getId()); };
+
+        const register = mgr.register;
+        const unregister = mgr.unregister;
+        mgr.register = function (win) { track(win); return register.apply(this, arguments); };
+        mgr.unregister = function (win) { untrack(win); return unregister.apply(this, arguments); };
+        ((mgr.getAll && mgr.getAll().items) || []).forEach(track);
+
+        const titleOf = (win) => {
+            const raw = (win.getTitle ? win.getTitle() : win.title) || '';
+            return String(raw).replace(/<[^>]*>/g, '').replace(/\\s+/g, ' ').trim();
+        };
+        const isRf = (title) => {
+            const lower = title.toLowerCase();
+            return lower.includes('rf menu') || lower === 'rf';
+        };
+        const visible = () => Array.from(registry.values()).filter(
+            (win) => !win.isDestroyed && win.isVisible && win.isVisible()
+                && !String(win.getId()).startsWith('mps_menu')
+        );
+
+        window.__winRegistry = { registry, titleOf, isRf, visible };
+    }
+"""
+
+# Prelude for registry scripts: install, then bail out with null when unavailable.
+_REGISTRY = _INSTALL_BLOCK + """
+    const reg = window.__winRegistry;
+    if (!reg) return null;
+"""
+
+# Null when the registry tracks no visible window: windows opened before install or
+# outside Ext.WindowManager.register are invisible to it, so callers sweep locators.
+LIST_JS = "() => {" + _REGISTRY + """
+    const wins = reg.visible();
+    if (!wins.length) return null;
+    return wins.map((win) => ({ id: win.getId(), title: reg.titleOf(win) }));
+}
+"""
+
+CLOSE_ALL_EXCEPT_JS = "(skip = []) => {" + _REGISTRY + """
+    const wins = reg.visible();
+    if (!wins.length) return null;
+    const closed = [];
+    for (const win of wins) {
+        const title = reg.titleOf(win);
+        const lower = title.toLowerCase();
+        if (skip.some((s) => lower.includes(s))) continue;
+        try {
+            if (win.close) { win.close(); } else { win.destroy(); }
+            closed.push({ id: win.getId(), title });
+        } catch (e) {}
+    }
+    return closed;
+}
+"""
+
+MAXIMIZE_NON_RF_JS = "() => {" + _REGISTRY + """
+    let changed = 0;
+    for (const win of reg.visible()) {
+        if (reg.isRf(reg.titleOf(win))) continue;
+        try {
+            if (typeof win.maximize === 'function') {
+                win.maximize();
+            } else {
+                const w = Math.max(400, window.innerWidth * 0.95);
+                const h = Math.max(300, window.innerHeight * 0.95);
+                win.setSize?.(w, h);
+                win.setPagePosition?.(Math.max(4, (window.innerWidth - w) / 2), Math.max(4, window.innerHeight * 0.03));
+            }
+            win.toFront?.();
+            win.updateLayout?.();
+            changed += 1;
+        } catch (e) {}
+    }
+    return changed;
+}
+"""
+
+WINDOWS_GONE_JS = """
+(ids) => ids.every((id) => {
+    const win = window.Ext && Ext.getCmp(id);
+    return !win || win.isDestroyed || !win.isVisible();
+})
+"""
+
+LAYOUT_SETTLED_JS = """
+() => {
+    const reg = window.__winRegistry;
+    if (!reg) return true;
+    return reg.visible().every((win) => win.rendered && !(win.isLayoutSuspended && win.isLayoutSuspended()))
+        && !document.querySelector('.x-mask-msg:not(.x-hide-display)');
+}
+"""
+
+
+class WindowRegistry:
+    """Bulk ExtJS window operations backed by an event-fed in-page registry.
+
+    Every method returns None when the registry cannot be installed (Ext not loaded,
+    page detached), and listing/closing also return None when it tracks no visible
+    window, so callers can fall back to locator-based handling.
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    def list_windows(self) -> list[dict] | None:
+        """Visible workspace windows as [{'id', 'title'}], menu panel excluded."""
+        return self._run(LIST_JS, None, list, "window_registry_list")
+
+    def close_all_except(self, skip_titles: list[str] | None = None, timeout_ms: int = 2000) -> list[str] | None:
+        """Close every visible window whose title doesn't contain a skip entry; returns closed titles."""
+        skip = [t.lower() for t in (skip_titles or []) if t]
+        closed = self._run(CLOSE_ALL_EXCEPT_JS, skip, list, "window_registry_close")
+        if closed is None:
+            return None
+        if closed:
+            self._wait(WINDOWS_GONE_JS, [entry["id"] for entry in closed], timeout_ms)
+        return [entry.get("title") or "Unnamed" for entry in closed]
+
+    def maximize_non_rf(self, timeout_ms: int = 2000) -> int | None:
+        """Maximize all visible non-RF windows; returns how many were resized."""
+        resized = self._run(MAXIMIZE_NON_RF_JS, None, int, "window_registry_maximize")
+        if resized:
+            self._wait(LAYOUT_SETTLED_JS, None, timeout_ms)
+        return resized
+
+    def _run(self, script: str, arg, expected_type: type, description: str):
+        try:
+            result = safe_page_evaluate(self.page, script, arg, description=description, suppress_log=True)
+        except Exception as exc:
+            app_log(f"⚠️ {description} failed: {exc}")
+            return None
+        return result if isinstance(result, expected_type) else None
+
+    def _wait(self, script: str, arg, timeout_ms: int):
+        try:
+            self.page.wait_for_function(script, arg=arg, timeout=timeout_ms)
+        except Exception:
+            app_log("⚠️ Window registry wait timed out, continuing")
@@ -1,6 +1,14 @@
 """Utility modules for automation framework."""
 
-from utils.retry import retry, retry_with_context, RetryExhausted, RetryableOperation
+from utils.retry import (
+    retry,
+    retry_with_context,
+    RetryExhausted,
+    RetryableOperation,
+    BackoffPolicy,
+    RetryBudget,
+    classify_error,
+)
 from utils.wait_utils import WaitUtils
 from utils.hash_utils import HashUtils
 
@@ -9,6 +17,9 @@ __all__ = [
     "retry_with_context",
     "RetryExhausted",
     "RetryableOperation",
+    "BackoffPolicy",
+    "RetryBudget",
+    "classify_error",
     "WaitUtils",
     "HashUtils",
 ]
@@ -9,7 +9,8 @@ class PageUnavailableError(RuntimeError):
     pass
 
 
-_TRANSIENT_ERRORS = (
+# Error text for a page, frame or browser that went away mid-call.
+PAGE_GONE_ERRORS = (
     "target closed",
     "execution context was destroyed",
     "cannot find context",
@@ -22,7 +23,7 @@ _TRANSIENT_ERRORS = (
 def _is_transient(exc: Exception) -> bool:
     """Check if error is due to page/context closing."""
     msg = str(exc).lower()
-    return any(e in msg for e in _TRANSIENT_ERRORS)
+    return any(e in msg for e in PAGE_GONE_ERRORS)
 
 
 def safe_page_evaluate(page: Page, script: str, arg=None, 
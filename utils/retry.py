@@ -3,14 +3,54 @@ Unified retry utilities for automation operations.
 
 Provides decorators and context managers for retry logic across the codebase.
 """
+import random
+import threading
+import time
 from functools import wraps
 from typing import Callable, Optional, Any, TypeVar
 from dataclasses import dataclass
 
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
 from core.logger import app_log
+from utils.eval_utils import PAGE_GONE_ERRORS, PageUnavailableError
 
 T = TypeVar('T')
 
+TRANSIENT = "transient"
+DETERMINISTIC = "deterministic"
+UNKNOWN = "unknown"
+
+# JDBC/driver messages for a dropped or unreachable database connection.
+_NETWORK_ERROR_MARKERS = (
+    "sqlrecoverableexception",
+    "sqltransientconnectionexception",
+    "io error: connection",
+    "io error: socket",
+    "io error: got minus one",
+    "network adapter",
+    "connection reset",
+    "connection refused",
+    "connection timed out",
+    "socketexception",
+    "socket read timed out",
+    "socket closed",
+    "ora-03113",
+    "ora-03114",
+    "ora-12170",
+    "ora-12541",
+    "ora-12543",
+    "ora-17002",
+)
+
+# Failures that will repeat verbatim no matter how often they are retried.
+_DETERMINISTIC_MARKERS = (
+    "invalid test data",
+    "validation failed",
+    "validation error",
+)
+_DETERMINISTIC_TYPES = (AssertionError, AttributeError, KeyError, TypeError)
+
 
 @dataclass
 class RetryConfig:
@@ -22,6 +62,62 @@ class RetryConfig:
     exclude_exceptions: tuple = ()
 
 
+@dataclass
+class BackoffPolicy:
+    """Capped exponential backoff; with jitter the delay is uniform in [0, capped] ("full jitter")."""
+    base_s: float = 0.5
+    cap_s: float = 8.0
+    factor: float = 2.0
+    jitter: bool = True
+
+    def delay(self, retry_number: int, rng: random.Random | None = None) -> float:
+        """Seconds to wait before retry `retry_number` (1-based)."""
+        capped = min(self.cap_s, self.base_s * self.factor ** max(0, retry_number - 1))
+        if not self.jitter:
+            return max(0.0, capped)
+        return (rng or random).uniform(0.0, max(0.0, capped))
+
+
+class RetryBudget:
+    """Retries shared across a whole run, so a failing dependency can't trigger a retry storm."""
+
+    def __init__(self, max_retries: int):
+        self.max_retries = max(0, int(max_retries))
+        self.spent = 0
+        self._lock = threading.Lock()
+        self._warned = False
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.max_retries - self.spent)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.spent < self.max_retries:
+                self.spent += 1
+                return True
+            warn, self._warned = not self._warned, True
+        if warn:
+            app_log(f"⛔ Retry budget exhausted ({self.max_retries} retries this run); no further retries")
+        return False
+
+
+def classify_error(exc: BaseException | None) -> str:
+    """Split failures into TRANSIENT (worth retrying), DETERMINISTIC (never) or UNKNOWN."""
+    if exc is None:
+        return UNKNOWN
+    if isinstance(exc, (PlaywrightTimeoutError, PageUnavailableError, TimeoutError, ConnectionError)):
+        return TRANSIENT
+    message = f"{type(exc).__name__}: {exc}".lower()
+    if any(marker in message for marker in _DETERMINISTIC_MARKERS):
+        return DETERMINISTIC
+    if any(marker in message for marker in PAGE_GONE_ERRORS + _NETWORK_ERROR_MARKERS):
+        return TRANSIENT
+    if isinstance(exc, _DETERMINISTIC_TYPES):
+        return DETERMINISTIC
+    return UNKNOWN
+
+
 class RetryExhausted(Exception):
     """Raised when all retry attempts are exhausted."""
     def __init__(self, attempts: int, last_error: Exception):
@@ -36,7 +132,12 @@ def retry(
     exclude: tuple = (),
     log_prefix: str = "",
     reraise: bool = False,
-    on_retry: Optional[Callable[[int, int, Exception], None]] = None
+    on_retry: Optional[Callable[[int, int, Exception], None]] = None,
+    backoff: Optional[BackoffPolicy] = None,
+    classify: Optional[Callable[[BaseException], str]] = None,
+    budget: Optional[RetryBudget] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    retry_unknown: bool = True,
 ):
     """
     Decorator that retries a function on failure.
@@ -48,6 +149,12 @@ def retry(
         log_prefix: Prefix for log messages (default: function name)
         reraise: If True, reraise last exception when exhausted (default: False)
         on_retry: Optional callback(attempt, max_attempts, error) called on retry
+        backoff: Optional BackoffPolicy; retries are immediate without one
+        classify: Optional classifier; DETERMINISTIC errors are not retried
+        retry_unknown: With a classifier, also retry UNKNOWN errors and soft False
+            results (default: True); False retries TRANSIENT errors only
+        budget: Optional RetryBudget shared across calls; no retries once it is spent
+        sleep: Sleep function used for backoff delays (default: time.sleep)
 
     Returns:
         Decorated function that retries on failure
@@ -63,7 +170,31 @@ def retry(
             prefix = log_prefix or func.__name__
             last_error: Optional[Exception] = None
 
+            attempts_made = 0
+
+            def should_retry(attempt: int, error: Exception) -> bool:
+                if attempt >= max_attempts:
+                    return False
+                kind = classify(error) if classify else UNKNOWN
+                if kind == DETERMINISTIC:
+                    app_log(f"⏭️ {prefix} failed deterministically; not retrying: {error}")
+                    return False
+                if classify and kind != TRANSIENT and not retry_unknown:
+                    app_log(f"⏭️ {prefix} failed with no transient cause; not retrying: {error}")
+                    return False
+                if budget is not None and not budget.try_spend():
+                    return False
+                if on_retry:
+                    on_retry(attempt, max_attempts, error)
+                if backoff:
+                    wait_s = backoff.delay(attempt)
+                    if wait_s > 0:
+                        app_log(f"⏳ Backing off {wait_s:.2f}s before retrying {prefix}")
+                        sleep(wait_s)
+                return True
+
             for attempt in range(1, max_attempts + 1):
+                attempts_made = attempt
                 try:
                     # Log attempt
                     if attempt == 1:
@@ -82,10 +213,9 @@ def retry(
 
                     # Function returned False (soft failure)
                     last_error = ValueError(f"{prefix} returned False")
-                    if attempt < max_attempts:
-                        app_log(f"⚠️ {prefix} failed, retrying...")
-                        if on_retry:
-                            on_retry(attempt, max_attempts, last_error)
+                    if not should_retry(attempt, last_error):
+                        break
+                    app_log(f"⚠️ {prefix} failed, retrying...")
 
                 except exclude as exc:
                     # Immediately reraise excluded exceptions
@@ -97,14 +227,14 @@ def retry(
                     last_error = exc
                     if attempt < max_attempts:
                         app_log(f"❌ {prefix} error: {exc}")
-                        app_log(f"🔄 Retrying {prefix}...")
-                        if on_retry:
-                            on_retry(attempt, max_attempts, exc)
+                    if not should_retry(attempt, exc):
+                        break
+                    app_log(f"🔄 Retrying {prefix}...")
 
             # All attempts exhausted
-            app_log(f"❌ {prefix} failed after {max_attempts} attempts")
+            app_log(f"❌ {prefix} failed after {attempts_made} attempts")
             if reraise and last_error:
-                raise RetryExhausted(max_attempts, last_error) from last_error
+                raise RetryExhausted(attempts_made, last_error) from last_error
             return None  # type: ignore
 
         return wrapper